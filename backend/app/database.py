@@ -1,27 +1,146 @@
-from sqlalchemy import create_engine
+import asyncio
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 import os
+import time
+from app.metrics import DB_COMMIT_SECONDS
 
 # SQLite database file path
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./xhiresense.db")
 
+# Async drivers used for request handling
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+def to_async_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its async driver (explicit drivers are kept)"""
+    scheme, sep, rest = url.partition("://")
+    if "+" in scheme or scheme not in ASYNC_DRIVERS:
+        return url
+    return f"{ASYNC_DRIVERS[scheme]}{sep}{rest}"
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+IS_SQLITE_MEMORY = IS_SQLITE and (":memory:" in DATABASE_URL or DATABASE_URL.rstrip("/") in ("sqlite:", "sqlite:/"))
+
+# Connection pool sizing (per process)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "4"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# SQLite storage profile, applied to every new connection. WAL lets readers run
+# alongside the writer, synchronous=NORMAL only fsyncs at checkpoints in WAL
+# mode, and busy_timeout waits for the lock instead of failing "database is locked".
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),  # negative = KiB, i.e. 64 MiB
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+}
+
+connect_args = {"check_same_thread": False} if IS_SQLITE else {}
+pool_args = {} if IS_SQLITE_MEMORY else {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_pre_ping": not IS_SQLITE,
+}
+
 engine = create_engine(
     DATABASE_URL, 
-    connect_args={"check_same_thread": False}  # Needed for SQLite
+    connect_args=connect_args,  # Needed for SQLite
+    **pool_args
+)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    connect_args=connect_args,
+    # aiosqlite defaults to NullPool (a new connection thread per session)
+    poolclass=None if IS_SQLITE_MEMORY else AsyncAdaptedQueuePool,
+    **pool_args
 )
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas: dict = SQLITE_PRAGMAS):
+    """Apply PRAGMA settings to a raw SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        if name == "journal_mode" and IS_SQLITE_MEMORY:
+            continue  # In-memory databases cannot use WAL
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+def _set_sqlite_pragma(dbapi_connection, connection_record):
+    """Apply the SQLite storage profile (including foreign keys for ON DELETE CASCADE)"""
+    apply_sqlite_pragmas(dbapi_connection)
+
+if IS_SQLITE:
+    event.listen(engine, "connect", _set_sqlite_pragma)
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragma)
+
+def _commit_started(session):
+    session.info["commit_started"] = time.perf_counter()
+
+def _commit_finished(session):
+    started = session.info.pop("commit_started", None)
+    if started is not None:
+        DB_COMMIT_SECONDS.observe(time.perf_counter() - started)
+
+# Commit timing for every session (async sessions run on a sync Session underneath)
+event.listen(Session, "before_commit", _commit_started)
+event.listen(Session, "after_commit", _commit_finished)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: attributes stay readable after commit without an implicit (sync) reload
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
 def get_db():
-    """Dependency to get database session"""
+    """Dependency to get a synchronous database session (scripts and background work)"""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
+async def get_async_db():
+    """Dependency to get an async database session for request handlers"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
+
+async def init_async_db():
+    """Initialize database tables without blocking the event loop"""
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+async def warm_async_pool(connections: int = DB_POOL_SIZE):
+    """
+    Open pooled connections ahead of the first requests
+
+    Each new connection pays its connect and PRAGMA setup (and, with aiosqlite, a
+    thread start); doing it here keeps that off the first requests' latency.
+
+    Args:
+        connections: Connections to open concurrently (one for in-memory SQLite)
+    """
+    if IS_SQLITE_MEMORY:
+        connections = 1
+
+    async def ping():
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(max(connections, 1))))
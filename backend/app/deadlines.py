@@ -0,0 +1,107 @@
+"""
+Deadlines and cancellation of request work
+
+A Deadline bounds how long a request's work may run and is cancelled when the
+client disconnects. deadline_scope() binds it to the context, which
+run_in_threadpool carries into the worker threads, so PDF extraction, the AI
+scheduler and Gemini calls all see the deadline of the request they work for.
+Work checks it between steps and raises DeadlineExceeded; a step already
+running (a Gemini call) is bounded by the time left instead.
+
+Work outside any scope (re-evaluations, scripts) gets a deadline that never
+expires.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+from fastapi import Request
+
+# Seconds one upload request may spend on its files; the rest are reported as not processed
+UPLOAD_DEADLINE_SECONDS = float(os.getenv("UPLOAD_DEADLINE_SECONDS", "300"))
+# How often a blocked thread checks whether its deadline was cancelled
+POLL_SECONDS = 0.1
+
+DISCONNECTED = "client disconnected"
+EXPIRED = "deadline exceeded"
+
+class DeadlineExceeded(Exception):
+    """Work abandoned because its deadline passed or its client went away"""
+
+class Deadline:
+    """Time limit of a request's work, cancelled early if the client disconnects"""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.expires = time.monotonic() + seconds if seconds else None
+        self._cancel_reason: Optional[str] = None
+        self._cancelled = threading.Event()
+
+    def cancel(self, reason: str = DISCONNECTED):
+        if not self._cancelled.is_set():
+            self._cancel_reason = reason
+            self._cancelled.set()
+
+    @property
+    def expired(self) -> bool:
+        return self._cancelled.is_set() or (self.expires is not None and time.monotonic() >= self.expires)
+
+    @property
+    def reason(self) -> Optional[str]:
+        """Why the work must stop (DISCONNECTED or EXPIRED), or None while it may go on"""
+        if self._cancelled.is_set():
+            return self._cancel_reason
+        return EXPIRED if self.expired else None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None without a time limit"""
+        if self.expires is None:
+            return None
+        return max(0.0, self.expires - time.monotonic())
+
+    def timeout(self, limit: float) -> float:
+        """`limit`, shortened to the time left"""
+        remaining = self.remaining()
+        return limit if remaining is None else min(limit, remaining)
+
+    def check(self):
+        """Raise DeadlineExceeded once the work must stop"""
+        if self.expired:
+            raise DeadlineExceeded(self.reason)
+
+    def wait(self, event: threading.Event) -> bool:
+        """Block until `event` is set (True) or the work must stop (False)"""
+        while not event.wait(self.timeout(POLL_SECONDS)):
+            if self.expired:
+                return event.is_set()
+        return True
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("deadline", default=None)
+_NO_DEADLINE = Deadline()
+
+def current_deadline() -> Deadline:
+    """The deadline of the work being done (one that never expires outside any scope)"""
+    return _current.get() or _NO_DEADLINE
+
+@contextmanager
+def deadline_scope(deadline: Deadline) -> Iterator[Deadline]:
+    """Make `deadline` the current one inside the block"""
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+async def cancel_on_disconnect(request: Request, deadline: Deadline):
+    """
+    Cancel `deadline` when the client disconnects
+
+    Run as a task once the request body has been read: the next ASGI message is
+    then http.disconnect, sent when the client goes away or the response is done.
+    """
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            deadline.cancel(DISCONNECTED)
+            return
@@ -0,0 +1,185 @@
+"""
+Logging setup: structured records written by a background thread
+
+Request handlers only put records on an in-memory queue; a QueueListener thread
+formats them (JSON by default) and writes them to stdout, so slow terminal or
+pipe I/O never shows up in request latency. Records carry the request id and any
+ids bound with log_context() (job_id, resume_id), captured in the calling thread.
+A forked worker process (gunicorn) starts its own writer thread on the queue.
+
+Log calls below the configured level are dropped by the logger's level check
+before any formatting, so use lazy arguments: logger.debug("x=%s", x).
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+import orjson
+
+# Root level, e.g. INFO or DEBUG
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# Per-logger overrides: "app.routers.resumes=DEBUG,sqlalchemy.engine=INFO"
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+# "json" for one JSON object per line, "text" for human-readable lines
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+
+_context: ContextVar[Dict[str, Any]] = ContextVar("log_context", default={})
+
+# Attributes every LogRecord has; anything else on a record is a structured field
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+@contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    """Attach fields (request_id, job_id, resume_id, ...) to every record logged inside the block"""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+def bind_log_context(**fields: Any):
+    """Add fields to the current context until it ends (e.g. a resume id known mid-request)"""
+    _context.set({**_context.get(), **fields})
+
+def get_log_context() -> Dict[str, Any]:
+    """Fields currently bound with log_context() / bind_log_context()"""
+    return _context.get()
+
+class ContextFilter(logging.Filter):
+    """Copy the bound context onto the record while still in the calling thread"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in _context.get().items():
+            if key not in record.__dict__:
+                setattr(record, key, value)
+        return True
+
+def _fields(record: logging.LogRecord) -> Dict[str, Any]:
+    attributes = record.__dict__
+    return {key: attributes[key] for key in attributes.keys() - _RECORD_ATTRIBUTES if key[0] != "_"}
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, message, context fields and exc"""
+
+    def __init__(self):
+        super().__init__()
+        self._second = None
+        self._second_prefix = ""
+
+    def _timestamp(self, created: float) -> str:
+        """ISO 8601 UTC with milliseconds; the per-second prefix is formatted once"""
+        second = int(created)
+        if second != self._second:
+            self._second = second
+            self._second_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        return f"{self._second_prefix}.{int((created - second) * 1000):03d}Z"
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self._timestamp(record.created),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(_fields(record))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines with context fields appended as key=value"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = _fields(record)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Resolve the message in the calling thread, but leave formatting to the listener"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()  # snapshot args that may change after the call
+        record.args = None
+        return record
+
+def _apply_levels(root: logging.Logger, level: str, overrides: str):
+    root.setLevel(level.upper())
+    for item in filter(None, (part.strip() for part in overrides.split(","))):
+        name, _, logger_level = item.partition("=")
+        logging.getLogger(name.strip()).setLevel(logger_level.strip().upper())
+
+def setup_logging(
+    level: str = LOG_LEVEL,
+    overrides: str = LOG_LEVELS,
+    fmt: str = LOG_FORMAT,
+    queued: bool = True,
+    stream=None
+):
+    """
+    Configure the root logger (idempotent)
+
+    Args:
+        level: Root log level
+        overrides: Comma-separated logger=LEVEL pairs
+        fmt: "json" or "text"
+        queued: Write from a background thread; command-line tools that fork
+            worker processes pass False so children inherit a working handler
+        stream: Destination (default: stdout)
+    """
+    global _listener
+    stop_logging()
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JSONFormatter() if fmt == "json" else TextFormatter())
+
+    if queued:
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        handler: logging.Handler = _QueueHandler(records)
+        _listener = logging.handlers.QueueListener(records, output, respect_handler_level=False)
+        _listener.start()
+    else:
+        handler = output
+    handler.addFilter(ContextFilter())
+
+    # Neither format prints the caller's line, thread or process: skip collecting them
+    # (the "Optimization" switches from the logging HOWTO)
+    logging._srcfile = None
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    _apply_levels(root, level, overrides)
+
+def _restart_listener():
+    """A forked child has no writer thread; start one on the same queue, keeping queued records"""
+    global _listener
+    if _listener is not None:
+        _listener = logging.handlers.QueueListener(_listener.queue, *_listener.handlers, respect_handler_level=False)
+        _listener.start()
+
+def stop_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+atexit.register(stop_logging)
+os.register_at_fork(after_in_child=_restart_listener)
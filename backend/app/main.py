@@ -1,25 +1,29 @@
 from dotenv import load_dotenv
+import asyncio
 import logging
+import os
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+# Configure logging (LOG_LEVEL, LOG_LEVELS, LOG_FORMAT); records are written by a background thread
+from app.logging_config import setup_logging
+setup_logging()
 logger = logging.getLogger(__name__)
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import init_db
-from app.routers import jobs, resumes
-
-# Test AI service initialization
-from app.services.ai_service import AIService
-try:
-    ai_service = AIService()
-    print("DEBUG: AI service initialized successfully", flush=True)
-except Exception as e:
-    print(f"DEBUG: AI service initialization failed: {e}", flush=True)
+from fastapi.responses import JSONResponse, Response
+from anyio import to_thread
+from starlette.concurrency import run_in_threadpool
+from app import metrics
+from app.database import init_async_db, async_engine, warm_async_pool
+from app.middleware import AdmissionMiddleware, CompressionMiddleware, MetricsMiddleware, ProfilingMiddleware, RequestContextMiddleware
+from app.readiness import DISABLED, readiness
+from app.routers import admin, jobs, resumes
+from app.services.ai_scheduler import ai_scheduler
+from app.services.write_queue import write_queue
+from app.workers import GRACEFUL_TIMEOUT, THREADPOOL_SIZE
 
 app = FastAPI(
     title="XHireSense API",
@@ -27,6 +31,10 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Turn away oversized uploads and uploads beyond the client's cap before their body is read;
+# innermost, so rejections still get CORS headers and are counted in the metrics
+app.add_middleware(AdmissionMiddleware)
+
 # CORS middleware for Next.js frontend
 app.add_middleware(
     CORSMiddleware,
@@ -34,16 +42,88 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],  # readable by browser clients on 429/503
 )
 
-# Initialize database on startup
+# Compress large JSON payloads (brotli when available, otherwise gzip)
+app.add_middleware(CompressionMiddleware)
+
+# Later registrations wrap earlier ones: RequestContext > Profiling > Metrics > Compression > CORS > Admission.
+# Request latency includes compression, CORS and admission, not profiling or request-id setup
+app.add_middleware(MetricsMiddleware)
+
+# Opt-in request profiles (PROFILING=on); inside the request id, outside compression and metrics
+app.add_middleware(ProfilingMiddleware)
+
+# Request ids for log records (wraps everything, so all records of a request carry it)
+app.add_middleware(RequestContextMiddleware)
+
+async def _warm_ai_service():
+    if not os.getenv("GEMINI_API_KEY"):
+        return DISABLED
+    # Imports the Gemini SDK and creates the client
+    if await run_in_threadpool(resumes.get_ai_service) is None:
+        raise RuntimeError("AI service could not be initialized")
+
+async def _check_write_queue():
+    if not write_queue.running:
+        raise RuntimeError("Write queue is not running")
+
+_warm_up_task = None
+_metrics_task = None
+
+async def _publish_metrics():
+    """Publish this worker's samples for the other workers' /metrics (METRICS_DIR)"""
+    while True:
+        try:
+            await run_in_threadpool(metrics.publish)
+        except OSError as e:
+            logger.warning("Could not publish metrics: %s", e)
+        await asyncio.sleep(metrics.METRICS_PUBLISH_SECONDS)
+
+# Only the tables are created before serving; clients, pools and heavy imports are
+# warmed up in the background and reported by GET /ready
 @app.on_event("startup")
 async def startup_event():
-    init_db()
+    global _warm_up_task, _metrics_task
+    # Threads for blocking work in this worker process
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    await init_async_db()
+    write_queue.start()
+    _warm_up_task = asyncio.create_task(readiness.warm_up({
+        "database": warm_async_pool,
+        "write_queue": _check_write_queue,
+        "ai_service": _warm_ai_service,
+        "pdf_extractor": lambda: run_in_threadpool(resumes.pdf_service.warm_up),
+    }))
+    if metrics.METRICS_DIR:
+        _metrics_task = asyncio.create_task(_publish_metrics())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if _warm_up_task is not None and not _warm_up_task.done():
+        _warm_up_task.cancel()
+        await asyncio.gather(_warm_up_task, return_exceptions=True)
+    # The server has drained in-flight requests by now; a Gemini call whose request
+    # went away may still be running in the threadpool
+    if not await run_in_threadpool(ai_scheduler.wait_idle, GRACEFUL_TIMEOUT):
+        logger.warning("Shutting down with %d AI analyses still running", ai_scheduler.in_flight)
+    # Flush queued writes before closing pooled connections
+    await write_queue.stop()
+    await async_engine.dispose()
+    if _metrics_task is not None:
+        _metrics_task.cancel()
+        await asyncio.gather(_metrics_task, return_exceptions=True)
+        # Final counts; the other workers stop adding this one's gauges
+        try:
+            metrics.publish(running=False)
+        except OSError as e:
+            logger.warning("Could not publish metrics: %s", e)
 
 # Include routers
 app.include_router(jobs.router)
 app.include_router(resumes.router)
+app.include_router(admin.router)
 
 @app.get("/")
 async def root():
@@ -56,3 +136,14 @@ async def root():
 @app.get("/health")
 async def health():
     return {"status": "healthy"}
+
+@app.get("/ready")
+async def ready():
+    """Readiness: 200 once the AI client, database pool, write queue and PDF backends are warm, else 503"""
+    return JSONResponse(readiness.report(), status_code=200 if readiness.ready else 503)
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Latency histograms and gauges in the Prometheus text format, summed over all worker processes"""
+    content = await run_in_threadpool(metrics.render) if metrics.METRICS_DIR else metrics.render()
+    return Response(content=content, headers={"Content-Type": metrics.CONTENT_TYPE})
@@ -0,0 +1,338 @@
+"""
+In-process metrics in the Prometheus text exposition format
+
+A deliberately small subset of a Prometheus client: counters, gauges and
+histograms with fixed label names, safe to update from the event loop and from
+threadpool workers. Recording a sample is a bisect plus a lock, so the
+instruments stay on in production. GET /metrics renders everything registered
+here.
+
+With several worker processes (`run.py --prod`) a scrape reaches any one of
+them, so each worker publishes its samples to a JSON file in METRICS_DIR every
+METRICS_PUBLISH_SECONDS and at shutdown, and render() merges the files of the
+other workers into its own samples: counters and histograms are summed over
+every worker that ran (so they stay monotonic when a worker is replaced),
+gauges over the workers still running. Other workers' samples are at most
+METRICS_PUBLISH_SECONDS old.
+"""
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Directory the worker processes of one server publish their samples to (set by run.py --prod
+# and gunicorn.conf.py); unset, /metrics reports this process only
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+# Seconds between publications of a worker's samples
+METRICS_PUBLISH_SECONDS = float(os.getenv("METRICS_PUBLISH_SECONDS", "5"))
+# A running worker's file older than this many publication intervals counts as a dead worker's
+_STALE_INTERVALS = 3
+
+# Seconds; spans a cached GET (~1 ms) to a slow Gemini call (~30 s)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_REGISTRY: List["_Metric"] = []
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+        _REGISTRY.append(self)
+
+    def labels(self, *values: str):
+        """The child series for these label values (created on first use)"""
+        key = tuple(map(str, values))
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _default(self):
+        """The single series of a metric without labels"""
+        return self._children[()]
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def snapshot(self) -> list:
+        """[label values, state] of every child series, for publication"""
+        return [[list(values), child.state()] for values, child in list(self._children.items())]
+
+    def render(self, published: Sequence[Tuple[dict, bool]] = ()) -> List[str]:
+        """
+        Exposition lines of this process's series, plus those published by other workers
+
+        Args:
+            published: (snapshot, running) of the other workers; gauges of stopped ones are skipped
+        """
+        children = self._children
+        if published:
+            children = {}
+            for values, child in list(self._children.items()):
+                children[values] = merged = self._new_child()
+                merged.merge(child.state())
+            for snapshot, running in published:
+                if self.type_name == "gauge" and not running:
+                    continue
+                for values, state in snapshot.get(self.name, ()):
+                    values = tuple(values)
+                    if values not in children:
+                        children[values] = self._new_child()
+                    children[values].merge(state)
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for values, child in sorted(children.items()):
+            lines.extend(child.render(self.name, self.labelnames, values))
+        return lines
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+    def state(self) -> float:
+        return self.value
+
+    def merge(self, state: float):
+        self.value += state
+
+    def render(self, name, labelnames, values) -> List[str]:
+        return [f"{name}{_format_labels(labelnames, values)} {_format_value(self.value)}"]
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._default().dec(amount)
+
+    def set(self, value: float):
+        self._default().set(value)
+
+class _HistogramValue:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot: above the largest bucket
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def state(self) -> list:
+        with self._lock:
+            return [list(self.counts), self.sum]
+
+    def merge(self, state: list):
+        counts, total = state
+        if len(counts) != len(self.counts):
+            return  # published by a worker with other buckets (mid-deploy)
+        with self._lock:
+            self.counts = [mine + theirs for mine, theirs in zip(self.counts, counts)]
+            self.sum += total
+
+    def render(self, name, labelnames, values) -> List[str]:
+        with self._lock:
+            counts = list(self.counts)
+            total = self.sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{name}_bucket{_format_labels(labelnames, values, le)} {cumulative}")
+        labels = _format_labels(labelnames, values)
+        lines.append(f"{name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{name}_count{labels} {cumulative}")
+        return lines
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+    def time(self):
+        return self._default().time()
+
+_publication: Optional[Tuple[int, str]] = None  # (pid, file) this process publishes to
+
+def _publication_path() -> str:
+    """This process's file in METRICS_DIR (a forked worker gets its own)"""
+    global _publication
+    pid = os.getpid()
+    if _publication is None or _publication[0] != pid:
+        # Unique per process start, so a reused pid never takes over an old worker's totals
+        _publication = (pid, os.path.join(METRICS_DIR, f"{pid}-{uuid.uuid4().hex[:8]}.json"))
+    return _publication[1]
+
+def publish(running: bool = True):
+    """Write this process's samples to METRICS_DIR (no-op when unset); running=False at shutdown"""
+    if not METRICS_DIR:
+        return
+    path = _publication_path()
+    snapshot = {metric.name: metric.snapshot() for metric in _REGISTRY}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as tmp:
+        json.dump({"running": running, "metrics": snapshot}, tmp, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+def _published() -> List[Tuple[dict, bool]]:
+    """(snapshot, running) of every other process that published to METRICS_DIR"""
+    if not METRICS_DIR:
+        return []
+    own = _publication_path()
+    stale = time.time() - _STALE_INTERVALS * METRICS_PUBLISH_SECONDS
+    published = []
+    for path in glob.glob(os.path.join(METRICS_DIR, "*.json")):
+        if path == own:
+            continue
+        try:
+            modified = os.path.getmtime(path)
+            with open(path) as published_file:
+                entry = json.load(published_file)
+        except (OSError, ValueError):
+            continue  # replaced or removed meanwhile
+        published.append((entry["metrics"], entry["running"] and modified >= stale))
+    return published
+
+def clear_published(directory: str):
+    """Remove the files of a previous server run, before its workers start"""
+    for path in glob.glob(os.path.join(directory, "*.json*")):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def render() -> str:
+    """All registered metrics in the Prometheus text format, merged over the worker processes"""
+    published = _published()
+    lines = []
+    for metric in _REGISTRY:
+        lines.extend(metric.render(published))
+    return "\n".join(lines) + "\n"
+
+# HTTP
+HTTP_REQUEST_SECONDS = Histogram(
+    "xhiresense_http_request_duration_seconds", "HTTP request latency by route template",
+    ("method", "route", "status")
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "xhiresense_http_requests_in_flight", "HTTP requests currently being served"
+)
+
+# Upload pipeline
+PDF_EXTRACTION_SECONDS = Histogram(
+    "xhiresense_pdf_extraction_seconds", "PDF text extraction time by backend that produced the text",
+    ("extractor", "outcome")
+)
+CONTACT_PARSE_SECONDS = Histogram(
+    "xhiresense_contact_parse_seconds", "Name/email/phone parsing time per resume",
+    buckets=(0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005)
+)
+ANALYSIS_QUEUE_DEPTH = Gauge(
+    "xhiresense_analysis_queue_depth", "Uploaded files admitted and not yet stored"
+)
+UPLOADS_IN_PROGRESS = Gauge(
+    "xhiresense_uploads_in_progress", "Admitted upload requests still being processed"
+)
+ADMISSION_REJECTIONS = Counter(
+    "xhiresense_admission_rejections_total", "Uploads rejected by admission control", ("reason",)
+)
+UPLOAD_FILES_ABANDONED = Counter(
+    "xhiresense_upload_files_abandoned_total",
+    "Uploaded files not processed because the client disconnected or the deadline passed", ("reason",)
+)
+AI_CALL_SECONDS = Histogram(
+    "xhiresense_ai_call_duration_seconds", "Latency of single Gemini generate_content calls", ("outcome",)
+)
+AI_QUEUE_SECONDS = Histogram(
+    "xhiresense_ai_queue_seconds", "Time a Gemini call waited for a slot, by priority class", ("priority",)
+)
+AI_WAITING = Gauge(
+    "xhiresense_ai_calls_waiting", "Gemini calls waiting for a slot, by priority class", ("priority",)
+)
+AI_RETRIES = Histogram(
+    "xhiresense_ai_retries", "Retries needed per resume analysis", buckets=(0, 1, 2, 3)
+)
+AI_TOKENS = Histogram(
+    "xhiresense_ai_tokens", "Tokens per Gemini call (estimated when the SDK does not report usage)",
+    ("direction",), buckets=(250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+)
+DB_COMMIT_SECONDS = Histogram(
+    "xhiresense_db_commit_duration_seconds", "Database commit time, including the final flush"
+)
@@ -0,0 +1,7 @@
+from .admission import AdmissionMiddleware
+from .compression import CompressionMiddleware
+from .metrics import MetricsMiddleware
+from .profiling import ProfilingMiddleware
+from .request_context import RequestContextMiddleware
+
+__all__ = ["AdmissionMiddleware", "CompressionMiddleware", "MetricsMiddleware", "ProfilingMiddleware", "RequestContextMiddleware"]
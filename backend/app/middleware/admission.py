@@ -0,0 +1,76 @@
+from typing import Iterable
+from fastapi import status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.services.admission import (
+    ADMISSION_CLIENT_HEADER, UPLOAD_MAX_BYTES, AdmissionController, Rejected, admission
+)
+
+class AdmissionMiddleware:
+    """
+    Turn uploads away before their body is read
+
+    For POST requests to `paths`: a Content-Length above UPLOAD_MAX_MB gets 413
+    at once (a body without Content-Length is cut off with 413 once it passes the
+    limit), and the client's concurrent uploads are capped (429), as is the
+    analysis queue (503). The rest of admission happens in the handler.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        paths: Iterable[str] = ("/api/resumes/upload",),
+        controller: AdmissionController = admission,
+        max_bytes: int = UPLOAD_MAX_BYTES
+    ):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.controller = controller
+        self.max_bytes = max_bytes
+
+    def _too_large(self) -> Rejected:
+        return Rejected(
+            status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, "too_large",
+            f"Upload exceeds {self.max_bytes // (1024 * 1024)} MiB"
+        )
+
+    def _client(self, scope: Scope) -> str:
+        if ADMISSION_CLIENT_HEADER:
+            for name, value in scope["headers"]:
+                if name == ADMISSION_CLIENT_HEADER.encode("latin-1"):
+                    # X-Forwarded-For: the first address is the original client
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        client = self._client(scope)
+        try:
+            for name, value in scope["headers"]:
+                if name == b"content-length" and value.isdigit() and int(value) > self.max_bytes:
+                    raise self._too_large()
+            self.controller.enter_client(client)
+        except Rejected as e:
+            response = JSONResponse({"detail": e.detail}, status_code=e.status_code, headers=e.headers)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def receive_limited() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise self._too_large()
+            return message
+
+        try:
+            await self.app(scope, receive_limited, send)
+        finally:
+            self.controller.exit_client(client)
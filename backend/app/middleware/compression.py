@@ -0,0 +1,172 @@
+import os
+import zlib
+from typing import Optional
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+
+# Responses smaller than this are sent uncompressed
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))  # 4-5 is the sweet spot for dynamic content
+# Bodies above this size are compressed in the threadpool instead of on the event loop
+COMPRESSION_OFFLOAD_SIZE = int(os.getenv("COMPRESSION_OFFLOAD_SIZE", str(256 * 1024)))
+
+# Already-compressed formats: recompressing wastes CPU for no gain
+INCOMPRESSIBLE_TYPES = ("application/pdf", "application/zip", "application/gzip", "image/", "audio/", "video/")
+
+class _GzipEncoder:
+    encoding = "gzip"
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31: gzip container
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(zlib.Z_FINISH if finish else zlib.Z_SYNC_FLUSH)
+
+class _BrotliEncoder:
+    encoding = "br"
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        out = self._compressor.process(data)
+        return out + (self._compressor.finish() if finish else self._compressor.flush())
+
+def _accepted_encodings(accept_encoding: str) -> set:
+    """Parse Accept-Encoding, dropping codings explicitly refused with q=0"""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        params = params.replace(" ", "")
+        if params in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if coding:
+            accepted.add(coding.lower())
+    return accepted
+
+class CompressionMiddleware:
+    """
+    Brotli/gzip response compression with a minimum size and streaming support
+
+    Brotli is preferred when the client accepts it and the package is installed.
+    Buffered responses below minimum_size go out untouched. Streamed responses
+    are compressed chunk by chunk with a flush after each chunk, so clients
+    receive data as soon as it is produced.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MINIMUM_SIZE,
+        gzip_level: int = GZIP_LEVEL,
+        brotli_quality: int = BROTLI_QUALITY
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _select_encoder(self, scope: Scope):
+        accepted = _accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            return lambda: _BrotliEncoder(self.brotli_quality)
+        if "gzip" in accepted or "*" in accepted:
+            return lambda: _GzipEncoder(self.gzip_level)
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoder_factory = self._select_encoder(scope)
+        if encoder_factory is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self.app, encoder_factory, self.minimum_size)
+        await responder(scope, receive, send)
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, encoder_factory, minimum_size: int):
+        self.app = app
+        self.encoder_factory = encoder_factory
+        self.minimum_size = minimum_size
+        self.send: Optional[Send] = None
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+        self.encoder = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    def _prepare_headers(self, length: Optional[int]):
+        headers = MutableHeaders(raw=self.initial_message["headers"])
+        headers["Content-Encoding"] = self.encoder.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(length)
+        # The compressed bytes are a different representation: only weakly equal
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+    async def send_compressed(self, message: Message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Hold the headers until the first body chunk decides the encoding
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                "content-encoding" in headers
+                or "content-range" in headers
+                or message["status"] in (204, 206, 304)
+                or headers.get("content-type", "").startswith(INCOMPRESSIBLE_TYPES)
+            )
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            if not self.started:
+                self.started = True
+                await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            if len(body) < self.minimum_size and not more_body:
+                await self.send(self.initial_message)
+                await self.send(message)
+                self.passthrough = True
+                return
+
+            self.encoder = self.encoder_factory()
+            if not more_body:
+                if len(body) >= COMPRESSION_OFFLOAD_SIZE:
+                    body = await run_in_threadpool(self.encoder.compress, body, True)
+                else:
+                    body = self.encoder.compress(body, True)
+                self._prepare_headers(len(body))
+            else:
+                body = self.encoder.compress(body, False)
+                self._prepare_headers(None)
+            await self.send(self.initial_message)
+            await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+
+        # Subsequent chunks of a streamed response
+        body = self.encoder.compress(body, not more_body)
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
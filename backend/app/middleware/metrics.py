@@ -0,0 +1,39 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS_IN_FLIGHT
+
+class MetricsMiddleware:
+    """
+    Per-route latency histogram and in-flight gauge for HTTP requests
+
+    Requests are labelled with the matched route template (`/api/resumes/{resume_id}`),
+    never the raw path, so the number of series stays bounded; anything that did not
+    match a route is counted as "unmatched".
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                scope["method"], getattr(route, "path", "unmatched"), status_code
+            ).observe(time.perf_counter() - started)
@@ -0,0 +1,61 @@
+from urllib.parse import parse_qs
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.logging_config import get_log_context
+from app.profiling import (
+    PROFILING_ENABLED, ProfilingSession, RequestProfile, profile_store, profile_trigger
+)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = "x-profile-id"
+# The profile admin endpoints are never profiled themselves
+ADMIN_PREFIX = "/api/admin/profiles"
+
+class ProfilingMiddleware:
+    """
+    Profile requests that ask for it (X-Profile header, ?profile= flag) or are sampled
+
+    The profile id is returned in X-Profile-Id; the profile itself is stored for
+    GET /api/admin/profiles/{id} once the response body has been sent. A no-op
+    unless PROFILING=on.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if not PROFILING_ENABLED or scope["type"] != "http" or scope["path"].startswith(ADMIN_PREFIX):
+            await self.app(scope, receive, send)
+            return
+
+        header = next((value.decode("latin-1") for name, value in scope["headers"] if name == PROFILE_HEADER), None)
+        query = None
+        if b"profile=" in scope["query_string"]:
+            query = parse_qs(scope["query_string"].decode("latin-1")).get("profile", [None])[0]
+        trigger = profile_trigger(header, query)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(
+            method=scope["method"],
+            path=scope["path"],
+            trigger=trigger,
+            request_id=get_log_context().get("request_id")
+        )
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                MutableHeaders(scope=message)[PROFILE_ID_HEADER] = profile.id
+            await send(message)
+
+        session = ProfilingSession(profile)
+        session.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            session.stop()
+            route = scope.get("route")
+            profile.route = getattr(route, "path", None)
+            profile_store.add(profile)
@@ -0,0 +1,42 @@
+import re
+import uuid
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.logging_config import log_context
+
+REQUEST_ID_HEADER = "x-request-id"
+
+# Client-supplied ids are reused only if short and harmless in a log line
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+class RequestContextMiddleware:
+    """
+    Give every request an id and attach it to all log records it produces
+
+    An incoming X-Request-ID is reused (so ids can be followed across services),
+    otherwise one is generated; either way it is echoed in the response.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if not request_id or not _REQUEST_ID_RE.match(request_id):
+            request_id = uuid.uuid4().hex
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        with log_context(request_id=request_id):
+            await self.app(scope, receive, send_wrapper)
@@ -1,4 +1,7 @@
 from .job import Job
-from .resume import Resume, ResumeAnalysis, EmailStatus
+from .resume import Resume, ResumeAnalysis, ResumeFingerprint, EmailStatus
+from .cache_version import CacheVersion
+from .skill_stats import JobSkillCount, JobAnalysisCount
 
-__all__ = ["Job", "Resume", "ResumeAnalysis", "EmailStatus"]
+__all__ = ["Job", "Resume", "ResumeAnalysis", "ResumeFingerprint", "EmailStatus", "CacheVersion",
+           "JobSkillCount", "JobAnalysisCount"]
@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, String
+from app.database import Base
+
+class CacheVersion(Base):
+    """Version counter for cached collections that are not owned by a single job"""
+    __tablename__ = "cache_versions"
+
+    scope = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
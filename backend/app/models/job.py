@@ -1,16 +1,25 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
+# Default bucket cutoffs (match percentage), overridable per job
+DEFAULT_STRONG_FIT_THRESHOLD = 80.0
+DEFAULT_POTENTIAL_THRESHOLD = 60.0
+
 class Job(Base):
     __tablename__ = "jobs"
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False, index=True)
     description = Column(Text, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    term_index = Column(Text, nullable=True)  # JSON {term: weight} of the description, for reverse matching
+    strong_fit_threshold = Column(Float, nullable=False, default=DEFAULT_STRONG_FIT_THRESHOLD, server_default=str(DEFAULT_STRONG_FIT_THRESHOLD))
+    potential_threshold = Column(Float, nullable=False, default=DEFAULT_POTENTIAL_THRESHOLD, server_default=str(DEFAULT_POTENTIAL_THRESHOLD))
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Bumped by every write to the job or its resumes
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)  # list_jobs order
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
-    resumes = relationship("Resume", back_populates="job", cascade="all, delete-orphan")
+    # Child rows are removed by ON DELETE CASCADE in the database, not loaded by the ORM
+    resumes = relationship("Resume", back_populates="job", cascade="all, delete-orphan", passive_deletes=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Float, Boolean, DateTime, LargeBinary, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -16,27 +16,53 @@ class EmailStatusEnum(str, enum.Enum):
 
 class Resume(Base):
     __tablename__ = "resumes"
+    __table_args__ = (
+        # Listing filters and dashboard counts are always scoped by job, optionally by bucket
+        Index("ix_resumes_job_id_bucket", "job_id", "bucket"),
+        # Blob collection checks whether any resume still references a PDF
+        Index("ix_resumes_pdf_sha256", "pdf_sha256"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False, index=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
     filename = Column(String(255), nullable=False)
     extracted_text = Column(Text, nullable=False)
+    pdf_sha256 = Column(String(64), nullable=True)  # Original PDF in the blob store (shared by identical uploads)
+    minhash = Column(LargeBinary, nullable=True)  # MinHash signature of extracted_text (near-duplicate detection)
+    duplicate_of_id = Column(Integer, ForeignKey("resumes.id", ondelete="SET NULL"), nullable=True, index=True)  # Earlier resume of the same candidate
     name = Column(String(255), nullable=True)
     email = Column(String(255), nullable=True)
     mobile = Column(String(50), nullable=True)
-    bucket = Column(SQLEnum(BucketType), nullable=False, default=BucketType.REJECT, index=True)
+    bucket = Column(SQLEnum(BucketType), nullable=False, default=BucketType.REJECT)
+    bucket_overridden = Column(Boolean, nullable=False, default=False, server_default="0")  # Set by manual override; re-bucketing skips these
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     job = relationship("Job", back_populates="resumes")
-    analysis = relationship("ResumeAnalysis", back_populates="resume", uselist=False, cascade="all, delete-orphan")
-    email_status = relationship("EmailStatus", back_populates="resume", uselist=False, cascade="all, delete-orphan")
+    analysis = relationship("ResumeAnalysis", back_populates="resume", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
+    email_status = relationship("EmailStatus", back_populates="resume", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
+
+class ResumeFingerprint(Base):
+    """LSH band and contact hashes of a resume, for near-duplicate lookups"""
+    __tablename__ = "resume_fingerprints"
+    __table_args__ = (
+        # Lookups are "which resumes of this job have any of these fingerprints"
+        Index("ix_resume_fingerprints_job_fingerprint", "job_id", "fingerprint", "resume_id"),
+    )
+
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True)
+    fingerprint = Column(BigInteger, primary_key=True)
+    job_id = Column(Integer, nullable=False)
 
 class ResumeAnalysis(Base):
     __tablename__ = "resume_analyses"
+    __table_args__ = (
+        # Covers the join, min_match filter, sort and average without reading the row
+        Index("ix_resume_analyses_resume_id_match", "resume_id", "match_percentage"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False, unique=True, index=True)
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
     match_percentage = Column(Float, nullable=False)
     matched_skills = Column(Text, nullable=False)  # JSON array stored as text
     missing_skills = Column(Text, nullable=False)  # JSON array stored as text
@@ -49,9 +75,13 @@ class ResumeAnalysis(Base):
 
 class EmailStatus(Base):
     __tablename__ = "email_statuses"
+    __table_args__ = (
+        # Covers the pending-responses count joined from resumes
+        Index("ix_email_statuses_resume_id_status", "resume_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False, unique=True, index=True)
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
     status = Column(SQLEnum(EmailStatusEnum), nullable=False, default=EmailStatusEnum.NOT_SENT)
     form_link = Column(Text, nullable=True)
     sent_at = Column(DateTime(timezone=True), nullable=True)
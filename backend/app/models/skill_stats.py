@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from app.database import Base
+
+class JobSkillCount(Base):
+    """How many analyzed resumes of a job list a skill as matched, missing or bonus, per scope"""
+    __tablename__ = "job_skill_counts"
+    # Rows live in the primary key (SQLite), so a write's lookup of its skills reads only those
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    # Primary key leads with (job_id, skill): writes look up the skills of one analysis
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    skill = Column(String(255), primary_key=True)  # Normalized name (case and spacing folded)
+    kind = Column(String(10), primary_key=True)  # "matched", "missing" or "bonus"
+    scope = Column(String(20), primary_key=True)  # "ALL" or a bucket
+    name = Column(String(255), nullable=False)  # Skill as first written by the analysis
+    resumes = Column(Integer, nullable=False)
+
+# Top-K skills of a job are the first rows of this index (most resumes first, then by name), no sort needed
+Index(
+    "ix_job_skill_counts_top",
+    JobSkillCount.job_id, JobSkillCount.scope, JobSkillCount.kind, JobSkillCount.resumes.desc(), JobSkillCount.skill
+)
+
+class JobAnalysisCount(Base):
+    """Analyzed resumes of a job per scope; the denominator of skill percentages"""
+    __tablename__ = "job_analysis_counts"
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    scope = Column(String(20), primary_key=True)  # "ALL" (present once the job's counts are built) or a bucket
+    resumes = Column(Integer, nullable=False)
@@ -0,0 +1,238 @@
+"""
+Opt-in request profiling
+
+With PROFILING=on, a request is profiled when it carries `X-Profile: 1` (or
+`?profile=1`), or at random at PROFILE_SAMPLE_RATE. When PROFILE_TOKEN is set,
+the header or query value must be that token instead of 1, and the admin
+endpoints require it too.
+
+A profiled request records every SQL statement it executes (count and time,
+grouped by statement text, so an N+1 shows up as one statement run N times) and
+a call profile of the event loop thread. The call profile comes from
+pyinstrument when it is installed (`pip install pyinstrument`) and from
+cProfile otherwise. Only one call profile runs at a time per process; a
+request that arrives while another is profiled still gets its SQL statistics.
+Results are kept in memory (the last PROFILE_MAX_STORED) and served by
+/api/admin/profiles.
+
+Limits: code running in the threadpool (PDF extraction, AI calls) is not in the
+call profile, and cProfile also sees other requests served by the event loop
+meanwhile. Writes committed through the write queue run in its task and are not
+counted in the request's SQL.
+"""
+import cProfile
+import hmac
+import importlib.util
+import io
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from sqlalchemy import event
+from app.database import async_engine, engine
+
+# "on" enables profiling; everything below is inert otherwise
+PROFILING_ENABLED = os.getenv("PROFILING", "off").lower() in ("on", "1", "true")
+# Fraction of requests profiled without being asked, e.g. 0.01
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+# Shared secret for the X-Profile header / ?profile= flag and the admin endpoints
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+# "auto" (pyinstrument when installed), "pyinstrument" or "cprofile"
+PROFILER = os.getenv("PROFILER", "auto").lower()
+# Profiles kept in memory per process
+PROFILE_MAX_STORED = int(os.getenv("PROFILE_MAX_STORED", "100"))
+# pyinstrument sampling interval in seconds
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.001"))
+# Functions listed in a cProfile report
+PROFILE_CPROFILE_LINES = 40
+# Distinct statements listed per profile, slowest first
+PROFILE_SQL_STATEMENTS = 25
+
+_sql_stats: ContextVar[Optional["SQLStats"]] = ContextVar("profile_sql_stats", default=None)
+# cProfile and pyinstrument both hook the interpreter; one profile at a time
+_profiler_slot = threading.Lock()
+
+def profiler_backend() -> str:
+    if PROFILER == "auto":
+        return "pyinstrument" if importlib.util.find_spec("pyinstrument") else "cprofile"
+    return PROFILER
+
+class SQLStats:
+    """Statements executed by one request, grouped by their text"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Dict[str, List[float]] = {}  # text -> [count, seconds]
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        entry = self.statements.setdefault(statement, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    def slowest(self, limit: int = PROFILE_SQL_STATEMENTS) -> List[Dict[str, Any]]:
+        ranked = sorted(self.statements.items(), key=lambda item: -item[1][1])[:limit]
+        return [
+            {"statement": " ".join(text.split()), "count": count, "total_ms": round(seconds * 1000, 3)}
+            for text, (count, seconds) in ranked
+        ]
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _sql_stats.get() is not None:
+        conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _sql_stats.get()
+    started = conn.info.get("profile_started")
+    if stats is not None and started:
+        stats.record(statement, time.perf_counter() - started.pop())
+
+for _engine in (async_engine.sync_engine, engine):
+    event.listen(_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(_engine, "after_cursor_execute", _after_cursor_execute)
+
+@dataclass
+class RequestProfile:
+    """SQL statistics and call profile of one request"""
+    method: str
+    path: str
+    trigger: str
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    request_id: Optional[str] = None
+    route: Optional[str] = None
+    status: Optional[int] = None
+    started_at: float = field(default_factory=time.time)
+    duration_ms: float = 0.0
+    sql: SQLStats = field(default_factory=SQLStats)
+    profiler: Optional[str] = None
+    report: Optional[str] = None
+    session: Any = None  # pyinstrument session, rendered as HTML on request
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "request_id": self.request_id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "trigger": self.trigger,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 3),
+            "sql_count": self.sql.count,
+            "sql_ms": round(self.sql.seconds * 1000, 3),
+            "profiler": self.profiler,
+        }
+
+    def detail(self) -> Dict[str, Any]:
+        return {**self.summary(), "sql_statements": self.sql.slowest(), "report": self.report}
+
+class ProfileStore:
+    """The most recent profiles of this process, by id"""
+
+    def __init__(self, max_entries: int = PROFILE_MAX_STORED):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, RequestProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile: RequestProfile):
+        with self._lock:
+            self._entries[profile.id] = profile
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        with self._lock:
+            return self._entries.get(profile_id)
+
+    def recent(self) -> List[RequestProfile]:
+        """Newest first"""
+        with self._lock:
+            return list(reversed(self._entries.values()))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+profile_store = ProfileStore()
+
+def token_valid(value: Optional[str]) -> bool:
+    """Whether a header or query value asks for (or authorizes) profiling"""
+    if not value:
+        return False
+    if PROFILE_TOKEN:
+        return hmac.compare_digest(value.encode(), PROFILE_TOKEN.encode())
+    return value.lower() in ("1", "true", "on")
+
+def profile_trigger(header: Optional[str], query: Optional[str]) -> Optional[str]:
+    """Why this request should be profiled ("header", "query", "sample"), or None"""
+    if token_valid(header):
+        return "header"
+    if token_valid(query):
+        return "query"
+    if PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE:
+        return "sample"
+    return None
+
+class ProfilingSession:
+    """Collect a request's SQL statistics and, if the profiler is free, its call profile"""
+
+    def __init__(self, profile: RequestProfile):
+        self.profile = profile
+        self._token = None
+        self._profiler = None
+        self._backend = None
+        self._started = 0.0
+
+    def start(self):
+        self._token = _sql_stats.set(self.profile.sql)
+        if _profiler_slot.acquire(blocking=False):
+            try:
+                self._backend = profiler_backend()
+                if self._backend == "pyinstrument":
+                    from pyinstrument import Profiler
+                    self._profiler = Profiler(interval=PROFILE_INTERVAL, async_mode="enabled")
+                    self._profiler.start()
+                else:
+                    self._profiler = cProfile.Profile()
+                    self._profiler.enable()
+            except Exception:
+                _profiler_slot.release()
+                self._profiler = None
+                raise
+        self._started = time.perf_counter()
+
+    def stop(self) -> RequestProfile:
+        self.profile.duration_ms = (time.perf_counter() - self._started) * 1000
+        _sql_stats.reset(self._token)
+        if self._profiler is None:
+            return self.profile
+        try:
+            if self._backend == "pyinstrument":
+                self._profiler.stop()
+                self.profile.report = self._profiler.output_text(unicode=False, color=False)
+                self.profile.session = self._profiler.last_session
+            else:
+                self._profiler.disable()
+                output = io.StringIO()
+                pstats.Stats(self._profiler, stream=output).sort_stats("cumulative").print_stats(PROFILE_CPROFILE_LINES)
+                self.profile.report = output.getvalue()
+            self.profile.profiler = self._backend
+        finally:
+            _profiler_slot.release()
+        return self.profile
+
+def render_html(profile: RequestProfile) -> Optional[str]:
+    """pyinstrument's interactive HTML view of a profile (None for cProfile profiles)"""
+    if profile.session is None:
+        return None
+    from pyinstrument.renderers import HTMLRenderer
+    return HTMLRenderer().render(profile.session)
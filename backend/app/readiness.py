@@ -0,0 +1,78 @@
+"""
+Readiness of the components warmed up after startup
+
+The server accepts connections as soon as the tables exist; the AI client, the
+database connection pool and the PDF backends are then prepared by a background
+task. GET /ready answers 503 until every component is usable, so a load balancer
+only routes traffic to a warm process, while GET /health answers from the start.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+READY = "ready"
+# Not configured (e.g. no GEMINI_API_KEY); does not hold back readiness
+DISABLED = "disabled"
+FAILED = "failed"
+
+# A warm-up step returns the component's status (READY when it returns None) or raises
+WarmUpStep = Callable[[], Awaitable[Optional[str]]]
+
+class Readiness:
+    """Status of each startup component, reported by GET /ready"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self._components: Dict[str, Dict[str, Any]] = {}
+
+    def mark(self, name: str, status: str, seconds: Optional[float] = None, error: Optional[str] = None):
+        component: Dict[str, Any] = {"status": status}
+        if seconds is not None:
+            component["seconds"] = round(seconds, 3)
+        if error:
+            component["error"] = error
+        self._components[name] = component
+
+    @property
+    def ready(self) -> bool:
+        return bool(self._components) and all(
+            component["status"] in (READY, DISABLED) for component in self._components.values()
+        )
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "uptime_seconds": round(time.monotonic() - self.started, 3),
+            "components": dict(self._components),
+        }
+
+    async def warm_up(self, steps: Dict[str, WarmUpStep]):
+        """
+        Run the warm-up steps concurrently, recording each one's status and duration
+
+        Args:
+            steps: Component name -> async step
+        """
+        for name in steps:
+            self.mark(name, PENDING)
+
+        async def run(name: str, step: WarmUpStep):
+            started = time.perf_counter()
+            try:
+                status = await step() or READY
+            except Exception as e:
+                logger.exception("Warm-up of %s failed", name)
+                self.mark(name, FAILED, time.perf_counter() - started, str(e) or type(e).__name__)
+                return
+            self.mark(name, status, time.perf_counter() - started)
+
+        await asyncio.gather(*(run(name, step) for name, step in steps.items()))
+        logger.info(
+            "Warm-up finished", extra={"ready": self.ready, "startup_seconds": round(time.monotonic() - self.started, 3)}
+        )
+
+readiness = Readiness()
@@ -0,0 +1,174 @@
+"""
+Fast serialization path for resume responses
+
+Listing endpoints can return thousands of resumes. Instead of building a
+ResumeWithAnalysis tree per row and letting FastAPI validate and re-encode it,
+these helpers turn flat result rows into plain dicts that orjson serializes
+directly. The skill columns already hold JSON arrays, so they are spliced in
+verbatim with orjson.Fragment instead of being decoded and re-encoded.
+
+The payload shape matches ResumeWithAnalysis exactly; the routes keep it as
+their response_model for the OpenAPI schema.
+"""
+from typing import Mapping, Optional
+import anyio
+import orjson
+from fastapi.responses import ORJSONResponse, Response
+from starlette.types import Receive, Scope, Send
+from app.models.resume import Resume, ResumeAnalysis, EmailStatus
+
+# Columns fetched for a resume listing (extracted_text is deliberately left out)
+RESUME_LISTING_COLUMNS = (
+    Resume.id,
+    Resume.job_id,
+    Resume.filename,
+    Resume.name,
+    Resume.email,
+    Resume.mobile,
+    Resume.bucket,
+    Resume.bucket_overridden,
+    Resume.pdf_sha256,
+    Resume.duplicate_of_id,
+    Resume.uploaded_at,
+    ResumeAnalysis.id.label("analysis_id"),
+    ResumeAnalysis.match_percentage,
+    ResumeAnalysis.matched_skills,
+    ResumeAnalysis.missing_skills,
+    ResumeAnalysis.bonus_skills,
+    ResumeAnalysis.reasoning,
+    ResumeAnalysis.created_at.label("analysis_created_at"),
+    EmailStatus.id.label("email_status_id"),
+    EmailStatus.status.label("email_status"),
+    EmailStatus.form_link,
+    EmailStatus.sent_at,
+    EmailStatus.response_received_at,
+)
+
+Fragment = orjson.Fragment
+
+def resume_row_payload(row) -> dict:
+    """Build a ResumeWithAnalysis-shaped dict from a RESUME_LISTING_COLUMNS row"""
+    (
+        resume_id, job_id, filename, name, email, mobile, bucket, bucket_overridden, pdf_sha256, duplicate_of_id, uploaded_at,
+        analysis_id, match_percentage, matched_skills, missing_skills, bonus_skills, reasoning,
+        analysis_created_at, email_status_id, email_status, form_link, sent_at, response_received_at
+    ) = row
+    return {
+        "resume": {
+            "id": resume_id,
+            "job_id": job_id,
+            "filename": filename,
+            "name": name,
+            "email": email,
+            "mobile": mobile,
+            "bucket": bucket,
+            "bucket_overridden": bool(bucket_overridden),
+            "pdf_sha256": pdf_sha256,
+            "duplicate_of_id": duplicate_of_id,
+            "uploaded_at": uploaded_at,
+        },
+        "analysis": None if analysis_id is None else {
+            "id": analysis_id,
+            "match_percentage": match_percentage,
+            "matched_skills": Fragment(matched_skills),
+            "missing_skills": Fragment(missing_skills),
+            "bonus_skills": Fragment(bonus_skills),
+            "reasoning": reasoning,
+            "created_at": analysis_created_at,
+        },
+        "email_status": None if email_status_id is None else {
+            "id": email_status_id,
+            "status": email_status,
+            "form_link": form_link,
+            "sent_at": sent_at,
+            "response_received_at": response_received_at,
+        },
+    }
+
+def resume_payload(
+    resume: Resume,
+    analysis: Optional[ResumeAnalysis],
+    email_status: Optional[EmailStatus]
+) -> dict:
+    """Build a ResumeWithAnalysis-shaped dict from ORM objects"""
+    return resume_row_payload((
+        resume.id, resume.job_id, resume.filename, resume.name, resume.email, resume.mobile,
+        resume.bucket, resume.bucket_overridden, resume.pdf_sha256,
+        resume.duplicate_of_id, resume.uploaded_at,
+        analysis.id if analysis else None,
+        analysis.match_percentage if analysis else None,
+        analysis.matched_skills if analysis else None,
+        analysis.missing_skills if analysis else None,
+        analysis.bonus_skills if analysis else None,
+        analysis.reasoning if analysis else None,
+        analysis.created_at if analysis else None,
+        email_status.id if email_status else None,
+        email_status.status if email_status else None,
+        email_status.form_link if email_status else None,
+        email_status.sent_at if email_status else None,
+        email_status.response_received_at if email_status else None,
+    ))
+
+class FastJSONResponse(ORJSONResponse):
+    """orjson-backed response; content may contain Fragments and datetimes"""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+class RangedFileResponse(Response):
+    """
+    Send bytes start..end (inclusive) of a file
+
+    Uses the ASGI zero-copy extension (sendfile) when the server offers it,
+    otherwise streams the range in chunks without loading the file into memory.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        start: int,
+        end: int,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None
+    ):
+        self.path = path
+        self.start = start
+        self.length = end - start + 1
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.init_headers(headers)
+        self.headers["content-length"] = str(self.length)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"] == "HEAD" or self.length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            with open(self.path, "rb") as file:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file,
+                    "offset": self.start,
+                    "count": self.length,
+                    "more_body": False,
+                })
+            return
+
+        remaining = self.length
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            # The file shrank underneath us; end the response rather than hang
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import HTMLResponse, PlainTextResponse
+from typing import List, Optional
+from app.profiling import PROFILING_ENABLED, PROFILE_TOKEN, profile_store, render_html, token_valid
+from app.schemas.profiling import ProfileDetail, ProfileSummary
+
+router = APIRouter(prefix="/api/admin/profiles", tags=["admin"])
+
+def require_profiling(request: Request):
+    """Profiles exist only with PROFILING=on, and are readable only with PROFILE_TOKEN when one is set"""
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profiling is disabled")
+    if PROFILE_TOKEN and not token_valid(request.headers.get("x-profile") or request.query_params.get("profile")):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="A valid X-Profile token is required")
+
+@router.get("", response_model=List[ProfileSummary], dependencies=[Depends(require_profiling)])
+async def list_profiles(
+    route: Optional[str] = None,
+    min_ms: float = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500)
+):
+    """Recent profiles of this process, newest first, optionally for one route template or above a duration"""
+    profiles = [
+        profile for profile in profile_store.recent()
+        if (route is None or profile.route == route) and profile.duration_ms >= min_ms
+    ]
+    return [profile.summary() for profile in profiles[:limit]]
+
+@router.get("/{profile_id}", response_model=ProfileDetail, dependencies=[Depends(require_profiling)])
+async def get_profile(profile_id: str, format: str = Query("json", pattern="^(json|text|html)$")):
+    """One profile: SQL statements slowest first and the call profile (as JSON, plain text or pyinstrument HTML)"""
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    if format == "text":
+        return PlainTextResponse(profile.report or "No call profile (another request was being profiled)\n")
+    if format == "html":
+        html = render_html(profile)
+        if html is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="HTML is only available for pyinstrument profiles")
+        return HTMLResponse(html)
+    return profile.detail()
+
+@router.delete("", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(require_profiling)])
+async def clear_profiles():
+    """Drop all stored profiles"""
+    profile_store.clear()
+    return None
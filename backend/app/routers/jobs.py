@@ -1,118 +1,184 @@
 from app.services.resume_parser import ResumeParser
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from app.services.bucketing import rebucket_job
+from app.services.versioning import (
+    bump_job_version, bump_job_list_version, get_job_version, get_job_list_version
+)
+from app.services.response_cache import conditional_json
+from app.services.job_index import job_terms, serialize_terms
+from app.services.skill_stats import rebuild_job_skills, skills_built, top_skills
+from app.services.blob_gc import collect_deleted_blobs
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.database import get_async_db
 from app.models.job import Job
 from app.schemas.job import JobCreate, JobResponse, JobListResponse, JobUpdate
-from app.schemas.dashboard import JobDashboardResponse
+from app.schemas.dashboard import JobDashboardResponse, JobSkillsResponse
 from app.models.resume import Resume, ResumeAnalysis, EmailStatus, BucketType, EmailStatusEnum
-from sqlalchemy import func, case
+from sqlalchemy import func, case, delete, select
 
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
 
 @router.post("/", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
-async def create_job(job: JobCreate, db: Session = Depends(get_db)):
+async def create_job(job: JobCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new job posting"""
-    db_job = Job(title=job.title, description=job.description)
+    db_job = Job(
+        title=job.title,
+        description=job.description,
+        term_index=serialize_terms(job_terms(job.description)),
+        strong_fit_threshold=job.strong_fit_threshold,
+        potential_threshold=job.potential_threshold
+    )
     db.add(db_job)
-    db.commit()
-    db.refresh(db_job)
+    await bump_job_list_version(db)
+    await db.commit()
+    await db.refresh(db_job)
     return db_job
 
 @router.get("/", response_model=JobListResponse)
-async def list_jobs(db: Session = Depends(get_db)):
-    """List all jobs"""
-    jobs = db.query(Job).order_by(Job.created_at.desc()).all()
-    return JobListResponse(jobs=jobs)
+async def list_jobs(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """List all jobs (supports If-None-Match)"""
+    async def build():
+        jobs = (await db.scalars(select(Job).order_by(Job.created_at.desc()))).all()
+        return JobListResponse(jobs=jobs).model_dump()
+
+    version = await get_job_list_version(db)
+    return await conditional_json(request, ("list_jobs",), version, build)
 
 @router.get("/{job_id}", response_model=JobResponse)
-async def get_job(job_id: int, db: Session = Depends(get_db)):
+async def get_job(job_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific job by ID"""
-    job = db.query(Job).filter(Job.id == job_id).first()
+    job = await db.get(Job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return job
 
 @router.put("/{job_id}", response_model=JobResponse)
-async def update_job(job_id: int, job_update: JobUpdate, db: Session = Depends(get_db)):
-    """Update a job posting and re-evaluate all associated resumes"""
-    job = db.query(Job).filter(Job.id == job_id).first()
+async def update_job(job_id: int, job_update: JobUpdate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Update a job posting
+
+    A new description re-evaluates all associated resumes with the AI service.
+    New bucket thresholds only re-bucket the stored match percentages in SQL.
+    """
+    job = await db.get(Job, job_id)
     if not job:
-        raise HTTPException(status_codeew=404, detail="Job not found")
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    update_data = {
+        field: value
+        for field, value in job_update.dict(exclude_unset=True).items()
+        if value is not None
+    }
+
+    strong_fit_threshold = update_data.get("strong_fit_threshold", job.strong_fit_threshold)
+    potential_threshold = update_data.get("potential_threshold", job.potential_threshold)
+    if potential_threshold > strong_fit_threshold:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="potential_threshold must not exceed strong_fit_threshold"
+        )
+
+    thresholds_changed = (
+        strong_fit_threshold != job.strong_fit_threshold
+        or potential_threshold != job.potential_threshold
+    )
+    description_changed = (
+        "description" in update_data and update_data["description"] != job.description
+    )
 
     # Update job fields if provided
-    update_data = job_update.dict(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(job, field, value)
+
+    if description_changed:
+        job.term_index = serialize_terms(job_terms(job.description))
+
+    if thresholds_changed:
+        await rebucket_job(db, job)
+
     if update_data:
-        for field, value in update_data.items():
-            setattr(job, field, value)
+        job.version = job.version + 1
+        await bump_job_list_version(db)
 
-    # Commit job update
-    db.commit()
-    db.refresh(job)
+    # Commit job update (and re-bucketing) together
+    await db.commit()
+    await db.refresh(job)
 
-    ResumeParser.reevaluateAll(job_id, job_update.description)
+    if description_changed:
+        await ResumeParser.reevaluateAll(job_id, job.description)
     return job
 
 
 @router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_job(job_id: int, db: Session = Depends(get_db)):
-    """Delete a job and all associated resumes"""
-    job = db.query(Job).filter(Job.id == job_id).first()
-    if not job:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
-    
+async def delete_job(job_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Delete a job and all associated resumes (cascaded by the database)"""
     try:
-        db.delete(job)
-        db.commit()
+        digests = (await db.scalars(select(Resume.pdf_sha256).where(Resume.job_id == job_id).distinct())).all()
+        result = await db.execute(delete(Job).where(Job.id == job_id))
+        # The job list only changes (and its cached copies go stale) when a job was deleted
+        if result.rowcount:
+            await bump_job_list_version(db)
+            await db.commit()
+        else:
+            await db.rollback()
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete job: {str(e)}"
         )
-    
+
+    if result.rowcount == 0:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+
+    await collect_deleted_blobs(db, digests)
     return None
 
 @router.get("/{job_id}/dashboard", response_model=JobDashboardResponse)
-async def get_job_dashboard(job_id: int, db: Session = Depends(get_db)):
-    """Get dashboard statistics for a job"""
-    job = db.query(Job).filter(Job.id == job_id).first()
-    if not job:
+async def get_job_dashboard(job_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Get dashboard statistics for a job (supports If-None-Match)"""
+    version = await get_job_version(db, job_id)
+    if version is None:
         raise HTTPException(status_code=404, detail="Job not found")
-    
+    return await conditional_json(
+        request, ("job_dashboard", job_id), version,
+        lambda: _build_dashboard(job_id, db)
+    )
+
+async def _build_dashboard(job_id: int, db: AsyncSession) -> dict:
+    """Compute dashboard statistics for an existing job"""
+
+    # Bucket counts in one pass over the (job_id, bucket) index
+    bucket_counts = dict((await db.execute(
+        select(Resume.bucket, func.count())
+        .where(Resume.job_id == job_id)
+        .group_by(Resume.bucket)
+    )).all())
+    strong_fit_count = bucket_counts.get(BucketType.STRONG_FIT, 0)
+    potential_count = bucket_counts.get(BucketType.POTENTIAL, 0)
+    reject_count = bucket_counts.get(BucketType.REJECT, 0)
+
     # Total resumes
-    total_resumes = db.query(Resume).filter(Resume.job_id == job_id).count()
-    
-    # Bucket counts
-    strong_fit_count = db.query(Resume).filter(
-        Resume.job_id == job_id,
-        Resume.bucket == BucketType.STRONG_FIT
-    ).count()
-    
-    potential_count = db.query(Resume).filter(
-        Resume.job_id == job_id,
-        Resume.bucket == BucketType.POTENTIAL
-    ).count()
-    
-    reject_count = db.query(Resume).filter(
-        Resume.job_id == job_id,
-        Resume.bucket == BucketType.REJECT
-    ).count()
-    
+    total_resumes = strong_fit_count + potential_count + reject_count
+
     # Average match percentage
-    avg_match = db.query(func.avg(ResumeAnalysis.match_percentage)).join(
-        Resume, ResumeAnalysis.resume_id == Resume.id
-    ).filter(Resume.job_id == job_id).scalar()
-    
+    avg_match = await db.scalar(
+        select(func.avg(ResumeAnalysis.match_percentage))
+        .join(Resume, ResumeAnalysis.resume_id == Resume.id)
+        .where(Resume.job_id == job_id)
+    )
+
     # Pending screening responses (emails sent but no response)
-    pending_count = db.query(EmailStatus).join(
-        Resume, EmailStatus.resume_id == Resume.id
-    ).filter(
-        Resume.job_id == job_id,
-        EmailStatus.status == EmailStatusEnum.SENT
-    ).count()
-    
+    pending_count = await db.scalar(
+        select(func.count()).select_from(EmailStatus)
+        .join(Resume, EmailStatus.resume_id == Resume.id)
+        .where(
+            Resume.job_id == job_id,
+            EmailStatus.status == EmailStatusEnum.SENT
+        )
+    )
+
     return JobDashboardResponse(
         job_id=job_id,
         total_resumes=total_resumes,
@@ -121,4 +187,49 @@ async def get_job_dashboard(job_id: int, db: Session = Depends(get_db)):
         reject_count=reject_count,
         average_match_percentage=float(avg_match) if avg_match else None,
         pending_screening_responses=pending_count
+    ).model_dump()
+
+@router.get("/{job_id}/skills", response_model=JobSkillsResponse)
+async def get_job_skills(
+    job_id: int,
+    request: Request,
+    top: int = Query(10, ge=1, le=100),
+    bucket: Optional[BucketType] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Most common matched, missing and bonus skills of a job's analyzed resumes (supports If-None-Match)
+
+    Read from the job's skill counts, which every analysis write keeps current,
+    so the cost grows with `top` rather than with the number of resumes.
+    """
+    version = await get_job_version(db, job_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not await skills_built(db, job_id):
+        # Analyzed before skill counts existed: count its stored analyses once
+        await rebuild_job_skills(db, job_id)
+        await db.commit()
+    return await conditional_json(
+        request, ("job_skills", job_id, top, bucket), version,
+        lambda: _build_skills(job_id, top, bucket, db)
     )
+
+async def _build_skills(job_id: int, top: int, bucket: Optional[BucketType], db: AsyncSession) -> dict:
+    """Top skills of each kind with their share of the analyzed resumes"""
+    analyzed, skills = await top_skills(db, job_id, top, bucket)
+
+    def frequencies(kind: str) -> List[dict]:
+        return [
+            {"skill": name, "resumes": resumes, "percentage": round(100 * resumes / analyzed, 1) if analyzed else 0.0}
+            for name, resumes in skills[kind]
+        ]
+
+    return JobSkillsResponse(
+        job_id=job_id,
+        bucket=bucket,
+        analyzed_resumes=analyzed,
+        matched_skills=frequencies("matched"),
+        missing_skills=frequencies("missing"),
+        bonus_skills=frequencies("bonus")
+    ).model_dump()
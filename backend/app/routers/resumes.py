@@ -1,25 +1,49 @@
+import asyncio
 import json
-import sys
+import logging
+import time
 from datetime import datetime, timezone
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status, Form
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File, status, Form
+from sqlalchemy import delete, exists, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
-from app.database import get_db
+from app.database import get_async_db
+from app.deadlines import (
+    UPLOAD_DEADLINE_SECONDS, Deadline, DeadlineExceeded, cancel_on_disconnect, deadline_scope
+)
 from app.models.job import Job
 from app.models.resume import Resume, ResumeAnalysis, EmailStatus, BucketType, EmailStatusEnum
 from app.schemas.resume import (
     ResumeWithAnalysis, EmailStatusUpdate, EmailStatusResponse,
-    ResumeResponse, ResumeAnalysisResponse, ResumeBatchUploadResponse
+    ResumeResponse, ResumeBatchUploadResponse,
+    ResumeSelection, BulkBucketUpdate, BulkOperationResponse
 )
 from app.services.pdf_service import PDFService
-from app.services.ai_service import AIService
+from app.services.ai_scheduler import AI_INTERACTIVE_UPLOAD_FILES, BULK, INTERACTIVE, ai_work
+from app.services.ai_service import AIService, MatchResult
 from app.services.email_service import EmailService
+from app.services.bucketing import assign_bucket_for_job
+from app.services.write_queue import write_queue, WriteOp
+from app.services.admission import admission
+from app.services.versioning import bump_job_version, get_job_version
+from app.services.response_cache import conditional_json, blob_file_response
+from app.services.blob_store import blob_store
+from app.services.blob_gc import collect_deleted_blobs
+from app.services.dedup import (
+    find_duplicate, fingerprint_rows, minhash_signature, resume_fingerprints, reusable_analysis
+)
+from app.services.job_index import job_index
+from app.services.skill_stats import SkillDelta, analyzed_skill_rows, apply_skill_delta
+from app.schemas.matching import JobMatch, JobMatchResponse
+from app.logging_config import bind_log_context
+from app.metrics import UPLOAD_FILES_ABANDONED
+from app.responses import (
+    FastJSONResponse, RESUME_LISTING_COLUMNS, resume_row_payload, resume_payload
+)
 import os
 
-# Force immediate output
-def debug_print(msg):
-    print(msg, flush=True)
-    sys.stdout.flush()
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/resumes", tags=["resumes"])
 
@@ -36,267 +60,360 @@ def get_ai_service():
         try:
             gemini_key = os.getenv("GEMINI_API_KEY")
             if gemini_key:
-                debug_print(f"DEBUG: GEMINI_API_KEY found (length: {len(gemini_key)}), initializing AIService...")
                 ai_service = AIService()
-                debug_print("DEBUG: AIService initialized successfully")
+                logger.debug("AIService initialized")
             else:
-                debug_print("DEBUG: GEMINI_API_KEY not found, ai_service will be None")
+                logger.debug("GEMINI_API_KEY not found, ai_service will be None")
         except Exception as e:
-            debug_print(f"DEBUG: Error initializing AIService: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error initializing AIService: %s", e)
     return ai_service
 
 email_service = EmailService()
-debug_print("DEBUG: Resume router module loaded")
 
-def assign_bucket(match_percentage: float) -> BucketType:
-    """Assign resume to bucket based on match percentage"""
-    if match_percentage >= 80:
-        return BucketType.STRONG_FIT
-    elif match_percentage >= 60:
-        return BucketType.POTENTIAL
-    else:
-        return BucketType.REJECT
+def _store_resume_op(
+    resume_fields: dict,
+    match_result: Optional[MatchResult],
+    fingerprints: List[int]
+) -> WriteOp:
+    """
+    Build a write-queue operation that stores a resume with its analysis, email status and fingerprints
+
+    The Resume is created inside the operation from plain column values, so a
+    replay after a failed batch inserts a fresh row instead of re-adding an
+    object that the rolled-back transaction had already flushed.
+    """
+    async def op(session: AsyncSession):
+        db_resume = Resume(**resume_fields)
+        session.add(db_resume)
+        await session.flush()
+        session.add_all(fingerprint_rows(db_resume.id, db_resume.job_id, fingerprints))
+
+        db_analysis = None
+        if match_result:
+            db_analysis = ResumeAnalysis(
+                resume_id=db_resume.id,
+                match_percentage=match_result.match_percentage,
+                matched_skills=json.dumps(match_result.matched_skills),
+                missing_skills=json.dumps(match_result.missing_skills),
+                bonus_skills=json.dumps(match_result.bonus_skills),
+                reasoning=match_result.reasoning
+            )
+            session.add(db_analysis)
+        db_email_status = EmailStatus(resume_id=db_resume.id)
+        session.add(db_email_status)
+        await bump_job_version(session, job_id=db_resume.job_id)
+        await session.flush()
+        if match_result:
+            skill_delta = SkillDelta()
+            skill_delta.add(db_resume.bucket, match_result)
+            await apply_skill_delta(session, db_resume.job_id, skill_delta)
+
+        # Load server defaults (uploaded_at, created_at) before the session closes
+        await session.refresh(db_resume)
+        if db_analysis:
+            await session.refresh(db_analysis)
+        return db_resume, db_analysis, db_email_status
+    return op
 
 @router.post("/upload", response_model=ResumeBatchUploadResponse, status_code=status.HTTP_201_CREATED)
 async def upload_resume(
+    request: Request,
     job_id: int = Form(...),
     files: List[UploadFile] = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Upload and analyze multiple resumes"""
-    debug_print(f"DEBUG: Upload endpoint called - job_id: {job_id}, files count: {len(files)}")
+    """
+    Upload and analyze multiple resumes
+
+    Files are processed until the client disconnects or UPLOAD_DEADLINE_SECONDS
+    pass; resumes already analyzed are stored, the rest are reported as failed.
+    """
+    bind_log_context(job_id=job_id)
+    logger.debug("Upload of %d files", len(files))
 
     # Validate job exists
-    job = db.query(Job).filter(Job.id == job_id).first()
+    job = await db.get(Job, job_id)
     if not job:
-        debug_print(f"DEBUG: Job not found - job_id: {job_id}")
         raise HTTPException(status_code=404, detail="Job not found")
 
-    debug_print(f"DEBUG: Job found - {job.title}")
-
     uploaded = []
     failed = []
 
-    for file in files:
+    # A few files are a recruiter waiting for the result; more are bulk work for the AI scheduler
+    priority = INTERACTIVE if len(files) <= AI_INTERACTIVE_UPLOAD_FILES else BULK
+
+    deadline = Deadline(UPLOAD_DEADLINE_SECONDS)
+
+    # Reserve places in the analysis queue, or fail fast with 413/429/503 and Retry-After
+    with admission.admit(job_id, len(files)) as ticket, ai_work(priority, job_id), deadline_scope(deadline):
+        # The form has been read, so the next ASGI message is the client's disconnect
+        watcher = asyncio.create_task(cancel_on_disconnect(request, deadline))
         try:
-            debug_print(f"DEBUG: Processing file - {file.filename}")
-
-            # Validate file type
-            if not file.filename.lower().endswith('.pdf'):
-                debug_print(f"DEBUG: Invalid file type - {file.filename}")
-                failed.append({"filename": file.filename, "error": "Only PDF files are allowed"})
-                continue
-
-            # Read file content
-            file_content = await file.read()
-            debug_print(f"DEBUG: File read - size: {len(file_content)} bytes")
-
-            # Extract text from PDF
-            extracted_text = pdf_service.extract_text_from_pdf(file_content)
-            debug_print(f"DEBUG: Extracted text length: {len(extracted_text) if extracted_text else 0}")
-            if not extracted_text:
-                failed.append({"filename": file.filename, "error": "Failed to extract text from PDF"})
-                continue
-
-            # Extract contact information
-            name, email, phone = pdf_service.extract_contact_info(extracted_text)
-            debug_print(f"DEBUG: Extracted contact info - name: {name}, email: {email}, phone: {phone}")
-
-            # Create resume record (initially in REJECT bucket, will update after analysis)
-            debug_print("DEBUG: Creating resume record in database...")
-            db_resume = Resume(
-                job_id=job_id,
-                filename=file.filename,
-                extracted_text=extracted_text,
-                name=name,
-                email=email,
-                mobile=phone,
-                bucket=BucketType.REJECT
-            )
-            db.add(db_resume)
-            db.commit()
-            db.refresh(db_resume)
-            debug_print(f"DEBUG: Resume record created - id: {db_resume.id}")
-
-            # Analyze resume with AI
-            analysis_result = None
-            current_ai_service = get_ai_service()
-            debug_print(f"DEBUG: ai_service is {'available' if current_ai_service else 'None'}")
-            if current_ai_service:
+            for index, file in enumerate(files):
+                if deadline.expired:
+                    # Nobody will read the rest (or it is too late); free the capacity for other uploads
+                    skipped = files[index:]
+                    failed.extend({"filename": f.filename, "error": f"Not processed: {deadline.reason}"} for f in skipped)
+                    UPLOAD_FILES_ABANDONED.labels(deadline.reason).inc(len(skipped))
+                    logger.info("Upload stopped (%s), %d files not processed", deadline.reason, len(skipped))
+                    break
+                file_started = time.perf_counter()
                 try:
-                    debug_print("DEBUG: Starting AI analysis...")
-                    match_result = current_ai_service.analyze_resume_match(extracted_text, job.description)
-                    debug_print(f"DEBUG: AI analysis result: {match_result}")
+                    file_log = {"upload_file": file.filename}
+
+                    # Validate file type
+                    if not file.filename.lower().endswith('.pdf'):
+                        logger.debug("Rejected non-PDF upload", extra=file_log)
+                        failed.append({"filename": file.filename, "error": "Only PDF files are allowed"})
+                        continue
+
+                    # Read file content
+                    file_content = await file.read()
+                    logger.debug("Read %d bytes", len(file_content), extra=file_log)
+
+                    # Keep the original so extraction can be re-run later without a re-upload
+                    pdf_sha256 = None
+                    try:
+                        pdf_sha256 = await run_in_threadpool(blob_store.put, file_content)
+                    except OSError as e:
+                        logger.error("Error storing original PDF: %s", e, extra=file_log)
+
+                    # Extract text from PDF
+                    # PDF parsing is CPU-bound; run it in the threadpool. The extractor also
+                    # stops itself at the deadline, this bounds a single page that hangs
+                    try:
+                        extracted = await asyncio.wait_for(
+                            run_in_threadpool(pdf_service.extract, file_content),
+                            timeout=deadline.timeout(pdf_service.timeout)
+                        )
+                    except asyncio.TimeoutError:
+                        failed.append({"filename": file.filename, "error": "Timed out extracting text from PDF"})
+                        continue
+                    extracted_text = extracted.text if extracted else None
+                    logger.debug("Extracted %d characters", len(extracted_text) if extracted_text else 0, extra=file_log)
+                    if not extracted_text:
+                        failed.append({"filename": file.filename, "error": "Failed to extract text from PDF"})
+                        continue
+
+                    # Contact details sit at the top of a resume; only the first page is parsed
+                    name, email, phone = pdf_service.extract_contact_info(extracted.first_page or extracted_text)
+                    logger.debug("Extracted contact info: name=%s email=%s phone=%s", name, email, phone, extra=file_log)
+
+                    # A re-submitted or lightly edited CV reuses the earlier analysis instead of
+                    # another AI call; a matching email or phone only links the two resumes
+                    signature = await run_in_threadpool(minhash_signature, extracted_text)
+                    duplicate = await find_duplicate(db, job_id, signature, email, phone)
+                    match_result = None
+                    if duplicate and duplicate.near_duplicate:
+                        match_result = await reusable_analysis(db, duplicate.resume_id)
                     if match_result:
-                        # Assign bucket based on match percentage
-                        bucket = assign_bucket(match_result.match_percentage)
-                        debug_print(f"DEBUG: Assigned bucket: {bucket}")
-                        db_resume.bucket = bucket
-
-                        # Create analysis record
-                        db_analysis = ResumeAnalysis(
-                            resume_id=db_resume.id,
-                            match_percentage=match_result.match_percentage,
-                            matched_skills=json.dumps(match_result.matched_skills),
-                            missing_skills=json.dumps(match_result.missing_skills),
-                            bonus_skills=json.dumps(match_result.bonus_skills),
-                            reasoning=match_result.reasoning
+                        logger.info(
+                            "Near duplicate of resume %s (similarity %.2f), reusing its analysis",
+                            duplicate.resume_id, duplicate.similarity, extra=file_log
                         )
-                        db.add(db_analysis)
-                        # Commit both bucket update and analysis
-                        db.commit()
-                        db.refresh(db_resume)
-                        db.refresh(db_analysis)
-                        analysis_result = db_analysis
-                        debug_print("DEBUG: Analysis record created successfully")
                     else:
-                        debug_print("DEBUG: AI analysis returned None")
+                        # Analyze resume with AI before touching the database, so the resume,
+                        # its analysis and its email status are written in one transaction
+                        current_ai_service = get_ai_service()
+                        if current_ai_service:
+                            try:
+                                match_result = await run_in_threadpool(
+                                    current_ai_service.analyze_resume_match, extracted_text, job.description
+                                )
+                                if not match_result:
+                                    logger.warning("AI analysis returned no result", extra=file_log)
+                            except DeadlineExceeded:
+                                raise
+                            except Exception as e:
+                                logger.exception("AI analysis failed: %s", e, extra=file_log)
+                                # Continue without analysis if AI fails
+                        else:
+                            logger.warning("GEMINI_API_KEY not set, skipping AI analysis")
+
+                    # Resume starts in REJECT bucket unless the analysis places it elsewhere
+                    bucket = BucketType.REJECT
+                    if match_result:
+                        bucket = assign_bucket_for_job(match_result.match_percentage, job)
+
+                    db_resume, analysis_result, db_email_status = await write_queue.submit(_store_resume_op(
+                        dict(
+                            job_id=job_id,
+                            filename=file.filename,
+                            extracted_text=extracted_text,
+                            pdf_sha256=pdf_sha256,
+                            minhash=signature,
+                            duplicate_of_id=duplicate.resume_id if duplicate else None,
+                            name=name,
+                            email=email,
+                            mobile=phone,
+                            bucket=bucket
+                        ),
+                        match_result,
+                        resume_fingerprints(signature, email, phone)
+                    ))
+                    logger.info(
+                        "Stored resume (bucket %s)", bucket.value,
+                        extra={**file_log, "resume_id": db_resume.id}
+                    )
+
+                    uploaded.append(resume_payload(db_resume, analysis_result, db_email_status))
+
+                except DeadlineExceeded as e:
+                    # Abandoned before its analysis finished; the next iteration reports the rest
+                    failed.append({"filename": file.filename, "error": f"Not processed: {e}"})
+                    UPLOAD_FILES_ABANDONED.labels(str(e)).inc()
                 except Exception as e:
-                    debug_print(f"ERROR in AI analysis: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    # Continue without analysis if AI fails
-            else:
-                debug_print("WARNING: GEMINI_API_KEY not set, skipping AI analysis")
-
-            # Create email status record
-            db_email_status = EmailStatus(resume_id=db_resume.id)
-            db.add(db_email_status)
-            db.commit()
-            db.refresh(db_email_status)
-
-            db.refresh(db_resume)
-
-            # Parse analysis skills if available
-            analysis_response = None
-            if analysis_result:
-                analysis_response = ResumeAnalysisResponse(
-                    id=analysis_result.id,
-                    match_percentage=analysis_result.match_percentage,
-                    matched_skills=json.loads(analysis_result.matched_skills),
-                    missing_skills=json.loads(analysis_result.missing_skills),
-                    bonus_skills=json.loads(analysis_result.bonus_skills),
-                    reasoning=analysis_result.reasoning,
-                    created_at=analysis_result.created_at
-                )
-
-            uploaded.append(ResumeWithAnalysis(
-                resume=ResumeResponse(
-                    id=db_resume.id,
-                    job_id=db_resume.job_id,
-                    filename=db_resume.filename,
-                    name=db_resume.name,
-                    email=db_resume.email,
-                    mobile=db_resume.mobile,
-                    bucket=db_resume.bucket,
-                    uploaded_at=db_resume.uploaded_at
-                ),
-                analysis=analysis_response,
-                email_status=EmailStatusResponse(
-                    id=db_email_status.id,
-                    status=db_email_status.status,
-                    form_link=db_email_status.form_link,
-                    sent_at=db_email_status.sent_at,
-                    response_received_at=db_email_status.response_received_at
-                )
-            ))
-
-        except Exception as e:
-            debug_print(f"ERROR processing file {file.filename}: {e}")
-            failed.append({"filename": file.filename, "error": str(e)})
-
-    debug_print(f"DEBUG: Upload complete - uploaded: {len(uploaded)}, failed: {len(failed)}")
-
-    return ResumeBatchUploadResponse(
-        uploaded=uploaded,
-        failed=failed
+                    logger.exception("Error processing file: %s", e, extra={"upload_file": file.filename})
+                    failed.append({"filename": file.filename, "error": str(e)})
+                finally:
+                    ticket.file_done(time.perf_counter() - file_started)
+        finally:
+            # Also on errors and cancellation, or the task stays parked in receive()
+            watcher.cancel()
+
+    logger.info("Upload complete: %d uploaded, %d failed", len(uploaded), len(failed))
+
+    # Payloads already match ResumeBatchUploadResponse; skip re-validation
+    return FastJSONResponse(
+        status_code=status.HTTP_201_CREATED,
+        content={"uploaded": uploaded, "failed": failed}
     )
 
 @router.get("/job/{job_id}", response_model=List[ResumeWithAnalysis])
 async def list_resumes(
     job_id: int,
+    request: Request,
     bucket: Optional[BucketType] = None,
     min_match: Optional[float] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List all resumes for a job with optional filtering"""
-    query = db.query(Resume).filter(Resume.job_id == job_id)
+    """List all resumes for a job with optional filtering (supports If-None-Match)"""
+    async def build():
+        return await _list_resume_payloads(job_id, bucket, min_match, db)
+
+    version = await get_job_version(db, job_id)
+    if version is None:
+        return FastJSONResponse(content=[])
+    return await conditional_json(request, ("list_resumes", job_id, bucket, min_match), version, build)
+
+async def _list_resume_payloads(
+    job_id: int,
+    bucket: Optional[BucketType],
+    min_match: Optional[float],
+    db: AsyncSession
+) -> list:
+    """Fetch listing rows and turn them into response payloads"""
+    # One query for resume, analysis and email status; rows go straight to orjson
+    query = (
+        select(*RESUME_LISTING_COLUMNS)
+        .outerjoin(ResumeAnalysis, ResumeAnalysis.resume_id == Resume.id)
+        .outerjoin(EmailStatus, EmailStatus.resume_id == Resume.id)
+        .where(Resume.job_id == job_id)
+    )
     
     if bucket:
-        query = query.filter(Resume.bucket == bucket)
-    
-    # Join with ResumeAnalysis for sorting and filtering
-    query = query.outerjoin(ResumeAnalysis, ResumeAnalysis.resume_id == Resume.id)
+        query = query.where(Resume.bucket == bucket)
     
     if min_match is not None:
-        query = query.filter(ResumeAnalysis.match_percentage >= min_match)
+        query = query.where(ResumeAnalysis.match_percentage >= min_match)
     
     # Default sort: highest match first
-    resumes = query.order_by(
-        ResumeAnalysis.match_percentage.desc().nullslast()
-    ).all()
+    rows = (await db.execute(query.order_by(
+        ResumeAnalysis.match_percentage.desc().nullslast(),
+        Resume.id
+    ))).all()
     
-    result = []
-    for resume in resumes:
-        analysis = db.query(ResumeAnalysis).filter(ResumeAnalysis.resume_id == resume.id).first()
-        email_status = db.query(EmailStatus).filter(EmailStatus.resume_id == resume.id).first()
-        
-        analysis_response = None
-        if analysis:
-            analysis_response = ResumeAnalysisResponse(
-                id=analysis.id,
-                match_percentage=analysis.match_percentage,
-                matched_skills=json.loads(analysis.matched_skills),
-                missing_skills=json.loads(analysis.missing_skills),
-                bonus_skills=json.loads(analysis.bonus_skills),
-                reasoning=analysis.reasoning,
-                created_at=analysis.created_at
-            )
-        
-        email_status_response = None
-        if email_status:
-            email_status_response = EmailStatusResponse(
-                id=email_status.id,
-                status=email_status.status,
-                form_link=email_status.form_link,
-                sent_at=email_status.sent_at,
-                response_received_at=email_status.response_received_at
-            )
-        
-        result.append(ResumeWithAnalysis(
-            resume=ResumeResponse(
-                id=resume.id,
-                job_id=resume.job_id,
-                filename=resume.filename,
-                name=resume.name,
-                email=resume.email,
-                mobile=resume.mobile,
-                bucket=resume.bucket,
-                uploaded_at=resume.uploaded_at
-            ),
-            analysis=analysis_response,
-            email_status=email_status_response
+    return [resume_row_payload(row) for row in rows]
+
+def _selection_criteria(selection: ResumeSelection) -> list:
+    """Build WHERE criteria on Resume for a bulk selection"""
+    criteria = [Resume.job_id == selection.job_id]
+    if selection.resume_ids is not None:
+        criteria.append(Resume.id.in_(selection.resume_ids))
+    if selection.bucket:
+        criteria.append(Resume.bucket == selection.bucket)
+    if selection.min_match is not None:
+        criteria.append(exists().where(
+            ResumeAnalysis.resume_id == Resume.id,
+            ResumeAnalysis.match_percentage >= selection.min_match
         ))
-    
-    return result
+    return criteria
+
+@router.patch("/bulk/bucket", response_model=BulkOperationResponse)
+async def bulk_update_bucket(
+    bulk_update: BulkBucketUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Manually override the bucket of many resumes with a single UPDATE"""
+    # Bump first: the job row lock keeps the rows read for the skill counts current
+    await bump_job_version(db, job_id=bulk_update.job_id)
+    criteria = _selection_criteria(bulk_update)
+    # Skill counts move with the analyzed resumes that change buckets
+    skill_delta = SkillDelta()
+    for row in await analyzed_skill_rows(db, *criteria, Resume.bucket != bulk_update.new_bucket):
+        skill_delta.move(row.bucket, bulk_update.new_bucket, row)
+    result = await db.execute(
+        update(Resume)
+        .where(*criteria)
+        .values(bucket=bulk_update.new_bucket, bucket_overridden=True)
+        .execution_options(synchronize_session=False)
+    )
+    await apply_skill_delta(db, bulk_update.job_id, skill_delta)
+    await db.commit()
+    return BulkOperationResponse(affected=result.rowcount)
+
+@router.post("/bulk/delete", response_model=BulkOperationResponse)
+async def bulk_delete_resumes(
+    selection: ResumeSelection,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Delete many resumes with a single DELETE (related records cascade)"""
+    try:
+        # Bump first: the job row lock keeps the rows read for the skill counts current
+        await bump_job_version(db, job_id=selection.job_id)
+        criteria = _selection_criteria(selection)
+        skill_delta = SkillDelta()
+        skill_delta.add_rows(await analyzed_skill_rows(db, *criteria), sign=-1)
+        digests = (await db.scalars(select(Resume.pdf_sha256).where(*criteria).distinct())).all()
+        result = await db.execute(
+            delete(Resume)
+            .where(*criteria)
+            .execution_options(synchronize_session=False)
+        )
+        await apply_skill_delta(db, selection.job_id, skill_delta)
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to delete resumes: {str(e)}"
+        )
+    await collect_deleted_blobs(db, digests)
+    return BulkOperationResponse(affected=result.rowcount)
 
 @router.patch("/{resume_id}/bucket", response_model=ResumeResponse)
 async def update_bucket(
     resume_id: int,
-    bucket: BucketType,
-    db: Session = Depends(get_db)
+    bucket: BucketType
 ):
     """Manually override resume bucket"""
-    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    async def op(session: AsyncSession):
+        resume = await session.get(Resume, resume_id)
+        if resume:
+            await bump_job_version(session, job_id=resume.job_id)
+            skill_delta = SkillDelta()
+            for row in await analyzed_skill_rows(session, Resume.id == resume_id):
+                skill_delta.move(row.bucket, bucket, row)
+            resume.bucket = bucket
+            resume.bucket_overridden = True
+            await session.flush()
+            await apply_skill_delta(session, resume.job_id, skill_delta)
+        return resume
+
+    resume = await write_queue.submit(op)
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
-    resume.bucket = bucket
-    db.commit()
-    db.refresh(resume)
-    
     return ResumeResponse(
         id=resume.id,
         job_id=resume.job_id,
@@ -305,6 +422,7 @@ async def update_bucket(
         email=resume.email,
         mobile=resume.mobile,
         bucket=resume.bucket,
+        bucket_overridden=resume.bucket_overridden,
         uploaded_at=resume.uploaded_at
     )
 
@@ -312,20 +430,21 @@ async def update_bucket(
 async def send_screening_form(
     resume_id: int,
     candidate_email: str = Form(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Send screening form email to candidate"""
-    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    resume = await db.get(Resume, resume_id)
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
-    email_status = db.query(EmailStatus).filter(EmailStatus.resume_id == resume_id).first()
+    email_status = await db.scalar(select(EmailStatus).where(EmailStatus.resume_id == resume_id))
     if not email_status:
         email_status = EmailStatus(resume_id=resume_id)
         db.add(email_status)
-        db.commit()
+        await bump_job_version(db, job_id=resume.job_id)
+        await db.commit()
     
-    job = db.query(Job).filter(Job.id == resume.job_id).first()
+    job = await db.get(Job, resume.job_id)
     
     # Send email
     form_link = email_service.get_form_link()
@@ -339,9 +458,10 @@ async def send_screening_form(
         email_status.status = EmailStatusEnum.SENT
         email_status.form_link = form_link
         email_status.sent_at = datetime.now(timezone.utc)
-        db.commit()
+        await bump_job_version(db, job_id=resume.job_id)
+        await db.commit()
     
-    db.refresh(email_status)
+    await db.refresh(email_status)
     
     return EmailStatusResponse(
         id=email_status.id,
@@ -354,23 +474,26 @@ async def send_screening_form(
 @router.patch("/{resume_id}/email-status", response_model=EmailStatusResponse)
 async def update_email_status(
     resume_id: int,
-    status_update: EmailStatusUpdate,
-    db: Session = Depends(get_db)
+    status_update: EmailStatusUpdate
 ):
     """Update email status (e.g., mark as response received)"""
-    email_status = db.query(EmailStatus).filter(EmailStatus.resume_id == resume_id).first()
-    if not email_status:
-        raise HTTPException(status_code=404, detail="Email status not found")
+    async def op(session: AsyncSession):
+        email_status = await session.scalar(select(EmailStatus).where(EmailStatus.resume_id == resume_id))
+        if not email_status:
+            return None
 
-    email_status.status = status_update.status
-    if status_update.form_link:
-        email_status.form_link = status_update.form_link
+        email_status.status = status_update.status
+        if status_update.form_link:
+            email_status.form_link = status_update.form_link
 
-    if status_update.status == EmailStatusEnum.RESPONSE_RECEIVED:
-        email_status.response_received_at = datetime.now(timezone.utc)
+        if status_update.status == EmailStatusEnum.RESPONSE_RECEIVED:
+            email_status.response_received_at = datetime.now(timezone.utc)
+        await bump_job_version(session, resume_id=resume_id)
+        return email_status
 
-    db.commit()
-    db.refresh(email_status)
+    email_status = await write_queue.submit(op)
+    if not email_status:
+        raise HTTPException(status_code=404, detail="Email status not found")
 
     return EmailStatusResponse(
         id=email_status.id,
@@ -380,18 +503,94 @@ async def update_email_status(
         response_received_at=email_status.response_received_at
     )
 
+@router.get("/{resume_id}/pdf")
+async def download_resume_pdf(
+    resume_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Download the original PDF (supports Range and If-None-Match)"""
+    row = (await db.execute(
+        select(Resume.filename, Resume.pdf_sha256).where(Resume.id == resume_id)
+    )).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    filename, pdf_sha256 = row
+    if pdf_sha256 is None or not blob_store.exists(pdf_sha256):
+        raise HTTPException(status_code=404, detail="Original PDF not stored for this resume")
+    return blob_file_response(request, blob_store.path(pdf_sha256), pdf_sha256, filename, "application/pdf")
+
+@router.get("/{resume_id}/job-matches", response_model=JobMatchResponse)
+async def match_resume_to_jobs(
+    resume_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    explain: int = Query(0, ge=0, le=5),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Rank all jobs for a resume
+
+    Jobs are scored locally against the precomputed job term index. The best
+    `explain` matches are additionally sent to the AI service for a full
+    analysis; those analyses are returned but not stored.
+    """
+    resume_text = await db.scalar(select(Resume.extracted_text).where(Resume.id == resume_id))
+    if resume_text is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    await job_index.ensure_current(db)
+    jobs_considered = job_index.size
+    ranked = await run_in_threadpool(job_index.rank, resume_text, limit)
+    matches = [
+        JobMatch(
+            job_id=match.job_id,
+            title=match.title,
+            score=match.score,
+            matched_terms=match.matched_terms,
+            missing_terms=match.missing_terms
+        )
+        for match in ranked
+    ]
+
+    current_ai_service = get_ai_service() if explain else None
+    if current_ai_service and matches:
+        explained = matches[:explain]
+        descriptions = dict((await db.execute(
+            select(Job.id, Job.description).where(Job.id.in_([match.job_id for match in explained]))
+        )).all())
+
+        async def analyze(match: JobMatch):
+            try:
+                with ai_work(INTERACTIVE, match.job_id):
+                    match.analysis = await run_in_threadpool(
+                        current_ai_service.analyze_resume_match, resume_text, descriptions[match.job_id]
+                    )
+            except Exception as e:
+                logger.error("AI analysis for job %s failed: %s", match.job_id, e, extra={"resume_id": resume_id})
+
+        await asyncio.gather(*(analyze(match) for match in explained if match.job_id in descriptions))
+
+    return JobMatchResponse(resume_id=resume_id, jobs_considered=jobs_considered, matches=matches)
+
 @router.delete("/{resume_id}")
 async def delete_resume(
     resume_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a resume and all associated data"""
-    resume = db.query(Resume).filter(Resume.id == resume_id).first()
-    if not resume:
+    # Bump first: the version lookup goes through the resume row
+    await bump_job_version(db, resume_id=resume_id)
+    analyzed = await analyzed_skill_rows(db, Resume.id == resume_id)
+    digest = await db.scalar(select(Resume.pdf_sha256).where(Resume.id == resume_id))
+    # ON DELETE CASCADE removes the analysis and email status rows
+    result = await db.execute(delete(Resume).where(Resume.id == resume_id))
+    if analyzed:
+        skill_delta = SkillDelta()
+        skill_delta.add_rows(analyzed, sign=-1)
+        await apply_skill_delta(db, analyzed[0].job_id, skill_delta)
+    await db.commit()
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Resume not found")
 
-    # Delete the resume (cascade will handle related records)
-    db.delete(resume)
-    db.commit()
-
+    await collect_deleted_blobs(db, [digest])
     return {"message": "Resume deleted successfully"}
@@ -1,13 +1,18 @@
 from .job import JobCreate, JobResponse, JobListResponse
 from .resume import (
     ResumeUpload, ResumeResponse, ResumeAnalysisResponse,
-    ResumeWithAnalysis, EmailStatusUpdate, EmailStatusResponse
+    ResumeWithAnalysis, EmailStatusUpdate, EmailStatusResponse,
+    ResumeSelection, BulkBucketUpdate, BulkOperationResponse
 )
-from .dashboard import JobDashboardResponse
+from .dashboard import JobDashboardResponse, SkillFrequency, JobSkillsResponse
+from .matching import JobMatch, JobMatchResponse
+from .profiling import SQLStatementStats, ProfileSummary, ProfileDetail
 
 __all__ = [
     "JobCreate", "JobResponse", "JobListResponse",
     "ResumeUpload", "ResumeResponse", "ResumeAnalysisResponse",
     "ResumeWithAnalysis", "EmailStatusUpdate", "EmailStatusResponse",
-    "JobDashboardResponse"
+    "ResumeSelection", "BulkBucketUpdate", "BulkOperationResponse",
+    "JobDashboardResponse", "SkillFrequency", "JobSkillsResponse", "JobMatch", "JobMatchResponse",
+    "SQLStatementStats", "ProfileSummary", "ProfileDetail"
 ]
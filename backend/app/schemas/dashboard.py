@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
+from app.models.resume import BucketType
 
 class JobDashboardResponse(BaseModel):
     job_id: int
@@ -9,3 +10,17 @@ class JobDashboardResponse(BaseModel):
     reject_count: int
     average_match_percentage: Optional[float] = None
     pending_screening_responses: int
+
+class SkillFrequency(BaseModel):
+    skill: str
+    resumes: int
+    percentage: float  # Of the analyzed resumes in scope
+
+class JobSkillsResponse(BaseModel):
+    """Most common skills of a job's analyzed resumes (all of them, or one bucket)"""
+    job_id: int
+    bucket: Optional[BucketType] = None
+    analyzed_resumes: int
+    matched_skills: List[SkillFrequency]  # Coverage of the job's skills
+    missing_skills: List[SkillFrequency]
+    bonus_skills: List[SkillFrequency]
@@ -1,19 +1,32 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
 from typing import Optional
+from app.models.job import DEFAULT_STRONG_FIT_THRESHOLD, DEFAULT_POTENTIAL_THRESHOLD
 
 class JobCreate(BaseModel):
     title: str = Field(..., min_length=1, max_length=255)
     description: str = Field(..., min_length=1)
+    strong_fit_threshold: float = Field(DEFAULT_STRONG_FIT_THRESHOLD, ge=0, le=100)
+    potential_threshold: float = Field(DEFAULT_POTENTIAL_THRESHOLD, ge=0, le=100)
+
+    @model_validator(mode="after")
+    def check_thresholds(self):
+        if self.potential_threshold > self.strong_fit_threshold:
+            raise ValueError("potential_threshold must not exceed strong_fit_threshold")
+        return self
 
 class JobUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = Field(None, min_length=1)
+    strong_fit_threshold: Optional[float] = Field(None, ge=0, le=100)
+    potential_threshold: Optional[float] = Field(None, ge=0, le=100)
 
 class JobResponse(BaseModel):
     id: int
     title: str
     description: str
+    strong_fit_threshold: float
+    potential_threshold: float
     created_at: datetime
     updated_at: datetime
 
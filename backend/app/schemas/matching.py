@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Optional
+from app.services.ai_service import MatchResult
+
+class JobMatch(BaseModel):
+    job_id: int
+    title: str
+    score: float
+    matched_terms: list[str]
+    missing_terms: list[str]
+    analysis: Optional[MatchResult] = None
+
+class JobMatchResponse(BaseModel):
+    resume_id: int
+    jobs_considered: int
+    matches: list[JobMatch]
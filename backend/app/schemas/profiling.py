@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class SQLStatementStats(BaseModel):
+    statement: str
+    count: int
+    total_ms: float
+
+class ProfileSummary(BaseModel):
+    id: str
+    request_id: Optional[str] = None
+    method: str
+    path: str
+    route: Optional[str] = None
+    status: Optional[int] = None
+    trigger: str
+    started_at: float
+    duration_ms: float
+    sql_count: int
+    sql_ms: float
+    profiler: Optional[str] = None
+
+class ProfileDetail(ProfileSummary):
+    sql_statements: list[SQLStatementStats]
+    report: Optional[str] = None
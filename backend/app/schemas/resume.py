@@ -14,6 +14,9 @@ class ResumeResponse(BaseModel):
     email: Optional[str] = None
     mobile: Optional[str] = None
     bucket: BucketType
+    bucket_overridden: bool = False
+    pdf_sha256: Optional[str] = None
+    duplicate_of_id: Optional[int] = None
     uploaded_at: datetime
 
     class Config:
@@ -46,6 +49,19 @@ class ResumeBatchUploadResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class ResumeSelection(BaseModel):
+    """Selects resumes of a job by explicit ids and/or a filter"""
+    job_id: int
+    resume_ids: Optional[List[int]] = None
+    bucket: Optional[BucketType] = None
+    min_match: Optional[float] = Field(None, ge=0, le=100)
+
+class BulkBucketUpdate(ResumeSelection):
+    new_bucket: BucketType
+
+class BulkOperationResponse(BaseModel):
+    affected: int
+
 class EmailStatusUpdate(BaseModel):
     status: EmailStatusEnum
     form_link: Optional[str] = None
@@ -0,0 +1,180 @@
+"""
+Admission control for uploads
+
+Every uploaded file ends in PDF extraction and a Gemini call, so uploads are
+admitted against a bounded analysis queue instead of piling up until memory or
+the AI quota runs out. An upload is rejected at once, with Retry-After, when:
+
+- the request body is larger than UPLOAD_MAX_MB, or it has more than
+  UPLOAD_MAX_FILES files (413)
+- the client or the job already has its maximum of uploads in progress in
+  this worker (429)
+- its files do not fit in the analysis queue: files admitted but not yet
+  stored, at most this worker's share of ANALYSIS_QUEUE_MAX (503)
+
+The size and per-client checks run in AdmissionMiddleware before the body is
+read; the file count, per-job and queue checks run in the upload handler once
+the form is parsed. Queue depth, uploads in progress and rejections are
+exported on /metrics.
+
+Only the queue is a host-wide budget split between workers. The per-client and
+per-job caps are counted in each worker process and not split, since a client's
+requests may land on any worker: with N workers a client can have up to
+N * UPLOAD_MAX_PER_CLIENT uploads in progress and a job N * UPLOAD_MAX_PER_JOB.
+"""
+import logging
+import math
+import os
+import threading
+from collections import Counter
+from typing import Hashable, Optional
+from fastapi import HTTPException, status
+from app.metrics import ADMISSION_REJECTIONS, ANALYSIS_QUEUE_DEPTH, UPLOADS_IN_PROGRESS
+from app.workers import per_worker
+
+logger = logging.getLogger(__name__)
+
+# Files waiting for or in analysis on the whole host, split between the worker processes
+ANALYSIS_QUEUE_MAX = int(os.getenv("ANALYSIS_QUEUE_MAX", "200"))
+# Uploads in progress per client and per job, in each worker process
+UPLOAD_MAX_PER_CLIENT = int(os.getenv("UPLOAD_MAX_PER_CLIENT", "2"))
+UPLOAD_MAX_PER_JOB = int(os.getenv("UPLOAD_MAX_PER_JOB", "4"))
+# Files in one upload request
+UPLOAD_MAX_FILES = int(os.getenv("UPLOAD_MAX_FILES", "50"))
+# Size of one upload request in MiB, checked from Content-Length before the body is read
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_MB", "100")) * 1024 * 1024
+# Header that identifies the client behind a proxy (e.g. X-Forwarded-For); default: the peer address
+ADMISSION_CLIENT_HEADER = os.getenv("ADMISSION_CLIENT_HEADER", "").lower()
+# Bounds of the Retry-After estimate in seconds
+RETRY_AFTER_MIN = 1
+RETRY_AFTER_MAX = 60
+# Assumed processing time per file until one has been measured
+INITIAL_SECONDS_PER_FILE = 5.0
+
+class Rejected(HTTPException):
+    """An upload turned away by admission control; carries Retry-After"""
+
+    def __init__(self, status_code: int, reason: str, detail: str, retry_after: Optional[int] = None):
+        headers = {"Retry-After": str(retry_after)} if retry_after else None
+        super().__init__(status_code=status_code, detail=detail, headers=headers)
+        self.reason = reason
+        ADMISSION_REJECTIONS.labels(reason).inc()
+        logger.info("Upload rejected: %s", detail, extra={"reason": reason, "status": status_code})
+
+class AdmissionController:
+    """
+    Bounded analysis queue and per-client / per-job upload caps of this process
+
+    Counters only change in the event loop thread, but the lock keeps them
+    consistent if a caller ever runs in the threadpool.
+    """
+
+    def __init__(
+        self,
+        queue_max: int = per_worker(ANALYSIS_QUEUE_MAX),
+        max_per_client: int = UPLOAD_MAX_PER_CLIENT,
+        max_per_job: int = UPLOAD_MAX_PER_JOB,
+        max_files: int = UPLOAD_MAX_FILES
+    ):
+        self.queue_max = queue_max
+        self.max_per_client = max_per_client
+        self.max_per_job = max_per_job
+        self.max_files = max_files
+        self.depth = 0
+        self.seconds_per_file = INITIAL_SECONDS_PER_FILE
+        self._clients: Counter = Counter()
+        self._jobs: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def retry_after(self, files: Optional[int] = None) -> int:
+        """Seconds until about `files` files (default: the whole queue) have been processed"""
+        uploads = max(1, sum(self._jobs.values()))
+        pending = self.depth if files is None else files
+        seconds = math.ceil(pending * self.seconds_per_file / uploads)
+        return min(RETRY_AFTER_MAX, max(RETRY_AFTER_MIN, seconds))
+
+    def enter_client(self, client: Hashable):
+        """Count one more upload of `client`, or raise Rejected (429, or 503 if the queue is full)"""
+        with self._lock:
+            if self.depth >= self.queue_max:
+                raise Rejected(
+                    status.HTTP_503_SERVICE_UNAVAILABLE, "queue_full",
+                    "Analysis queue is full, retry later", self.retry_after()
+                )
+            if self._clients[client] >= self.max_per_client:
+                raise Rejected(
+                    status.HTTP_429_TOO_MANY_REQUESTS, "client_limit",
+                    f"At most {self.max_per_client} uploads per client at a time", self.retry_after()
+                )
+            self._clients[client] += 1
+
+    def exit_client(self, client: Hashable):
+        with self._lock:
+            self._clients[client] -= 1
+            if self._clients[client] <= 0:
+                del self._clients[client]
+
+    def admit(self, job_id: int, files: int) -> "Ticket":
+        """Reserve queue places for an upload's files, or raise Rejected (413, 429 or 503)"""
+        if files > self.max_files:
+            raise Rejected(
+                status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, "too_many_files",
+                f"At most {self.max_files} files per upload"
+            )
+        with self._lock:
+            if self._jobs[job_id] >= self.max_per_job:
+                raise Rejected(
+                    status.HTTP_429_TOO_MANY_REQUESTS, "job_limit",
+                    f"At most {self.max_per_job} uploads per job at a time", self.retry_after()
+                )
+            # An upload larger than the whole queue is still admitted when the queue is empty
+            if self.depth and self.depth + files > self.queue_max:
+                raise Rejected(
+                    status.HTTP_503_SERVICE_UNAVAILABLE, "queue_full",
+                    "Analysis queue is full, retry later", self.retry_after(self.depth + files - self.queue_max)
+                )
+            self._jobs[job_id] += 1
+            self.depth += files
+        UPLOADS_IN_PROGRESS.inc()
+        ANALYSIS_QUEUE_DEPTH.set(self.depth)
+        return Ticket(self, job_id, files)
+
+    def _file_done(self, seconds: Optional[float]):
+        with self._lock:
+            self.depth -= 1
+            if seconds is not None:
+                # Moving average of the processing time per file, for Retry-After
+                self.seconds_per_file += 0.1 * (seconds - self.seconds_per_file)
+        ANALYSIS_QUEUE_DEPTH.set(self.depth)
+
+    def _release(self, job_id: int, files: int):
+        with self._lock:
+            self.depth -= files
+            self._jobs[job_id] -= 1
+            if self._jobs[job_id] <= 0:
+                del self._jobs[job_id]
+        UPLOADS_IN_PROGRESS.dec()
+        ANALYSIS_QUEUE_DEPTH.set(self.depth)
+
+class Ticket:
+    """An admitted upload's queue places; each processed file frees one, the rest are freed on exit"""
+
+    def __init__(self, controller: AdmissionController, job_id: int, files: int):
+        self._controller = controller
+        self.job_id = job_id
+        self.remaining = files
+
+    def file_done(self, seconds: Optional[float] = None):
+        """One file processed (stored or failed); `seconds` feeds the Retry-After estimate"""
+        if self.remaining:
+            self.remaining -= 1
+            self._controller._file_done(seconds)
+
+    def __enter__(self) -> "Ticket":
+        return self
+
+    def __exit__(self, *exc_info):
+        self._controller._release(self.job_id, self.remaining)
+        self.remaining = 0
+
+admission = AdmissionController()
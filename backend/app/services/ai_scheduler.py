@@ -0,0 +1,220 @@
+"""
+Priority scheduling of Gemini calls
+
+Every Gemini call takes a slot from the scheduler of its worker process (at most
+AI_MAX_CONCURRENCY slots and AI_REQUESTS_PER_MINUTE calls per minute on the
+whole host). When calls queue up, free slots go to:
+
+1. calls that have waited longer than AI_STARVATION_SECONDS, oldest first and
+   into the reserved slots too, so lower classes always make progress
+2. INTERACTIVE work (an upload of a few files, job matching), then BULK
+   (larger uploads), then BACKGROUND (re-evaluations, backfills)
+3. within a class, the jobs in turn (round robin), so one job's 5,000 resumes
+   do not hold back another job's
+
+AI_INTERACTIVE_RESERVED slots are kept for interactive calls, so a recruiter's
+upload starts at once even while bulk work fills every other slot. A slot is
+only granted together with a token of the AI_REQUESTS_PER_MINUTE quota, so the
+same order decides who gets the quota when it, not the slots, is the limit.
+
+Callers declare their class and job with `ai_work(...)` around the code that
+ends up calling Gemini; the context follows run_in_threadpool into the thread
+that waits for the slot. A caller gives up its place in the queue when the
+deadline of its request (app.deadlines) passes or its client disconnects.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Iterator, List, Optional, Tuple
+from app.deadlines import DeadlineExceeded, current_deadline
+from app.metrics import AI_QUEUE_SECONDS, AI_WAITING
+from app.workers import WORKERS, per_worker
+
+# Host-wide Gemini budgets, split evenly between the worker processes
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "16"))
+# Calls per minute allowed by the API quota; 0 means no limit
+AI_REQUESTS_PER_MINUTE = float(os.getenv("AI_REQUESTS_PER_MINUTE", "0"))
+# Slots per worker only interactive calls may use (always leaves one for the other classes)
+AI_INTERACTIVE_RESERVED = int(os.getenv("AI_INTERACTIVE_RESERVED", "1"))
+# A call waiting longer than this goes before any class
+AI_STARVATION_SECONDS = float(os.getenv("AI_STARVATION_SECONDS", "30"))
+# Uploads of at most this many files are interactive; larger ones are bulk work
+AI_INTERACTIVE_UPLOAD_FILES = int(os.getenv("AI_INTERACTIVE_UPLOAD_FILES", "3"))
+
+# Priority classes, highest first
+INTERACTIVE = 0
+BULK = 1
+BACKGROUND = 2
+PRIORITY_NAMES = ("interactive", "bulk", "background")
+
+_ai_work: ContextVar[Tuple[int, Optional[int]]] = ContextVar("ai_work", default=(INTERACTIVE, None))
+
+@contextmanager
+def ai_work(priority: int, job_id: Optional[int] = None) -> Iterator[None]:
+    """Schedule Gemini calls made inside the block as `priority` work for `job_id`"""
+    token = _ai_work.set((priority, job_id))
+    try:
+        yield
+    finally:
+        _ai_work.reset(token)
+
+class _Waiter:
+    __slots__ = ("priority", "job_id", "enqueued", "granted")
+
+    def __init__(self, priority: int, job_id: Optional[int]):
+        self.priority = priority
+        self.job_id = job_id
+        self.enqueued = time.monotonic()
+        self.granted = threading.Event()
+
+class AIScheduler:
+    """
+    Concurrency slots and requests-per-minute token bucket for Gemini calls
+
+    Callers block in their (threadpool) thread until granted a slot and a token
+    at once. With waiters left and no token, a timer dispatches again when the
+    next token is due. The bucket holds at most one second of tokens, so a
+    worker cannot burst past its share of the quota after an idle period.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        requests_per_minute: float = 0.0,
+        reserved_interactive: int = AI_INTERACTIVE_RESERVED,
+        starvation_seconds: float = AI_STARVATION_SECONDS
+    ):
+        self.max_concurrency = max_concurrency
+        self.reserved_interactive = max(0, min(reserved_interactive, max_concurrency - 1))
+        self.starvation_seconds = starvation_seconds
+        self.rate = requests_per_minute / 60  # tokens per second
+        self.capacity = max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._refill_timer: Optional[threading.Timer] = None
+        # Per class: job id -> its waiters in arrival order; jobs in round-robin order
+        self._queues: List["OrderedDict[Optional[int], Deque[_Waiter]]"] = [
+            OrderedDict() for _ in PRIORITY_NAMES
+        ]
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self.in_flight = 0
+
+    def _limit(self, priority: int) -> int:
+        return self.max_concurrency if priority == INTERACTIVE else self.max_concurrency - self.reserved_interactive
+
+    def _pop(self, priority: int, job_id: Optional[int]) -> _Waiter:
+        queue = self._queues[priority]
+        waiters = queue[job_id]
+        waiter = waiters.popleft()
+        if waiters:
+            queue.move_to_end(job_id)  # the job's next call waits for the other jobs' turn
+        else:
+            del queue[job_id]
+        return waiter
+
+    def _next(self) -> Optional[_Waiter]:
+        """The waiter to grant the next free slot to (lock held)"""
+        if self.in_flight >= self.max_concurrency:
+            return None
+        # Starved waiters first, whatever their class; only the head of each job's queue can be the oldest
+        oldest = None
+        deadline = time.monotonic() - self.starvation_seconds
+        for queue in self._queues:
+            for waiters in queue.values():
+                head = waiters[0]
+                if head.enqueued <= deadline and (oldest is None or head.enqueued < oldest.enqueued):
+                    oldest = head
+        if oldest is not None:
+            return self._pop(oldest.priority, oldest.job_id)
+        for priority, queue in enumerate(self._queues):
+            if queue and self.in_flight < self._limit(priority):
+                return self._pop(priority, next(iter(queue)))
+        return None
+
+    def _dispatch(self):
+        """Grant free slots, each with a quota token, to waiters (lock held)"""
+        while True:
+            if self.rate and not self._token_ready():
+                self._schedule_refill()
+                return
+            waiter = self._next()
+            if waiter is None:
+                return
+            if self.rate:
+                self._tokens -= 1
+            self.in_flight += 1
+            AI_WAITING.labels(PRIORITY_NAMES[waiter.priority]).dec()
+            waiter.granted.set()
+
+    def _token_ready(self) -> bool:
+        """Refill the bucket for the time elapsed; whether a token is available (lock held)"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return self._tokens >= 1
+
+    def _schedule_refill(self):
+        """Dispatch again when the next token is due, if anyone could take it (lock held)"""
+        if self._refill_timer is not None or self.in_flight >= self.max_concurrency:
+            return
+        if not any(self._queues):
+            return
+        self._refill_timer = threading.Timer((1 - self._tokens) / self.rate, self._refill)
+        self._refill_timer.daemon = True
+        self._refill_timer.start()
+
+    def _refill(self):
+        with self._lock:
+            self._refill_timer = None
+            self._dispatch()
+
+    def _abandon(self, waiter: _Waiter) -> bool:
+        """Take a waiter whose deadline passed out of its queue; False if it was granted meanwhile"""
+        with self._lock:
+            if waiter.granted.is_set():
+                return False
+            queue = self._queues[waiter.priority]
+            waiters = queue[waiter.job_id]
+            waiters.remove(waiter)
+            if not waiters:
+                del queue[waiter.job_id]
+            AI_WAITING.labels(PRIORITY_NAMES[waiter.priority]).dec()
+            return True
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """
+        Hold one call's slot (and quota token) for the duration of the block
+
+        Raises DeadlineExceeded, without taking a slot, if the current deadline
+        passes or is cancelled while waiting.
+        """
+        priority, job_id = _ai_work.get()
+        waiter = _Waiter(priority, job_id)
+        deadline = current_deadline()
+        with self._lock:
+            self._queues[priority].setdefault(job_id, deque()).append(waiter)
+            AI_WAITING.labels(PRIORITY_NAMES[priority]).inc()
+            self._dispatch()
+        if not deadline.wait(waiter.granted) and self._abandon(waiter):
+            raise DeadlineExceeded(deadline.reason)
+        try:
+            AI_QUEUE_SECONDS.labels(PRIORITY_NAMES[priority]).observe(time.monotonic() - waiter.enqueued)
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self._dispatch()
+                self._idle.notify_all()
+
+    def wait_idle(self, timeout: float) -> bool:
+        """Wait until no call is in flight; False if some still are after timeout seconds"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self.in_flight == 0, timeout)
+
+# Shared by every AIService of this process
+ai_scheduler = AIScheduler(per_worker(AI_MAX_CONCURRENCY), AI_REQUESTS_PER_MINUTE / WORKERS)
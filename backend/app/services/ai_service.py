@@ -1,14 +1,19 @@
 import json
+import logging
 import os
-import google.generativeai as genai
+import time
 from typing import Dict, Optional
 from pydantic import BaseModel
+from app.deadlines import DeadlineExceeded, current_deadline
+from app.metrics import AI_CALL_SECONDS, AI_RETRIES, AI_TOKENS
+from app.services.ai_scheduler import ai_scheduler
 
-# Configure Gemini API
+logger = logging.getLogger(__name__)
+
+# Gemini API key; the SDK itself is imported by the first AIService (see __init__)
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-print("GEMINI_API_KEY loaded:", GEMINI_API_KEY, flush=True)
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
+# Seconds allowed per Gemini call (less if the request's deadline is sooner)
+AI_CALL_TIMEOUT = float(os.getenv("AI_CALL_TIMEOUT", "60"))
 
 class MatchResult(BaseModel):
     match_percentage: float
@@ -23,8 +28,16 @@ class AIService:
     def __init__(self):
         if not GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY environment variable is not set")
+        # Imported here rather than at module level: the SDK (which pulls in IPython)
+        # takes ~0.7 s to import, and importing MatchResult should not pay for it
+        import google.generativeai as genai
+        from google.generativeai import client
+        from google.generativeai.types import generation_types
+        genai.configure(api_key=GEMINI_API_KEY)
         # Use gemini-pro model (stable and widely available)
         self.model = genai.GenerativeModel('gemini-2.5-flash')
+        self._client = client.get_default_generative_client()
+        self._response_type = generation_types.GenerateContentResponse
     
     def analyze_resume_match(
         self, 
@@ -40,15 +53,27 @@ class AIService:
             
         Returns:
             MatchResult with match percentage and explainable details
+
+        Raises:
+            DeadlineExceeded: the request's deadline passed or its client disconnected
         """
         prompt = self._build_prompt(resume_text, job_description)
+        deadline = current_deadline()
         
         # Retry logic for malformed JSON
         max_retries = 2
         for attempt in range(max_retries):
+            started = time.perf_counter()
+            outcome = "error"
             try:
-                response = self.model.generate_content(prompt)
+                deadline.check()
+                with ai_scheduler.slot():
+                    deadline.check()
+                    started = time.perf_counter()  # time waiting for the slot is AI_QUEUE_SECONDS
+                    response = self._generate(prompt, deadline.timeout(AI_CALL_TIMEOUT))
                 response_text = response.text.strip()
+                outcome = "invalid"
+                self._record_tokens(response, prompt, response_text)
                 
                 # Try to extract JSON from response
                 json_text = self._extract_json(response_text)
@@ -60,16 +85,48 @@ class AIService:
                         continue
                     raise ValueError("Invalid result structure")
                 
+                outcome = "ok"
+                AI_RETRIES.observe(attempt)
                 return MatchResult(**result_dict)
                 
+            except DeadlineExceeded:
+                outcome = "abandoned"
+                raise
             except Exception as e:
                 if attempt < max_retries - 1:
                     continue
-                print(f"Error in AI analysis (attempt {attempt + 1}): {e}")
+                logger.error("AI analysis failed (attempt %d): %s", attempt + 1, e)
+                AI_RETRIES.observe(attempt)
                 return None
+            finally:
+                AI_CALL_SECONDS.labels(outcome).observe(time.perf_counter() - started)
         
         return None
     
+    def _generate(self, prompt: str, timeout: float):
+        """
+        One generate_content call that gives up after `timeout` seconds
+
+        The pinned SDK's GenerativeModel.generate_content takes no timeout (its
+        transport defaults to 60 s, retried for another 60 s), so the request is
+        sent with the underlying client; retries are left to analyze_resume_match.
+        """
+        request = self.model._prepare_request(contents=prompt)
+        response = self._client.generate_content(request, timeout=timeout, retry=None)
+        return self._response_type.from_response(response)
+    
+    @staticmethod
+    def _record_tokens(response, prompt: str, response_text: str):
+        """Token counts of one call; estimated at ~4 characters per token when the SDK does not report usage"""
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            AI_TOKENS.labels("in").observe(usage.prompt_token_count)
+            AI_TOKENS.labels("out").observe(usage.candidates_token_count)
+            return
+        AI_TOKENS.labels("in").observe(len(prompt) / 4)
+        output_tokens = sum(getattr(candidate, "token_count", 0) for candidate in response.candidates)
+        AI_TOKENS.labels("out").observe(output_tokens or len(response_text) / 4)
+    
     def _build_prompt(self, resume_text: str, job_description: str) -> str:
         """Build the prompt for Gemini with explicit JSON format requirement"""
         prompt = f"""You are an expert hiring assistant. Analyze the resume against the job description and provide a detailed match analysis.
@@ -0,0 +1,333 @@
+import asyncio
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Set, TextIO, Tuple
+from starlette.concurrency import run_in_threadpool
+from app.database import AsyncSessionLocal
+from app.models.job import Job
+from app.models.resume import Resume, ResumeAnalysis, EmailStatus, BucketType
+from app.services.ai_scheduler import BACKGROUND, ai_work
+from app.services.ai_service import AIService, MatchResult
+from app.services.blob_store import BLOB_STORE_DIR, BlobStore
+from app.services.bucketing import assign_bucket_for_job
+from app.services.dedup import (
+    DuplicateMatch, find_duplicate, fingerprint_rows, minhash_signature, resume_fingerprints, reusable_analysis
+)
+from app.services.pdf_service import PDFService
+from app.services.skill_stats import SkillDelta, apply_skill_delta
+from app.services.versioning import bump_job_version
+
+logger = logging.getLogger(__name__)
+
+# Scored resumes written per transaction (and per checkpoint update)
+BATCH_SCORE_BATCH_SIZE = int(os.getenv("BATCH_SCORE_BATCH_SIZE", "50"))
+# Concurrent AI analyses
+BATCH_SCORE_AI_CONCURRENCY = int(os.getenv("BATCH_SCORE_AI_CONCURRENCY", "4"))
+
+ExtractedFile = Tuple[Optional[str], str, Tuple[Optional[str], Optional[str], Optional[str]], bytes]
+
+_worker_pdf_service: Optional[PDFService] = None
+_worker_blob_store: Optional[BlobStore] = None
+
+def _init_worker(blob_root: str):
+    global _worker_pdf_service, _worker_blob_store
+    _worker_pdf_service = PDFService()
+    _worker_blob_store = BlobStore(blob_root)
+
+def _extract_file(path: str) -> Optional[ExtractedFile]:
+    """Process-pool task: store the original, extract text, contact info and MinHash signature"""
+    with open(path, "rb") as pdf:
+        content = pdf.read()
+    pdf_sha256 = None
+    try:
+        pdf_sha256 = _worker_blob_store.put(content)
+    except OSError as e:
+        logger.error("Error storing original PDF %s: %s", path, e)
+    extracted = _worker_pdf_service.extract(content)
+    if not extracted or not extracted.text:
+        return None
+    contact = PDFService.extract_contact_info(extracted.first_page or extracted.text)
+    return pdf_sha256, extracted.text, contact, minhash_signature(extracted.text)
+
+def expand_inputs(inputs: Iterable[str]) -> List[str]:
+    """Absolute paths of the PDFs named by directories (searched recursively) and glob patterns"""
+    paths = []
+    seen = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = sorted(glob.glob(os.path.join(item, "**", "*"), recursive=True))
+        else:
+            matches = sorted(glob.glob(item, recursive=True))
+        for match in matches:
+            path = os.path.abspath(match)
+            if path.lower().endswith(".pdf") and os.path.isfile(path) and path not in seen:
+                seen.add(path)
+                paths.append(path)
+    return paths
+
+class Checkpoint:
+    """
+    JSONL record of a scoring run: the job on the first line, then one line per stored file
+
+    Lines are appended only after the batch holding those files is committed, so
+    an interrupted run re-processes at most the batch that was in flight.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.job_id: Optional[int] = None
+        self.done: Set[str] = set()
+        if os.path.exists(path):
+            with open(path) as checkpoint:
+                for line in checkpoint:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if "job_id" in entry:
+                        self.job_id = entry["job_id"]
+                    else:
+                        self.done.add(entry["file"])
+
+    def start(self, job_id: int):
+        if self.job_id is None:
+            self._append([{"job_id": job_id}])
+            self.job_id = job_id
+
+    def mark_done(self, paths: List[str]):
+        self._append([{"file": path} for path in paths])
+        self.done.update(paths)
+
+    def _append(self, entries: List[dict]):
+        with open(self.path, "a") as checkpoint:
+            for entry in entries:
+                checkpoint.write(json.dumps(entry) + "\n")
+            checkpoint.flush()
+            os.fsync(checkpoint.fileno())
+
+@dataclass
+class ScoredFile:
+    path: str
+    resume: Optional[Resume] = None
+    match_result: Optional[MatchResult] = None
+    duplicate: Optional[DuplicateMatch] = None
+    analysis_reused: bool = False
+    error: Optional[str] = None
+
+    def record(self) -> dict:
+        """JSONL output line"""
+        if self.resume is None:
+            return {"file": self.path, "error": self.error}
+        return {
+            "file": self.path,
+            "resume_id": self.resume.id,
+            "pdf_sha256": self.resume.pdf_sha256,
+            "name": self.resume.name,
+            "email": self.resume.email,
+            "mobile": self.resume.mobile,
+            "match_percentage": self.match_result.match_percentage if self.match_result else None,
+            "bucket": self.resume.bucket.value,
+            "duplicate_of_id": self.resume.duplicate_of_id,
+            "analysis_reused": self.analysis_reused,
+            "error": self.error,
+        }
+
+@dataclass
+class BatchScoreSummary:
+    total: int = 0
+    skipped: int = 0
+    stored: int = 0
+    analyzed: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    failures: List[Tuple[str, str]] = field(default_factory=list)
+
+async def _write_batch(session_factory, job_id: int, scored: List[ScoredFile]):
+    """Insert resumes, analyses, email statuses and fingerprints of one batch in a single transaction"""
+    async with session_factory() as db:
+        db.add_all([item.resume for item in scored])
+        await db.flush()
+        skill_delta = SkillDelta()
+        for item in scored:
+            resume = item.resume
+            db.add_all(fingerprint_rows(
+                resume.id, job_id, resume_fingerprints(resume.minhash, resume.email, resume.mobile)
+            ))
+            if item.match_result:
+                db.add(ResumeAnalysis(
+                    resume_id=resume.id,
+                    match_percentage=item.match_result.match_percentage,
+                    matched_skills=json.dumps(item.match_result.matched_skills),
+                    missing_skills=json.dumps(item.match_result.missing_skills),
+                    bonus_skills=json.dumps(item.match_result.bonus_skills),
+                    reasoning=item.match_result.reasoning
+                ))
+                skill_delta.add(resume.bucket, item.match_result)
+            db.add(EmailStatus(resume_id=resume.id))
+        await bump_job_version(db, job_id=job_id)
+        await db.flush()
+        await apply_skill_delta(db, job_id, skill_delta)
+        await db.commit()
+
+async def score_files(
+    job: Job,
+    paths: List[str],
+    output: TextIO,
+    checkpoint: Checkpoint,
+    ai_service: Optional[AIService] = None,
+    workers: Optional[int] = None,
+    ai_concurrency: int = BATCH_SCORE_AI_CONCURRENCY,
+    batch_size: int = BATCH_SCORE_BATCH_SIZE,
+    blob_root: str = BLOB_STORE_DIR,
+    session_factory=AsyncSessionLocal,
+    progress: Optional[TextIO] = sys.stderr
+) -> BatchScoreSummary:
+    """
+    Extract, analyze and store a set of PDFs for one job, without the HTTP upload
+
+    Each file goes through the same steps as an upload: the original is kept in the
+    blob store, text and contact details are extracted (in a process pool), a
+    near-duplicate of an already stored resume reuses its analysis, and otherwise
+    the AI service analyzes it (at most `ai_concurrency` calls at a time). Results
+    are written in batches of `batch_size` resumes per transaction, and each file
+    gets one JSONL line in `output`. Files whose extraction or analysis fails are
+    neither stored nor checkpointed, so a rerun retries them. Duplicates are only
+    detected against committed batches.
+
+    Args:
+        job: Job the resumes are scored against
+        paths: PDF files to score
+        output: Stream receiving one JSON line per file
+        checkpoint: Files recorded here are skipped; stored files are added to it
+        ai_service: AI service, or None to store resumes without an analysis
+        workers: Extraction processes (default: one per CPU)
+        ai_concurrency: Concurrent AI analyses
+        batch_size: Resumes per database transaction
+        blob_root: Blob store directory for the original PDFs
+        session_factory: Async session factory for the database
+        progress: Stream for throughput lines, or None for silence
+
+    Returns:
+        Counts of stored, analyzed, skipped and failed files
+    """
+    summary = BatchScoreSummary(total=len(paths))
+    pending = [path for path in paths if path not in checkpoint.done]
+    summary.skipped = len(paths) - len(pending)
+    checkpoint.start(job.id)
+
+    loop = asyncio.get_running_loop()
+    ai_slots = asyncio.Semaphore(ai_concurrency)
+    # Bounds extracted texts held in memory while waiting for analysis or a write
+    in_flight = asyncio.Semaphore(max(batch_size, ai_concurrency) * 2)
+    results: asyncio.Queue = asyncio.Queue()
+    started = time.perf_counter()
+
+    async def process(path: str, pool: ProcessPoolExecutor) -> ScoredFile:
+        extracted = await loop.run_in_executor(pool, _extract_file, path)
+        if extracted is None:
+            return ScoredFile(path, error="Failed to extract text from PDF")
+        pdf_sha256, text, (name, email, phone), signature = extracted
+
+        item = ScoredFile(path)
+        async with session_factory() as db:
+            item.duplicate = await find_duplicate(db, job.id, signature, email, phone)
+            if item.duplicate and item.duplicate.near_duplicate:
+                item.match_result = await reusable_analysis(db, item.duplicate.resume_id)
+                item.analysis_reused = item.match_result is not None
+
+        if not item.analysis_reused and ai_service is not None:
+            async with ai_slots:
+                try:
+                    with ai_work(BACKGROUND, job.id):
+                        item.match_result = await run_in_threadpool(
+                            ai_service.analyze_resume_match, text, job.description
+                        )
+                except Exception as e:
+                    item.error = f"AI analysis failed: {e}"
+            if item.match_result is None and item.error is None:
+                item.error = "AI analysis returned no result"
+            if item.error:
+                # Not stored or checkpointed, so a rerun analyzes it again
+                return item
+
+        item.resume = Resume(
+            job_id=job.id,
+            filename=os.path.basename(path),
+            extracted_text=text,
+            pdf_sha256=pdf_sha256,
+            minhash=signature,
+            duplicate_of_id=item.duplicate.resume_id if item.duplicate else None,
+            name=name,
+            email=email,
+            mobile=phone,
+            bucket=assign_bucket_for_job(item.match_result.match_percentage, job)
+            if item.match_result else BucketType.REJECT
+        )
+        return item
+
+    async def run(path: str, pool: ProcessPoolExecutor):
+        try:
+            item = await process(path, pool)
+        except Exception as e:
+            item = ScoredFile(path, error=str(e))
+        await results.put(item)
+
+    async def produce(pool: ProcessPoolExecutor):
+        for path in pending:
+            await in_flight.acquire()
+            tasks.add(asyncio.create_task(run(path, pool)))
+
+    def report():
+        if progress is None:
+            return
+        done = summary.stored + summary.failed
+        elapsed = time.perf_counter() - started
+        rate = done / elapsed if elapsed else 0.0
+        eta = (len(pending) - done) / rate if rate else 0.0
+        print(
+            f"{done}/{len(pending)} files, {rate:.1f} files/s, {summary.failed} failed, ETA {eta:.0f}s",
+            file=progress, flush=True
+        )
+
+    async def flush(batch: List[ScoredFile]):
+        await _write_batch(session_factory, job.id, batch)
+        for item in batch:
+            output.write(json.dumps(item.record()) + "\n")
+        output.flush()
+        checkpoint.mark_done([item.path for item in batch])
+        summary.stored += len(batch)
+        summary.analyzed += sum(1 for item in batch if item.match_result and not item.analysis_reused)
+        report()
+
+    tasks: Set[asyncio.Task] = set()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(blob_root,)) as pool:
+        producer = asyncio.create_task(produce(pool))
+        batch: List[ScoredFile] = []
+        try:
+            for _ in range(len(pending)):
+                item = await results.get()
+                in_flight.release()
+                if item.resume is None:
+                    summary.failed += 1
+                    summary.failures.append((item.path, item.error))
+                    output.write(json.dumps(item.record()) + "\n")
+                    continue
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    await flush(batch)
+                    batch = []
+            if batch:
+                await flush(batch)
+        finally:
+            producer.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(producer, *tasks, return_exceptions=True)
+
+    summary.elapsed = time.perf_counter() - started
+    return summary
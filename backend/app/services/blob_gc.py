@@ -0,0 +1,112 @@
+"""
+Removal of original PDFs that no resume references any more
+
+Identical uploads share one blob, so a blob can only go once no row of
+resumes.pdf_sha256 names it. The delete endpoints collect the blobs of the
+resumes they removed right after committing; `python collect_blobs.py` sweeps
+the whole store for anything left behind (blobs kept by the grace period, or
+orphaned by a crash between the delete and the collection).
+
+A blob is stored before the resume that references it is committed (after its
+AI analysis), so a blob stored or re-stored within BLOB_GC_GRACE_SECONDS is
+kept even when no committed row references it yet.
+"""
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Set
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.models.resume import Resume
+from app.services.blob_store import BlobStore, blob_store
+
+logger = logging.getLogger(__name__)
+
+# Blobs stored more recently than this are never collected (longer than any upload or batch write)
+BLOB_GC_GRACE_SECONDS = int(os.getenv("BLOB_GC_GRACE_SECONDS", "3600"))
+# Digests checked against the resumes table per query
+BLOB_GC_CHUNK = 500
+
+@dataclass
+class BlobCollectionSummary:
+    examined: int = 0
+    removed: int = 0
+    referenced: int = 0
+    recent: int = 0
+
+async def referenced_digests(db: AsyncSession, digests: List[str]) -> Set[str]:
+    """The digests among `digests` that some resume still references"""
+    referenced = set()
+    for start in range(0, len(digests), BLOB_GC_CHUNK):
+        chunk = digests[start:start + BLOB_GC_CHUNK]
+        referenced.update(await db.scalars(
+            select(Resume.pdf_sha256).where(Resume.pdf_sha256.in_(chunk)).distinct()
+        ))
+    return referenced
+
+async def collect_blobs(
+    db: AsyncSession,
+    digests: Iterable[Optional[str]],
+    store: BlobStore = blob_store,
+    grace_seconds: float = BLOB_GC_GRACE_SECONDS,
+    dry_run: bool = False
+) -> BlobCollectionSummary:
+    """
+    Delete the given blobs that no resume references and that were not stored recently
+
+    Call after the deleting transaction has been committed.
+
+    Args:
+        db: Database session
+        digests: Candidate blobs, e.g. those of the resumes just deleted (None entries are ignored)
+        store: Blob store holding them
+        grace_seconds: Blobs stored within this many seconds are kept
+        dry_run: Count what would be removed without deleting anything
+
+    Returns:
+        Counts of examined, removed, still referenced and recently stored blobs
+    """
+    candidates = sorted({digest for digest in digests if digest})
+    summary = BlobCollectionSummary(examined=len(candidates))
+    if not candidates:
+        return summary
+    # Cutoff taken before the reference check, so a blob stored again while checking counts as recent
+    stored_before = time.time() - grace_seconds
+    referenced = await referenced_digests(db, candidates)
+    summary.referenced = len(referenced)
+    unreferenced = [digest for digest in candidates if digest not in referenced]
+
+    def remove_all():
+        for digest in unreferenced:
+            try:
+                stored = os.stat(store.path(digest)).st_mtime
+            except FileNotFoundError:
+                continue
+            if stored >= stored_before:
+                summary.recent += 1
+            elif dry_run or store.remove(digest, stored_before):
+                summary.removed += 1
+
+    await run_in_threadpool(remove_all)
+    if summary.removed:
+        logger.info("Removed %d unreferenced PDF blobs", summary.removed)
+    return summary
+
+async def sweep_blobs(
+    db: AsyncSession,
+    store: BlobStore = blob_store,
+    grace_seconds: float = BLOB_GC_GRACE_SECONDS,
+    dry_run: bool = False
+) -> BlobCollectionSummary:
+    """Collect every blob in the store that no resume references"""
+    digests = await run_in_threadpool(lambda: list(store.iter_digests()))
+    return await collect_blobs(db, digests, store, grace_seconds, dry_run)
+
+async def collect_deleted_blobs(db: AsyncSession, digests: Iterable[Optional[str]]):
+    """Collect the blobs of just-deleted resumes; a failure is logged, the delete stands"""
+    try:
+        await collect_blobs(db, digests)
+    except Exception as e:
+        logger.error("Error collecting PDF blobs of deleted resumes: %s", e)
@@ -0,0 +1,109 @@
+import hashlib
+import os
+import re
+import tempfile
+from typing import Iterator, Optional
+
+# Root directory of the original-PDF store
+BLOB_STORE_DIR = os.getenv("BLOB_STORE_DIR", "./blobs")
+
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+class BlobStore:
+    """
+    Content-addressed, deduplicated file store keyed by SHA-256
+
+    A blob lives at <root>/<d[0:2]>/<d[2:4]>/<digest>, so no directory grows past
+    65,536 entries. Writes go to a temporary file in the same filesystem and are
+    renamed into place, so a blob path either holds the complete file or nothing.
+    Blobs are immutable; storing the same bytes twice keeps a single copy and
+    refreshes its modification time, which blob collection (app.services.blob_gc)
+    reads as "stored recently, its resume may not be committed yet".
+    """
+
+    def __init__(self, root: str = BLOB_STORE_DIR):
+        self.root = root
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def path(self, digest: str) -> str:
+        """Filesystem path of a blob (whether or not it exists)"""
+        if not _DIGEST_RE.match(digest):
+            raise ValueError(f"Invalid blob digest: {digest!r}")
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest: str) -> bool:
+        return os.path.isfile(self.path(digest))
+
+    def put(self, data: bytes) -> str:
+        """
+        Store bytes unless an identical blob already exists
+
+        Args:
+            data: File content
+
+        Returns:
+            SHA-256 hex digest identifying the blob
+        """
+        digest = self.digest(data)
+        path = self.path(digest)
+        if os.path.isfile(path):
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                pass  # Collected meanwhile; written again below
+            else:
+                return digest
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return digest
+
+    def read(self, digest: str) -> Optional[bytes]:
+        """Content of a blob, or None if it is not stored"""
+        try:
+            with open(self.path(digest), "rb") as blob:
+                return blob.read()
+        except FileNotFoundError:
+            return None
+
+    def remove(self, digest: str, stored_before: float) -> bool:
+        """
+        Delete a blob unless it was stored (or stored again) at or after `stored_before`
+
+        Args:
+            digest: Blob to delete
+            stored_before: Epoch seconds; newer blobs are kept
+
+        Returns:
+            Whether the blob was deleted
+        """
+        path = self.path(digest)
+        try:
+            if os.stat(path).st_mtime >= stored_before:
+                return False
+            os.unlink(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def iter_digests(self) -> Iterator[str]:
+        """Digests of all stored blobs"""
+        for directory, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if _DIGEST_RE.match(filename):
+                    yield filename
+
+blob_store = BlobStore()
@@ -0,0 +1,60 @@
+from sqlalchemy import case, exists, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.job import Job, DEFAULT_STRONG_FIT_THRESHOLD, DEFAULT_POTENTIAL_THRESHOLD
+from app.models.resume import Resume, ResumeAnalysis, BucketType
+from app.services.skill_stats import rebuild_job_skills
+
+def assign_bucket(
+    match_percentage: float,
+    strong_fit_threshold: float = DEFAULT_STRONG_FIT_THRESHOLD,
+    potential_threshold: float = DEFAULT_POTENTIAL_THRESHOLD
+) -> BucketType:
+    """Assign resume to bucket based on match percentage"""
+    if match_percentage >= strong_fit_threshold:
+        return BucketType.STRONG_FIT
+    elif match_percentage >= potential_threshold:
+        return BucketType.POTENTIAL
+    else:
+        return BucketType.REJECT
+
+def assign_bucket_for_job(match_percentage: float, job: Job) -> BucketType:
+    """Assign resume to bucket using the job's configured thresholds"""
+    return assign_bucket(match_percentage, job.strong_fit_threshold, job.potential_threshold)
+
+async def rebucket_job(db: AsyncSession, job: Job) -> int:
+    """
+    Recompute buckets for every analyzed resume of a job in a single UPDATE
+
+    Manually overridden resumes and resumes without an analysis are left alone.
+    The job's per-bucket skill counts are rebuilt to match. The caller is
+    responsible for committing.
+
+    Args:
+        db: Database session
+        job: Job whose thresholds should be applied
+
+    Returns:
+        Number of resume rows updated
+    """
+    match_percentage = (
+        select(ResumeAnalysis.match_percentage)
+        .where(ResumeAnalysis.resume_id == Resume.id)
+        .scalar_subquery()
+    )
+    stmt = (
+        update(Resume)
+        .where(
+            Resume.job_id == job.id,
+            Resume.bucket_overridden.is_(False),
+            exists().where(ResumeAnalysis.resume_id == Resume.id)
+        )
+        .values(bucket=case(
+            (match_percentage >= job.strong_fit_threshold, BucketType.STRONG_FIT.name),
+            (match_percentage >= job.potential_threshold, BucketType.POTENTIAL.name),
+            else_=BucketType.REJECT.name
+        ))
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt)
+    await rebuild_job_skills(db, job.id)
+    return result.rowcount
@@ -0,0 +1,183 @@
+"""
+Near-duplicate resume detection
+
+Each resume gets a 64-value MinHash signature of its word 3-gram shingles
+(one-permutation hashing: every shingle is hashed once and lands in one of the
+64 bins). The signature is split into 8 LSH bands of 8 values; together with
+the normalized email and phone they form the resume's fingerprints, stored in
+resume_fingerprints under a (job_id, fingerprint) index. A lookup is one
+indexed IN query, however many resumes are stored.
+
+Two resumes whose shingle sets have Jaccard similarity s share at least one
+band with probability 1 - (1 - s^8)^8: about 0.98 at s=0.9 and 0.03 at s=0.5.
+Candidates are then verified on the full signature.
+"""
+import hashlib
+import json
+import os
+import re
+from array import array
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.resume import Resume, ResumeAnalysis, ResumeFingerprint
+from app.services.ai_service import MatchResult
+
+# Estimated Jaccard similarity at or above which a resume reuses an earlier analysis
+DEDUP_SIMILARITY = float(os.getenv("DEDUP_SIMILARITY", "0.9"))
+
+SIGNATURE_SIZE = 64
+LSH_BANDS = 8
+LSH_ROWS = SIGNATURE_SIZE // LSH_BANDS
+SHINGLE_WORDS = 3
+
+_EMPTY = (1 << 64) - 1
+_MASK_63 = (1 << 63) - 1
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_DIGITS_RE = re.compile(r"\D")
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+def minhash_signature(text: str) -> Optional[bytes]:
+    """
+    MinHash signature of a text's word 3-grams
+
+    Args:
+        text: Extracted resume text
+
+    Returns:
+        SIGNATURE_SIZE 64-bit values packed as bytes, or None if the text has no words
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return None
+    if len(tokens) < SHINGLE_WORDS:
+        shingles = {" ".join(tokens)}
+    else:
+        shingles = {" ".join(tokens[i:i + SHINGLE_WORDS]) for i in range(len(tokens) - SHINGLE_WORDS + 1)}
+
+    bins = [_EMPTY] * SIGNATURE_SIZE
+    for shingle in shingles:
+        value = _hash64(shingle.encode())
+        index = value % SIGNATURE_SIZE
+        if value < bins[index]:
+            bins[index] = value
+
+    # Densify: an empty bin borrows from the next filled one (offset by distance) so
+    # that short texts still give comparable signatures
+    for index in range(SIGNATURE_SIZE):
+        if bins[index] == _EMPTY:
+            for distance in range(1, SIGNATURE_SIZE):
+                donor = bins[(index + distance) % SIGNATURE_SIZE]
+                if donor != _EMPTY:
+                    bins[index] = _hash64(donor.to_bytes(8, "little") + bytes([distance]))
+                    break
+    return array("Q", bins).tobytes()
+
+def signature_similarity(first: bytes, second: bytes) -> float:
+    """Estimated Jaccard similarity: the fraction of equal signature values"""
+    a, b = array("Q", first), array("Q", second)
+    return sum(x == y for x, y in zip(a, b)) / SIGNATURE_SIZE
+
+def _fingerprint(kind: bytes, data: bytes) -> int:
+    # Signed 63-bit so it fits an SQLite INTEGER / PostgreSQL BIGINT
+    return _hash64(kind + b":" + data) & _MASK_63
+
+def band_fingerprints(signature: Optional[bytes]) -> List[int]:
+    if signature is None:
+        return []
+    width = LSH_ROWS * 8
+    return [
+        _fingerprint(b"band%d" % band, signature[band * width:(band + 1) * width])
+        for band in range(LSH_BANDS)
+    ]
+
+def contact_fingerprints(email: Optional[str], phone: Optional[str]) -> List[int]:
+    fingerprints = []
+    if email:
+        fingerprints.append(_fingerprint(b"email", email.strip().lower().encode()))
+    digits = _DIGITS_RE.sub("", phone or "")
+    if len(digits) >= 7:
+        # Compare the subscriber number: "+1 555 123 4567" and "555-123-4567" match
+        fingerprints.append(_fingerprint(b"phone", digits[-10:].encode()))
+    return fingerprints
+
+def resume_fingerprints(signature: Optional[bytes], email: Optional[str], phone: Optional[str]) -> List[int]:
+    """All fingerprints stored for a resume (LSH bands, then email and phone)"""
+    return band_fingerprints(signature) + contact_fingerprints(email, phone)
+
+def fingerprint_rows(resume_id: int, job_id: int, fingerprints: Sequence[int]) -> List[ResumeFingerprint]:
+    return [
+        ResumeFingerprint(resume_id=resume_id, job_id=job_id, fingerprint=fingerprint)
+        for fingerprint in set(fingerprints)
+    ]
+
+@dataclass
+class DuplicateMatch:
+    resume_id: int
+    similarity: float  # Estimated Jaccard similarity of the texts
+    same_contact: bool  # Email or phone matched exactly
+
+    @property
+    def near_duplicate(self) -> bool:
+        return self.similarity >= DEDUP_SIMILARITY
+
+async def find_duplicate(
+    db: AsyncSession,
+    job_id: int,
+    signature: Optional[bytes],
+    email: Optional[str],
+    phone: Optional[str]
+) -> Optional[DuplicateMatch]:
+    """
+    Find the closest earlier resume for the same job
+
+    A candidate qualifies if its text is a near duplicate (estimated similarity
+    of at least DEDUP_SIMILARITY) or its email or phone matches exactly.
+
+    Returns:
+        The most similar qualifying resume (oldest on ties), or None
+    """
+    bands = band_fingerprints(signature)
+    contacts = contact_fingerprints(email, phone)
+    if not bands and not contacts:
+        return None
+
+    # One round trip: the hits come back with the candidate's signature
+    hits = (await db.execute(
+        select(ResumeFingerprint.resume_id, ResumeFingerprint.fingerprint, Resume.minhash)
+        .join(Resume, Resume.id == ResumeFingerprint.resume_id)
+        .where(ResumeFingerprint.job_id == job_id, ResumeFingerprint.fingerprint.in_(bands + contacts))
+    )).all()
+    if not hits:
+        return None
+
+    contact_set = set(contacts)
+    contact_hits = {resume_id for resume_id, fingerprint, _ in hits if fingerprint in contact_set}
+    signatures = {resume_id: stored for resume_id, _, stored in hits}
+
+    best = None
+    for resume_id in sorted(signatures):
+        stored = signatures[resume_id]
+        similarity = signature_similarity(signature, stored) if signature and stored else 0.0
+        match = DuplicateMatch(resume_id, similarity, resume_id in contact_hits)
+        if not (match.near_duplicate or match.same_contact):
+            continue
+        if best is None or match.similarity > best.similarity:
+            best = match
+    return best
+
+async def reusable_analysis(db: AsyncSession, resume_id: int) -> Optional[MatchResult]:
+    """The stored analysis of a resume as a MatchResult, or None if it has none"""
+    analysis = await db.scalar(select(ResumeAnalysis).where(ResumeAnalysis.resume_id == resume_id))
+    if analysis is None:
+        return None
+    return MatchResult(
+        match_percentage=analysis.match_percentage,
+        matched_skills=json.loads(analysis.matched_skills),
+        missing_skills=json.loads(analysis.missing_skills),
+        bonus_skills=json.loads(analysis.bonus_skills),
+        reasoning=analysis.reasoning
+    )
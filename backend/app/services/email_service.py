@@ -1,3 +1,4 @@
+import logging
 import os
 from typing import Optional
 from datetime import datetime
@@ -6,6 +7,8 @@ from email.mime.multipart import MIMEMultipart
 import aiosmtplib
 from app.models.resume import EmailStatusEnum
 
+logger = logging.getLogger(__name__)
+
 # Microsoft Form link - can be configured via environment variable
 DEFAULT_FORM_LINK = os.getenv("MICROSOFT_FORM_LINK", "https://forms.office.com/YourFormLinkHere")
 
@@ -40,8 +43,7 @@ class EmailService:
         try:
             # Check if SMTP credentials are configured
             if not self.smtp_username or not self.smtp_password:
-                print("[EMAIL SERVICE] ERROR: SMTP credentials not configured")
-                print("[EMAIL SERVICE] Please set SMTP_USERNAME and SMTP_PASSWORD environment variables")
+                logger.error("SMTP credentials not configured: set SMTP_USERNAME and SMTP_PASSWORD")
                 return False
 
             link = form_link or self.form_link
@@ -73,10 +75,10 @@ Recruitment Team
             use_tls = self.smtp_port == 587
             connection_type = "SSL" if use_ssl else "TLS" if use_tls else "Unknown"
 
-            print(f"[EMAIL SERVICE] Sending screening form to {candidate_email}")
-            print(f"[EMAIL SERVICE] Job: {job_title}")
-            print(f"[EMAIL SERVICE] Form Link: {link}")
-            print(f"[EMAIL SERVICE] SMTP Server: {self.smtp_server}:{self.smtp_port} ({connection_type})")
+            logger.info(
+                "Sending screening form to %s (job %r, form %s) via %s:%s (%s)",
+                candidate_email, job_title, link, self.smtp_server, self.smtp_port, connection_type
+            )
 
             # Send email
             await aiosmtplib.send(
@@ -89,13 +91,11 @@ Recruitment Team
             )
 
 
-            print("[EMAIL SERVICE] Email sent successfully")
+            logger.info("Screening form sent to %s", candidate_email)
             return True
 
         except Exception as e:
-            print(f"[EMAIL SERVICE] ERROR: Failed to send email: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Failed to send email to %s: %s", candidate_email, e)
             return False
 
     def get_form_link(self) -> str:
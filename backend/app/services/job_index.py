@@ -0,0 +1,186 @@
+"""
+Local reverse matching: rank every job for one resume without AI calls
+
+Each job's description is reduced to weighted terms (unigrams and bigrams,
+stopwords dropped, 1 + log(tf) weights) when the job is created or its
+description changes, and stored on the job as JSON. The in-process index
+combines those with IDF across all jobs into an inverted index
+term -> [(job, weight)], so scoring a resume touches only the postings of the
+terms it contains.
+
+The score of a job is the share of its IDF-weighted terms found in the resume
+(0-100): how much of what the job asks for the resume mentions.
+"""
+import asyncio
+import heapq
+import json
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.models.job import Job
+from app.services.versioning import get_job_list_version
+
+# Terms kept per job, highest weight first
+JOB_TERMS_MAX = 200
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+# Bigrams never span these: line breaks, list punctuation, sentence-ending periods
+_PHRASE_BREAK_RE = re.compile(r"[\n,;:!?()\[\]|\u2022*]|\.(?=\s|$)|\s[-\u2013/]\s")
+_STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does
+doing during each etc for from further had has have having he her here hers him his how i if in into
+is it its itself just may me more most must my no nor not of off on once only or other our ours out
+over own per same shall she should so some such than that the their theirs them then there these
+they this those through to too under until up very was we were what when where which while who whom
+why will with within would you your yours
+ability able across candidate candidates company strong excellent good great highly ideal including
+join looking plus preferred required requirements responsibilities role skills team teams work
+working year years experience experienced knowledge understanding using use new well based
+""".split())
+
+def extract_terms(text: str) -> List[str]:
+    """Unigrams and in-phrase bigrams of a text, stopwords removed"""
+    terms = []
+    for phrase in _PHRASE_BREAK_RE.split(text.lower()):
+        previous = None
+        for token in _TOKEN_RE.findall(phrase):
+            if token in _STOPWORDS or len(token) < 2 and token not in ("c", "r"):
+                previous = None
+                continue
+            terms.append(token)
+            if previous is not None:
+                terms.append(f"{previous} {token}")
+            previous = token
+    return terms
+
+def job_terms(description: str) -> Dict[str, float]:
+    """Weighted terms of a job description (stored as Job.term_index)"""
+    counts = Counter(extract_terms(description))
+    weights = {term: 1.0 + math.log(count) for term, count in counts.items()}
+    return dict(heapq.nlargest(JOB_TERMS_MAX, weights.items(), key=lambda item: item[1]))
+
+def serialize_terms(terms: Dict[str, float]) -> str:
+    return json.dumps(terms, separators=(",", ":"))
+
+@dataclass
+class JobScore:
+    job_id: int
+    title: str
+    score: float
+    matched_terms: List[str] = field(default_factory=list)
+    missing_terms: List[str] = field(default_factory=list)
+
+@dataclass(frozen=True)
+class _Snapshot:
+    """One build of the index; never modified after it is published"""
+    jobs: List[Tuple[int, str]] = field(default_factory=list)  # (job_id, title) by position
+    postings: Dict[str, List[Tuple[int, float]]] = field(default_factory=dict)  # term -> [(position, weight * idf)]
+    job_weights: List[Dict[str, float]] = field(default_factory=list)
+    totals: List[float] = field(default_factory=list)
+
+class JobIndex:
+    """
+    Inverted index over the term vectors of all jobs
+
+    The index remembers the job-list version it was built from (bumped by every
+    job create/update/delete in any worker) and rebuilds when it changes. A
+    rebuild runs in the threadpool and is published as one snapshot reference,
+    so a rank() running in another thread sees either the old or the new index.
+    """
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        self._snapshot = _Snapshot()
+        self._lock = asyncio.Lock()
+
+    @property
+    def size(self) -> int:
+        return len(self._snapshot.jobs)
+
+    async def ensure_current(self, db: AsyncSession):
+        """Rebuild the index if any job changed since it was built"""
+        version = await get_job_list_version(db)
+        if version == self.version:
+            return
+        async with self._lock:
+            if version == self.version:
+                return
+            rows = (await db.execute(select(Job.id, Job.title, Job.description, Job.term_index))).all()
+            await run_in_threadpool(self._build_rows, rows)
+            self.version = version
+
+    def _build_rows(self, rows):
+        """Build from (id, title, description, term_index) rows of the jobs table"""
+        self.build([
+            (job_id, title, json.loads(term_index) if term_index else job_terms(description))
+            for job_id, title, description, term_index in rows
+        ])
+
+    def build(self, jobs: List[Tuple[int, str, Dict[str, float]]]):
+        """Build from (job_id, title, weighted terms) triples"""
+        document_frequency = Counter(term for _, _, terms in jobs for term in terms)
+        count = len(jobs)
+        idf = {term: math.log((count + 1) / (df + 1)) + 1.0 for term, df in document_frequency.items()}
+
+        postings: Dict[str, List[Tuple[int, float]]] = {}
+        job_weights = []
+        totals = []
+        for position, (_, _, terms) in enumerate(jobs):
+            weights = {term: weight * idf[term] for term, weight in terms.items()}
+            for term, weight in weights.items():
+                postings.setdefault(term, []).append((position, weight))
+            job_weights.append(weights)
+            totals.append(sum(weights.values()))
+
+        self._snapshot = _Snapshot(
+            jobs=[(job_id, title) for job_id, title, _ in jobs],
+            postings=postings,
+            job_weights=job_weights,
+            totals=totals
+        )
+
+    def rank(self, resume_text: str, limit: int = 10, terms_shown: int = 8) -> List[JobScore]:
+        """
+        Score every indexed job against a resume
+
+        Args:
+            resume_text: Extracted resume text
+            limit: Number of best jobs returned
+            terms_shown: Matched/missing terms reported per job
+
+        Returns:
+            Best jobs first, with their highest-weighted matched and missing terms
+        """
+        snapshot = self._snapshot
+        totals = snapshot.totals
+        resume_terms = set(extract_terms(resume_text))
+        scores = [0.0] * len(snapshot.jobs)
+        for term in resume_terms:
+            for position, weight in snapshot.postings.get(term, ()):
+                scores[position] += weight
+
+        best = heapq.nlargest(
+            limit,
+            (position for position in range(len(snapshot.jobs)) if totals[position] > 0),
+            key=lambda position: scores[position] / totals[position]
+        )
+        results = []
+        for position in best:
+            weights = snapshot.job_weights[position]
+            by_weight = sorted(weights, key=weights.get, reverse=True)
+            job_id, title = snapshot.jobs[position]
+            results.append(JobScore(
+                job_id=job_id,
+                title=title,
+                score=round(100.0 * scores[position] / totals[position], 1),
+                matched_terms=[term for term in by_weight if term in resume_terms][:terms_shown],
+                missing_terms=[term for term in by_weight if term not in resume_terms][:terms_shown],
+            ))
+        return results
+
+job_index = JobIndex()
@@ -0,0 +1,162 @@
+"""
+Text extraction backends for PDFService
+
+Every backend returns one string per page, stops after max_pages and checks
+the document deadline between pages. pypdfium2 and pdfminer.six are optional
+dependencies; a backend whose package is missing reports available() False.
+
+Backend packages are imported on first use (or by load() during the startup
+warm-up), not when this module is imported: PyPDF2 alone adds ~150 ms to startup.
+"""
+import importlib
+import importlib.util
+import logging
+import threading
+import time
+from io import BytesIO, StringIO
+from typing import Dict, List, Optional, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+class PDFExtractionTimeout(Exception):
+    """Raised when a document is not extracted before its deadline"""
+
+def _check_deadline(deadline: Optional[float]):
+    if deadline is not None and time.monotonic() > deadline:
+        raise PDFExtractionTimeout("PDF extraction exceeded its time limit")
+
+class PDFExtractor:
+    """Base class for a text extraction backend"""
+
+    name = ""
+    # Modules the backend needs, imported by load()
+    modules: Tuple[str, ...] = ()
+
+    @classmethod
+    def available(cls) -> bool:
+        """Whether the backend's package is installed (checked without importing it)"""
+        return all(importlib.util.find_spec(module.partition(".")[0]) is not None for module in cls.modules)
+
+    def load(self):
+        """Import the backend's modules now instead of during the first extraction"""
+        for module in self.modules:
+            importlib.import_module(module)
+
+    def extract_pages(self, file_content: bytes, max_pages: int, deadline: Optional[float] = None) -> List[str]:
+        """
+        Extract the text of the first max_pages pages
+
+        Args:
+            file_content: PDF file bytes
+            max_pages: Maximum number of pages to read
+            deadline: time.monotonic() value after which extraction is abandoned
+
+        Returns:
+            Text of each page read, in page order
+        """
+        raise NotImplementedError
+
+class PyPDF2Extractor(PDFExtractor):
+    """Pure-Python extraction with PyPDF2 (always available, slowest)"""
+
+    name = "pypdf2"
+    modules = ("PyPDF2",)
+
+    def extract_pages(self, file_content, max_pages, deadline=None):
+        import PyPDF2
+        reader = PyPDF2.PdfReader(BytesIO(file_content))
+        pages = []
+        for page in reader.pages[:max_pages]:
+            _check_deadline(deadline)
+            pages.append(page.extract_text() or "")
+        return pages
+
+# pdfium is not thread-safe; extraction runs in the threadpool, so calls are serialized
+_PDFIUM_LOCK = threading.Lock()
+
+class PdfiumExtractor(PDFExtractor):
+    """Native extraction with pypdfium2 (PDFium, the Chrome PDF engine)"""
+
+    name = "pypdfium2"
+    modules = ("pypdfium2",)
+
+    def extract_pages(self, file_content, max_pages, deadline=None):
+        import pypdfium2
+        pages = []
+        with _PDFIUM_LOCK:
+            document = pypdfium2.PdfDocument(file_content)
+            try:
+                for index in range(min(len(document), max_pages)):
+                    _check_deadline(deadline)
+                    page = document[index]
+                    textpage = page.get_textpage()
+                    try:
+                        pages.append(textpage.get_text_bounded().replace("\r\n", "\n"))
+                    finally:
+                        textpage.close()
+                        page.close()
+            finally:
+                document.close()
+        return pages
+
+class PdfMinerExtractor(PDFExtractor):
+    """
+    Extraction with pdfminer.six
+
+    Line grouping is kept (the contact parser relies on line breaks), but
+    boxes_flow=None skips the costly reading-order analysis between text boxes.
+    """
+
+    name = "pdfminer"
+    modules = ("pdfminer.converter", "pdfminer.layout", "pdfminer.pdfinterp", "pdfminer.pdfpage")
+
+    def extract_pages(self, file_content, max_pages, deadline=None):
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+
+        resource_manager = PDFResourceManager(caching=True)
+        laparams = LAParams(boxes_flow=None)
+        pages = []
+        for page in PDFPage.get_pages(BytesIO(file_content), maxpages=max_pages):
+            _check_deadline(deadline)
+            output = StringIO()
+            device = TextConverter(resource_manager, output, laparams=laparams)
+            try:
+                PDFPageInterpreter(resource_manager, device).process_page(page)
+            finally:
+                device.close()
+            pages.append(output.getvalue().rstrip("\x0c"))
+        return pages
+
+# Registered backends, fastest first ("auto" picks the first available one).
+# pdfminer is far slower than both others (see benchmarks/README.md), so it is opt-in only
+PDF_EXTRACTORS: Dict[str, Type[PDFExtractor]] = {
+    PdfiumExtractor.name: PdfiumExtractor,
+    PyPDF2Extractor.name: PyPDF2Extractor,
+    PdfMinerExtractor.name: PdfMinerExtractor,
+}
+
+def get_extractor(name: str = "auto") -> PDFExtractor:
+    """
+    Instantiate a backend by name
+
+    Args:
+        name: A key of PDF_EXTRACTORS, or "auto" for the fastest installed one
+
+    Returns:
+        The extractor instance (PyPDF2 if the requested backend is not installed)
+    """
+    name = name.lower()
+    if name == "auto":
+        for extractor_class in PDF_EXTRACTORS.values():
+            if extractor_class.available():
+                return extractor_class()
+    extractor_class = PDF_EXTRACTORS.get(name)
+    if extractor_class is None:
+        raise ValueError(f"Unknown PDF extractor '{name}', expected one of: auto, {', '.join(PDF_EXTRACTORS)}")
+    if not extractor_class.available():
+        logger.warning("PDF extractor '%s' is not installed, falling back to PyPDF2", name)
+        return PyPDF2Extractor()
+    return extractor_class()
@@ -1,117 +1,197 @@
-import PyPDF2
-from io import BytesIO
-from typing import Optional, Tuple
+import logging
+import os
 import re
+import time
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+from app.deadlines import current_deadline
+from app.metrics import CONTACT_PARSE_SECONDS, PDF_EXTRACTION_SECONDS
+from app.services.pdf_extractors import (
+    PDFExtractor, PDFExtractionTimeout, PyPDF2Extractor, get_extractor
+)
+
+logger = logging.getLogger(__name__)
+
+# Extraction backend: "auto" (fastest installed), "pypdfium2", "pdfminer" or "pypdf2"
+PDF_EXTRACTOR = os.getenv("PDF_EXTRACTOR", "auto")
+# Only the first pages of a resume are read; the rest rarely change the analysis
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "10"))
+# Seconds allowed per document, fallback included
+PDF_EXTRACT_TIMEOUT = float(os.getenv("PDF_EXTRACT_TIMEOUT", "15"))
+
+# Contact details are looked for in this many leading characters of the text
+CONTACT_SCAN_CHARS = int(os.getenv("CONTACT_SCAN_CHARS", "2000"))
+# The name must be on one of the first non-empty lines
+NAME_SCAN_LINES = 10
+# Longest local part allowed before the "@" of an email address
+EMAIL_LOCAL_MAX = 64
+
+_EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+# Every phone format starts with "+", "(" or a digit; leading with that character class
+# lets the regex engine skip ahead instead of trying each alternative at every position
+_PHONE_RE = re.compile(
+    r"[+(0-9](?:"
+    r"(?<=\+)\d{1,3}[-.\s]?\d{3}[-.\s]?\d{3}[-.\s]?\d{4}"  # +1-123-456-7890
+    r"|(?<=\()(?<!\w\()\d{3}\)\s*\d{3}[-.\s]?\d{4}"  # (123) 456-7890
+    r"|(?<=\d)(?<!\w\d)\d{2}[-.\s]?\d{3}[-.\s]?\d{4}"  # 123-456-7890, 123.456.7890, 123 456 7890, 1234567890
+    r")\b"
+)
+# Lines that are never a name: URLs, numbers, symbols, contact labels and section headers
+_SKIP_LINE_RE = re.compile(
+    r"(?:https?://|www\.|\d+$|[^\w\s]*$"
+    r"|(?:email|phone|mobile|tel|cell|contact|address|linkedin|github|portfolio)\s*:?\s*$"
+    r"|(?:objective|summary|experience|education|skills|projects|certifications)\s*:?\s*$)",
+    re.IGNORECASE
+)
+
+@dataclass
+class ExtractedPDF:
+    """Text of the pages read from a PDF"""
+    pages: List[str]
+
+    @property
+    def text(self) -> str:
+        return "\n\n".join(page for page in self.pages if page).strip()
+
+    @property
+    def first_page(self) -> str:
+        return self.pages[0] if self.pages else ""
 
 class PDFService:
     """Service for extracting text from PDF files"""
-    
-    @staticmethod
-    def extract_text_from_pdf(file_content: bytes) -> Optional[str]:
+
+    def __init__(
+        self,
+        extractor: Optional[PDFExtractor] = None,
+        max_pages: int = PDF_MAX_PAGES,
+        timeout: float = PDF_EXTRACT_TIMEOUT
+    ):
+        self.extractor = extractor or get_extractor(PDF_EXTRACTOR)
+        self.fallback = PyPDF2Extractor()
+        self.max_pages = max_pages
+        self.timeout = timeout
+
+    def warm_up(self):
+        """Import the extraction backends ahead of the first upload (blocking; run in a thread)"""
+        self.extractor.load()
+        self.fallback.load()
+
+    def extract(self, file_content: bytes) -> Optional[ExtractedPDF]:
+        """
+        Extract page texts, falling back to PyPDF2 if the configured backend fails
+
+        Args:
+            file_content: PDF file bytes
+
+        Returns:
+            Extracted pages or None if no text could be extracted in time
+            (within the timeout, or before the request's deadline if sooner)
+        """
+        started = time.perf_counter()
+        deadline = time.monotonic() + current_deadline().timeout(self.timeout)
+        extractors = [self.extractor]
+        if not isinstance(self.extractor, PyPDF2Extractor):
+            extractors.append(self.fallback)
+
+        for extractor in extractors:
+            try:
+                extracted = ExtractedPDF(pages=extractor.extract_pages(file_content, self.max_pages, deadline))
+            except PDFExtractionTimeout as e:
+                logger.warning("Error extracting text from PDF with %s: %s", extractor.name, e)
+                PDF_EXTRACTION_SECONDS.labels(extractor.name, "timeout").observe(time.perf_counter() - started)
+                return None
+            except Exception as e:
+                logger.warning("Error extracting text from PDF with %s: %s", extractor.name, e)
+                continue
+            if extracted.text:
+                PDF_EXTRACTION_SECONDS.labels(extractor.name, "ok").observe(time.perf_counter() - started)
+                return extracted
+        PDF_EXTRACTION_SECONDS.labels(extractors[-1].name, "failed").observe(time.perf_counter() - started)
+        return None
+
+    def extract_text_from_pdf(self, file_content: bytes) -> Optional[str]:
         """
         Extract text from PDF file content
-        
+
         Args:
             file_content: PDF file bytes
-            
+
         Returns:
             Extracted text or None if extraction fails
         """
-        try:
-            pdf_file = BytesIO(file_content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            
-            text_parts = []
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                text = page.extract_text()
-                if text:
-                    text_parts.append(text)
-            
-            extracted_text = "\n\n".join(text_parts)
-            return extracted_text.strip() if extracted_text.strip() else None
-            
-        except Exception as e:
-            print(f"Error extracting text from PDF: {e}")
-            return None
+        extracted = self.extract(file_content)
+        return extracted.text if extracted else None
 
     @staticmethod
     def extract_contact_info(text: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
         """
         Extract name, email, and phone number from text
 
+        Only the first CONTACT_SCAN_CHARS characters are examined, with precompiled
+        patterns: the email is searched from just before the first "@", the phone is the first
+        number in a known format and the name is the first leading line that looks
+        like one.
+
         Args:
-            text: Extracted text from PDF
+            text: Extracted text from PDF (the first page is enough)
 
         Returns:
             Tuple of (name, email, phone)
         """
-        name = None
-        email = None
-        phone = None
-
-        # Clean and normalize text
-        text = text.replace('\r', '\n').replace('\t', ' ')
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-
-        # Extract email first (more reliable)
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        email_match = re.search(email_pattern, text, re.IGNORECASE)
-        if email_match:
-            email = email_match.group().lower()
-
-        # Extract phone number
-        # More comprehensive phone patterns
-        phone_patterns = [
-            r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b',  # 123-456-7890, 123.456.7890, 123 456 7890
-            r'\b\(\d{3}\)\s*\d{3}[-.\s]?\d{4}\b',  # (123) 456-7890
-            r'\b\d{10}\b',  # 1234567890
-            r'\+\d{1,3}[-.\s]?\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b'  # +1-123-456-7890
-        ]
-
-        for pattern in phone_patterns:
-            phone_match = re.search(pattern, text)
-            if phone_match:
-                phone = phone_match.group()
-                # Clean up the phone number
-                phone = re.sub(r'[^\d+\-\(\)\.\s]', '', phone)
-                break
-
-        # Extract name - look for patterns that are likely to be names
-        # Skip lines that are clearly not names
-        skip_patterns = [
-            r'^https?://',  # URLs
-            r'^www\.',  # Websites
-            r'^\d+$',  # Just numbers
-            r'^[^\w\s]*$',  # Just symbols
-            r'^\s*(email|phone|mobile|tel|cell|contact|address|linkedin|github|portfolio)\s*:?\s*$',  # Labels
-            r'^\s*(objective|summary|experience|education|skills|projects|certifications)\s*:?\s*$',  # Section headers
-        ]
-
-        for line in lines[:10]:  # Check first 10 lines
-            line_lower = line.lower()
-            should_skip = False
-
-            for pattern in skip_patterns:
-                if re.search(pattern, line_lower, re.IGNORECASE):
-                    should_skip = True
-                    break
-
-            if should_skip:
-                continue
+        started = time.perf_counter()
+        prefix = text[:CONTACT_SCAN_CHARS].replace("\r", "\n")
+        contact = _extract_name(prefix), _extract_email(prefix), _extract_phone(prefix)
+        CONTACT_PARSE_SECONDS.observe(time.perf_counter() - started)
+        return contact
+
+    @staticmethod
+    def extract_contact_info_batch(texts: Iterable[str]) -> List[Tuple[Optional[str], Optional[str], Optional[str]]]:
+        """
+        Extract contact info for many documents (bulk imports)
+
+        Args:
+            texts: Extracted text of each document
+
+        Returns:
+            One (name, email, phone) tuple per text, in input order
+        """
+        extract = PDFService.extract_contact_info
+        return [extract(text) for text in texts]
+
+def _extract_email(prefix: str) -> Optional[str]:
+    # No address can start more than EMAIL_LOCAL_MAX characters before the first "@"
+    at = prefix.find("@")
+    if at == -1:
+        return None
+    match = _EMAIL_RE.search(prefix, max(0, at - EMAIL_LOCAL_MAX))
+    return match.group().lower() if match else None
+
+def _extract_phone(prefix: str) -> Optional[str]:
+    match = _PHONE_RE.search(prefix)
+    return match.group() if match else None
+
+def _extract_name(prefix: str) -> Optional[str]:
+    lines_checked = 0
+    start = 0
+    length = len(prefix)
+    while start < length and lines_checked < NAME_SCAN_LINES:
+        end = prefix.find("\n", start)
+        if end == -1:
+            end = length
+        line = prefix[start:end].replace("\t", " ").strip()
+        start = end + 1
+        if not line:
+            continue
+        lines_checked += 1
+        if not _SKIP_LINE_RE.match(line) and _looks_like_name(line):
+            return line
+    return None
 
-            # Check if line looks like a name (2-4 words, title case or mixed case)
-            words = line.split()
-            if 1 <= len(words) <= 4:
-                # Check if it contains title case words (likely a name)
-                has_title_case = any(word[0].isupper() and len(word) > 1 for word in words if word[0].isalpha())
-                # Not all caps (likely headers)
-                not_all_caps = not all(word.isupper() for word in words if len(word) > 1)
-                # Not too short
-                not_too_short = len(line) > 3
-
-                if has_title_case and not_all_caps and not_too_short:
-                    name = line
-                    break
-
-        return name, email, phone
+def _looks_like_name(line: str) -> bool:
+    """A name is 1-4 words, not all caps, with at least one title-case word"""
+    words = line.split()
+    if not 1 <= len(words) <= 4 or len(line) <= 3:
+        return False
+    has_title_case = any(word[0].isalpha() and word[0].isupper() and len(word) > 1 for word in words)
+    not_all_caps = not all(word.isupper() for word in words if len(word) > 1)
+    return has_title_case and not_all_caps
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+from sqlalchemy import delete, select, update
+from app.database import AsyncSessionLocal
+from app.models.resume import Resume, ResumeFingerprint
+from app.services.blob_store import BlobStore, blob_store
+from app.services.dedup import fingerprint_rows, minhash_signature, resume_fingerprints
+from app.services.pdf_service import PDFService
+from app.services.versioning import bump_job_version
+
+logger = logging.getLogger(__name__)
+
+# Resumes loaded, extracted and written per round
+REEXTRACT_BATCH_SIZE = int(os.getenv("REEXTRACT_BATCH_SIZE", "200"))
+
+ExtractionResult = Tuple[str, Tuple[Optional[str], Optional[str], Optional[str]], Optional[bytes]]
+
+_worker_pdf_service: Optional[PDFService] = None
+
+def _init_worker():
+    global _worker_pdf_service
+    _worker_pdf_service = PDFService()
+
+def _extract_blob(path: str) -> Optional[ExtractionResult]:
+    """Process-pool task: extract text, contact info and MinHash signature from one stored PDF"""
+    with open(path, "rb") as blob:
+        extracted = _worker_pdf_service.extract(blob.read())
+    if not extracted:
+        return None
+    contact = PDFService.extract_contact_info(extracted.first_page or extracted.text)
+    return extracted.text, contact, minhash_signature(extracted.text)
+
+@dataclass
+class ReextractionSummary:
+    examined: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    missing_blob: int = 0
+
+async def reextract_resumes(
+    job_id: Optional[int] = None,
+    resume_ids: Optional[Sequence[int]] = None,
+    workers: Optional[int] = None,
+    batch_size: int = REEXTRACT_BATCH_SIZE,
+    dry_run: bool = False,
+    store: BlobStore = blob_store,
+    session_factory=AsyncSessionLocal
+) -> ReextractionSummary:
+    """
+    Re-run text and contact extraction from the stored original PDFs
+
+    Only local files and the database are touched: analyses are not recomputed.
+    Identical PDFs are extracted once per batch. A contact field is only replaced
+    when the new extraction finds a value for it. Near-duplicate signatures and
+    fingerprints are rebuilt with the text (which also backfills older resumes).
+
+    Args:
+        job_id: Limit to one job's resumes
+        resume_ids: Limit to these resumes
+        workers: Extraction processes (default: one per CPU)
+        batch_size: Resumes per round trip
+        dry_run: Extract and compare, but do not write
+        store: Blob store holding the originals
+        session_factory: Async session factory for the database
+
+    Returns:
+        Counts of examined, updated, unchanged and failed resumes
+    """
+    summary = ReextractionSummary()
+    loop = asyncio.get_running_loop()
+    last_id = 0
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        while True:
+            query = (
+                select(Resume.id, Resume.job_id, Resume.pdf_sha256, Resume.extracted_text,
+                       Resume.name, Resume.email, Resume.mobile, Resume.minhash)
+                .where(Resume.pdf_sha256.is_not(None), Resume.id > last_id)
+                .order_by(Resume.id)
+                .limit(batch_size)
+            )
+            if job_id is not None:
+                query = query.where(Resume.job_id == job_id)
+            if resume_ids:
+                query = query.where(Resume.id.in_(resume_ids))
+            async with session_factory() as db:
+                rows = (await db.execute(query)).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            summary.examined += len(rows)
+
+            digests = {row.pdf_sha256 for row in rows if store.exists(row.pdf_sha256)}
+            futures = {
+                digest: loop.run_in_executor(pool, _extract_blob, store.path(digest))
+                for digest in digests
+            }
+            results: Dict[str, Optional[ExtractionResult]] = {}
+            for digest, future in futures.items():
+                try:
+                    results[digest] = await future
+                except Exception as e:
+                    logger.error("Error re-extracting blob %s: %s", digest, e)
+                    results[digest] = None
+
+            changes = []
+            for row in rows:
+                if row.pdf_sha256 not in digests:
+                    summary.missing_blob += 1
+                    continue
+                result = results[row.pdf_sha256]
+                if result is None:
+                    summary.failed += 1
+                    continue
+                text, (name, email, mobile), signature = result
+                values = {
+                    "extracted_text": text,
+                    "name": name or row.name,
+                    "email": email or row.email,
+                    "mobile": mobile or row.mobile,
+                    "minhash": signature,
+                }
+                if values == {"extracted_text": row.extracted_text, "name": row.name,
+                              "email": row.email, "mobile": row.mobile, "minhash": row.minhash}:
+                    summary.unchanged += 1
+                    continue
+                changes.append((row.id, row.job_id, values))
+
+            summary.updated += len(changes)
+            if changes and not dry_run:
+                async with session_factory() as db:
+                    for resume_id, resume_job_id, values in changes:
+                        await db.execute(update(Resume).where(Resume.id == resume_id).values(**values))
+                        await db.execute(delete(ResumeFingerprint).where(ResumeFingerprint.resume_id == resume_id))
+                        db.add_all(fingerprint_rows(resume_id, resume_job_id, resume_fingerprints(
+                            values["minhash"], values["email"], values["mobile"]
+                        )))
+                    for changed_job_id in {change[1] for change in changes}:
+                        await bump_job_version(db, job_id=changed_job_id)
+                    await db.commit()
+
+    return summary
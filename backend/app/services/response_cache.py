@@ -0,0 +1,170 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional, Tuple
+from urllib.parse import quote
+from fastapi import Request, Response
+from app.responses import FastJSONResponse, RangedFileResponse
+from app.workers import per_worker
+
+# Maximum number of encoded responses kept per process
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+# Memory for encoded responses on the whole host, split between the worker processes
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_MB", "256")) * 1024 * 1024
+
+class ResponseCache:
+    """
+    In-process LRU of encoded JSON bodies keyed by (endpoint, params, version)
+
+    Entries never go stale: any write bumps the version that is part of the key,
+    so an old entry is simply never asked for again and ages out of the LRU.
+    Bounded by entry count and by total body size (a listing of a large job can
+    be tens of megabytes); a body larger than the whole budget is not cached.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+                 max_bytes: int = per_worker(RESPONSE_CACHE_MAX_BYTES)):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: Hashable, body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = body
+            self.size += len(body)
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+response_cache = ResponseCache()
+
+def make_etag(key: Hashable, version: int) -> str:
+    """Strong ETag derived from the cache key and version"""
+    digest = hashlib.blake2b(repr((key, version)).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check If-None-Match (weak comparison, as RFC 9110 requires for GET)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+async def conditional_json(
+    request: Request,
+    key: Hashable,
+    version: int,
+    build: Callable[[], Awaitable[Any]]
+) -> Response:
+    """
+    Serve a JSON GET with ETag / If-None-Match support and an encoded-body cache
+
+    Args:
+        request: Incoming request (for If-None-Match)
+        key: (endpoint, params...) identifying the response
+        version: Version counter of the data behind the response
+        build: Coroutine function producing the payload on a cache miss
+
+    Returns:
+        304 if the client copy is current, otherwise the (possibly cached) body
+    """
+    etag = make_etag(key, version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    body = response_cache.get((key, version))
+    if body is None:
+        body = FastJSONResponse(content=await build()).body
+        response_cache.put((key, version), body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=" range against a file size
+
+    Returns:
+        (start, end) inclusive, or None when the range cannot be satisfied
+
+    Raises:
+        ValueError: The header is not a single byte range (serve the whole file)
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        raise ValueError(header)
+    first, _, last = spec.strip().partition("-")
+    if not first:
+        suffix = int(last)
+        if suffix <= 0 or size == 0:
+            return None
+        return max(0, size - suffix), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start > end or start >= size:
+        return None
+    return start, min(end, size - 1)
+
+def blob_file_response(request: Request, path: str, digest: str, filename: str, media_type: str) -> Response:
+    """
+    Serve a stored blob with ETag, If-None-Match and single-range support
+
+    Args:
+        request: Incoming request (for If-None-Match, Range and If-Range)
+        path: Blob path on disk
+        digest: Content hash of the blob, used as a strong ETag
+        filename: Name suggested to the browser
+        media_type: Content type of the blob
+
+    Returns:
+        304, 206 with the requested range, 416, or 200 with the whole file
+    """
+    etag = f'"{digest}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f"inline; filename*=utf-8''{quote(filename)}",
+    }
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    size = os.stat(path).st_size
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range == etag):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            pass  # Multiple or malformed ranges: fall through to the whole file
+        else:
+            if byte_range is None:
+                return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            return RangedFileResponse(path, start, end, status_code=206, headers=headers, media_type=media_type)
+
+    return RangedFileResponse(path, 0, size - 1, headers=headers, media_type=media_type)
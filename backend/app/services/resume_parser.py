@@ -1,28 +1,27 @@
-from sqlalchemy.orm import Session
-from app.database import get_db
-from fastapi import Depends
-import sys
+import asyncio
+from collections import deque
+from typing import Awaitable, Deque, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.database import AsyncSessionLocal
+import logging
 import os
 import json
-from app.services.ai_service import AIService
+from app.services.ai_scheduler import BACKGROUND, ai_work
+from app.services.ai_service import AIService, MatchResult
+from app.services.bucketing import assign_bucket_for_job
+from app.services.skill_stats import SkillDelta, apply_skill_delta
+from app.services.versioning import bump_job_version
+from app.models.job import Job
 from app.models.resume import Resume, ResumeAnalysis, EmailStatus, BucketType
 
-ai_service = None
+logger = logging.getLogger(__name__)
 
-# Force immediate output
-def debug_print(msg):
-    print(msg, flush=True)
-    sys.stdout.flush()
-
-def assign_bucket(match_percentage: float) -> BucketType:
-    """Assign resume to bucket based on match percentage"""
-    if match_percentage >= 80:
-        return BucketType.STRONG_FIT
-    elif match_percentage >= 60:
-        return BucketType.POTENTIAL
-    else:
-        return BucketType.REJECT
+# Resume analyses of one re-evaluation running at the same time
+REEVALUATE_CONCURRENCY = int(os.getenv("REEVALUATE_CONCURRENCY", "4"))
 
+ai_service = None
 
 def get_ai_service():
     """Lazy initialization of AI service"""
@@ -31,61 +30,79 @@ def get_ai_service():
         try:
             gemini_key = os.getenv("GEMINI_API_KEY")
             if gemini_key:
-                debug_print(f"DEBUG: GEMINI_API_KEY found (length: {len(gemini_key)}), initializing AIService...")
                 ai_service = AIService()
-                debug_print("DEBUG: AIService initialized successfully")
+                logger.debug("AIService initialized")
             else:
-                debug_print("DEBUG: GEMINI_API_KEY not found, ai_service will be None")
+                logger.debug("GEMINI_API_KEY not found, ai_service will be None")
         except Exception as e:
-            debug_print(f"DEBUG: Error initializing AIService: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error initializing AIService: %s", e)
     return ai_service
 
 
-def evaluateResume(jobDescription:str, resume:Resume, db: Session):
-    """Reevaluates resume"""
+async def _analyze(current_ai_service: AIService, jobDescription: str, resume: Resume) -> Optional[MatchResult]:
+    logger.debug("Re-analyzing resume %s", resume.id)
+    # Gemini client is blocking; keep it off the event loop
+    return await run_in_threadpool(
+        current_ai_service.analyze_resume_match, resume.extracted_text, jobDescription
+    )
+
+async def evaluateResume(
+    jobDescription:str, resume:Resume, db: AsyncSession, job: Job,
+    analysis: Optional[Awaitable[Optional[MatchResult]]] = None
+):
+    """Reevaluates resume; `analysis` is an AI analysis of it already under way"""
     # Analyze resume with AI
     analysis_update = None
     current_ai_service = get_ai_service()
-    debug_print(f"DEBUG: ai_service is {'available' if current_ai_service else 'None'}")
     if current_ai_service:
         try:
-            debug_print("DEBUG: Starting AI analysis...")
-            match_result = current_ai_service.analyze_resume_match(resume.extracted_text, jobDescription)
-            debug_print(f"DEBUG: AI analysis result: {match_result}")
+            match_result = await (analysis or _analyze(current_ai_service, jobDescription, resume))
+            logger.debug("AI analysis result for resume %s: %s", resume.id, match_result)
             if match_result:
-                # Assign bucket based on match percentage
-                bucket = assign_bucket(match_result.match_percentage)
-                debug_print(f"DEBUG: Assigned bucket: {bucket}")
-                resume.bucket = bucket
-
-                # Create analysis record
-                db_analysis = db.query(ResumeAnalysis).filter(ResumeAnalysis.resume_id == resume.id).first()
-                if not db_analysis:
+                # Bump first: the job row stays locked until commit, so the analysis and
+                # bucket read here are the ones the job's skill counts were built from
+                await bump_job_version(db, job_id=job.id)
+                previous = (await db.execute(
+                    select(ResumeAnalysis, Resume.bucket)
+                    .join(Resume, ResumeAnalysis.resume_id == Resume.id)
+                    .where(ResumeAnalysis.resume_id == resume.id)
+                    .execution_options(populate_existing=True)
+                )).first()
+                if not previous:
                     return False
+                db_analysis, bucket = previous
+                skill_delta = SkillDelta()
+                skill_delta.remove(bucket, db_analysis)
+
+                # Assign bucket based on match percentage, keeping manual overrides
+                if not resume.bucket_overridden:
+                    bucket = assign_bucket_for_job(match_result.match_percentage, job)
+                    logger.debug("Assigned bucket %s to resume %s", bucket, resume.id)
+                    resume.bucket = bucket
 
+                # Replace the analysis record
                 setattr(db_analysis, "match_percentage", match_result.match_percentage)
                 setattr(db_analysis, "matched_skills", json.dumps(match_result.matched_skills))
                 setattr(db_analysis, "missing_skills", json.dumps(match_result.missing_skills))
                 setattr(db_analysis, "bonus_skills", json.dumps(match_result.bonus_skills))
                 setattr(db_analysis, "reasoning", match_result.reasoning)
-
-                # Commit both bucket update and analysis
-                db.commit()
-                db.refresh(resume)
-                db.refresh(db_analysis)
-                debug_print("DEBUG: Analysis record created successfully")
+                await db.flush()
+                skill_delta.add(bucket, match_result)
+                await apply_skill_delta(db, job.id, skill_delta)
+
+                # Commit bucket update, analysis and skill counts together
+                await db.commit()
+                await db.refresh(resume)
+                await db.refresh(db_analysis)
+                logger.debug("Analysis of resume %s updated", resume.id)
             else:
-                debug_print("DEBUG: AI analysis returned None")
+                logger.warning("AI analysis of resume %s returned no result", resume.id)
         except Exception as e:
-            debug_print(f"ERROR in AI analysis: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("AI analysis of resume %s failed: %s", resume.id, e)
             return False
             # Continue without analysis if AI fails
     else:
-        debug_print("WARNING: GEMINI_API_KEY not set, skipping AI analysis")
+        logger.warning("GEMINI_API_KEY not set, skipping AI analysis")
         return False
 
     return True
@@ -93,29 +110,49 @@ def evaluateResume(jobDescription:str, resume:Resume, db: Session):
 
 class ResumeParser:
     @staticmethod
-    def reevaluateAll(job_id:int, jobDescription:str) -> bool:
+    async def reevaluateAll(job_id:int, jobDescription:str) -> bool:
         """Reevaluates all the resumes again"""
-        db_gen = get_db()
-        db: Session = next(db_gen)
+        async with AsyncSessionLocal() as db:
+            job = await db.get(Job, job_id)
+            if not job:
+                logger.debug("Job %s not found", job_id)
+                return False
 
-        try:
             resumes = (
-                db.query(Resume)
-                .filter(Resume.job_id == job_id)
-                .all()
-            )
+                await db.scalars(select(Resume).where(Resume.job_id == job_id))
+            ).all()
 
             if not resumes:
-                debug_print(f"DEBUG: Job not found - job_id: {job_id}")
+                logger.debug("No resumes to re-evaluate for job %s", job_id)
                 return False
 
-            for resume in resumes:
-                result = evaluateResume(jobDescription, resume, db)
-                if not result:
-                    return False
-            print("Completed")
+            # Up to REEVALUATE_CONCURRENCY analyses run ahead of the (sequential) writes. They are
+            # background work for the AI scheduler, so they only use slots uploads leave free
+            current_ai_service = get_ai_service()
+            upcoming = iter(resumes)
+            window: Deque[Tuple[Resume, Optional[asyncio.Task]]] = deque()
+
+            def analyze_next():
+                resume = next(upcoming, None)
+                if resume is not None:
+                    with ai_work(BACKGROUND, job_id):
+                        analysis = asyncio.create_task(
+                            _analyze(current_ai_service, jobDescription, resume)
+                        ) if current_ai_service else None
+                    window.append((resume, analysis))
+
+            for _ in range(REEVALUATE_CONCURRENCY):
+                analyze_next()
+            try:
+                while window:
+                    resume, analysis = window.popleft()
+                    analyze_next()
+                    result = await evaluateResume(jobDescription, resume, db, job, analysis)
+                    if not result:
+                        return False
+            finally:
+                for _, analysis in window:
+                    if analysis is not None and not analysis.cancel():
+                        analysis.exception()  # already finished; do not report its error as unhandled
+            logger.info("Re-evaluated %d resumes of job %s", len(resumes), job_id)
             return True
-
-        finally:
-            db.close()
-        
\ No newline at end of file
@@ -0,0 +1,254 @@
+"""
+Per-job skill frequencies, maintained incrementally
+
+For every job, job_skill_counts holds how many analyzed resumes list each skill
+as matched, missing or bonus, over all of the job's resumes (scope ALL) and per
+bucket; job_analysis_counts holds the number of analyzed resumes per scope. The
+top K skills of a job are then K rows read in index order, instead of decoding
+the skill JSON of every analysis on each request.
+
+Every write that adds, replaces or deletes an analysis, or moves an analyzed
+resume to another bucket, applies the change in the same transaction:
+
+    delta = SkillDelta()
+    delta.remove(old_bucket, old_analysis)
+    delta.add(new_bucket, new_result)
+    ...write and flush the rows, bump_job_version...
+    await apply_skill_delta(db, job_id, delta)
+
+apply_skill_delta runs after bump_job_version: the job row it updated stays
+locked until commit, which serializes the writers of a job's counts. A job
+whose counts were never built (analyzed before they existed, or seeded
+directly) is counted from its stored analyses instead, so the rows written must
+be flushed first.
+"""
+import json
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from app.models.job import Job
+from app.models.resume import Resume, ResumeAnalysis, BucketType
+from app.models.skill_stats import JobSkillCount, JobAnalysisCount
+
+# Kinds of skill lists in an analysis
+KINDS = ("matched", "missing", "bonus")
+# Scope of the counts over all of a job's resumes; the other scopes are the bucket names
+ALL = "ALL"
+# Longest skill name stored
+SKILL_MAX_LENGTH = 255
+
+# Joined under an alias, so bulk selection criteria with their own EXISTS on
+# resume_analyses (min_match) do not correlate to it
+_analysis = aliased(ResumeAnalysis, name="counted_analysis")
+# Job, bucket and skill lists of analyzed resumes, for building deltas of bulk changes
+ANALYZED_SKILL_COLUMNS = (
+    Resume.job_id,
+    Resume.bucket,
+    _analysis.matched_skills,
+    _analysis.missing_skills,
+    _analysis.bonus_skills,
+)
+
+def skill_key(name: str) -> str:
+    """Counting key of a skill: spellings differing only in case or spacing are one skill"""
+    return " ".join(name.split()).casefold()[:SKILL_MAX_LENGTH]
+
+def _skill_lists(analysis) -> Tuple[List[str], List[str], List[str]]:
+    """Matched, missing and bonus skills of a MatchResult or a stored analysis (JSON text)"""
+    lists = (analysis.matched_skills, analysis.missing_skills, analysis.bonus_skills)
+    return tuple(json.loads(skills) if isinstance(skills, str) else skills for skills in lists)
+
+class SkillDelta:
+    """Pending changes to one job's skill counts"""
+
+    def __init__(self):
+        self.skills: Counter = Counter()  # (skill key, kind, scope) -> change in resumes
+        self.analyzed: Counter = Counter()  # scope -> change in analyzed resumes
+        self.names: Dict[Tuple[str, str], str] = {}  # (skill key, kind) -> name as written
+
+    def add(self, bucket: BucketType, analysis, sign: int = 1):
+        """
+        Count an analysis (MatchResult, ResumeAnalysis or a row of ANALYZED_SKILL_COLUMNS)
+
+        Args:
+            bucket: Bucket of the analyzed resume
+            analysis: The analysis; None (a resume without one) counts nothing
+            sign: -1 to uncount it
+        """
+        if analysis is None:
+            return
+        scopes = (ALL, BucketType(bucket).value)
+        for scope in scopes:
+            self.analyzed[scope] += sign
+        for kind, skills in zip(KINDS, _skill_lists(analysis)):
+            # A skill listed twice in one analysis is still one resume
+            keys: Dict[str, str] = {}
+            for name in skills:
+                name = " ".join(name.split())[:SKILL_MAX_LENGTH]
+                if name:
+                    keys.setdefault(skill_key(name), name)
+            for key, name in keys.items():
+                self.names.setdefault((key, kind), name)
+                for scope in scopes:
+                    self.skills[(key, kind, scope)] += sign
+
+    def remove(self, bucket: BucketType, analysis):
+        """Uncount an analysis that is replaced or deleted"""
+        self.add(bucket, analysis, -1)
+
+    def move(self, old_bucket: BucketType, new_bucket: BucketType, analysis):
+        """An analyzed resume changed buckets (the ALL counts do not change)"""
+        if BucketType(old_bucket) != BucketType(new_bucket):
+            self.remove(old_bucket, analysis)
+            self.add(new_bucket, analysis)
+
+    def add_rows(self, rows: Iterable, sign: int = 1):
+        """Count (or uncount) rows selected with ANALYZED_SKILL_COLUMNS"""
+        for row in rows:
+            self.add(row.bucket, row, sign)
+
+async def apply_skill_delta(db: AsyncSession, job_id: int, delta: SkillDelta):
+    """
+    Apply a delta to a job's counts in the caller's transaction (after bump_job_version)
+
+    Counts that drop to zero are deleted, so a job's rows are the skills some
+    analysis currently lists.
+    """
+    skills = {key: change for key, change in delta.skills.items() if change}
+    analyzed = {scope: change for scope, change in delta.analyzed.items() if change}
+    if not skills and not analyzed:
+        return
+    # Core statements on the session's connection: these run on every analysis
+    # write, and the ORM's bulk path costs more than the statements themselves
+    conn = await db.connection()
+    counts, skill_counts = JobAnalysisCount.__table__.c, JobSkillCount.__table__.c
+    current = dict((await conn.execute(
+        select(counts.scope, counts.resumes).where(counts.job_id == job_id)
+    )).all())
+    if ALL not in current:
+        await rebuild_job_skills(db, job_id)
+        return
+
+    existing = {}
+    if skills:
+        existing = {
+            (row.skill, row.kind, row.scope): row.resumes
+            for row in await conn.execute(
+                select(skill_counts.skill, skill_counts.kind, skill_counts.scope, skill_counts.resumes)
+                .where(skill_counts.job_id == job_id, skill_counts.skill.in_(sorted({key for key, _, _ in skills})))
+            )
+        }
+    updates, deletes, inserts = [], [], []
+    for (key, kind, scope), change in skills.items():
+        resumes = existing.get((key, kind, scope), 0) + change
+        params = {"j": job_id, "s": key, "k": kind, "sc": scope}
+        if (key, kind, scope) not in existing:
+            if resumes > 0:
+                inserts.append({
+                    "job_id": job_id, "skill": key, "kind": kind, "scope": scope,
+                    "name": delta.names[(key, kind)], "resumes": resumes
+                })
+        elif resumes > 0:
+            updates.append({**params, "r": resumes})
+        else:
+            deletes.append(params)
+    await _write_rows(db, JobSkillCount, updates, deletes, inserts, (
+        skill_counts.job_id == bindparam("j"), skill_counts.skill == bindparam("s"),
+        skill_counts.kind == bindparam("k"), skill_counts.scope == bindparam("sc")
+    ))
+
+    updates, inserts = [], []
+    for scope, change in analyzed.items():
+        if scope in current:
+            updates.append({"j": job_id, "sc": scope, "r": max(0, current[scope] + change)})
+        else:
+            inserts.append({"job_id": job_id, "scope": scope, "resumes": max(0, change)})
+    await _write_rows(db, JobAnalysisCount, updates, [], inserts, (
+        counts.job_id == bindparam("j"), counts.scope == bindparam("sc")
+    ))
+
+async def _write_rows(db: AsyncSession, model, updates: List[dict], deletes: List[dict], inserts: List[dict], key):
+    """Executemany UPDATE (of `resumes`), DELETE and INSERT of count rows identified by `key` (table columns)"""
+    table = model.__table__
+    conn = await db.connection()
+    if updates:
+        await conn.execute(update(table).where(*key).values(resumes=bindparam("r")), updates)
+    if deletes:
+        await conn.execute(delete(table).where(*key), deletes)
+    if inserts:
+        await conn.execute(insert(table), inserts)
+
+async def rebuild_job_skills(db: AsyncSession, job_id: int):
+    """
+    Recount a job's skills from its stored analyses in the caller's transaction
+
+    Used when a job's counts were never built and when many buckets change at
+    once (new thresholds), where it costs the same as moving every resume.
+    """
+    # Serialize with the job's other writers (SQLite's DELETE takes the write lock anyway)
+    await db.execute(select(Job.id).where(Job.id == job_id).with_for_update())
+    await db.execute(delete(JobSkillCount).where(JobSkillCount.job_id == job_id))
+    await db.execute(delete(JobAnalysisCount).where(JobAnalysisCount.job_id == job_id))
+
+    delta = SkillDelta()
+    delta.add_rows(await db.execute(
+        select(*ANALYZED_SKILL_COLUMNS)
+        .join(_analysis, _analysis.resume_id == Resume.id)
+        .where(Resume.job_id == job_id)
+    ))
+    delta.analyzed[ALL] += 0  # The ALL row marks the counts as built, even for a job without analyses
+    await _write_rows(db, JobSkillCount, [], [], [
+        {"job_id": job_id, "skill": key, "kind": kind, "scope": scope, "name": delta.names[(key, kind)], "resumes": resumes}
+        for (key, kind, scope), resumes in delta.skills.items() if resumes > 0
+    ], ())
+    await _write_rows(db, JobAnalysisCount, [], [], [
+        {"job_id": job_id, "scope": scope, "resumes": resumes} for scope, resumes in delta.analyzed.items()
+    ], ())
+
+async def analyzed_skill_rows(db: AsyncSession, *criteria) -> list:
+    """Bucket and skill lists of the analyzed resumes matching `criteria`, before a bulk change"""
+    return (await db.execute(
+        select(*ANALYZED_SKILL_COLUMNS)
+        .join(_analysis, _analysis.resume_id == Resume.id)
+        .where(*criteria)
+    )).all()
+
+async def skills_built(db: AsyncSession, job_id: int) -> bool:
+    """Whether a job's counts exist (they are built on its first analysis write)"""
+    return await db.scalar(
+        select(JobAnalysisCount.resumes).where(JobAnalysisCount.job_id == job_id, JobAnalysisCount.scope == ALL)
+    ) is not None
+
+async def top_skills(
+    db: AsyncSession,
+    job_id: int,
+    limit: int,
+    bucket: Optional[BucketType] = None
+) -> Tuple[int, Dict[str, List[Tuple[str, int]]]]:
+    """
+    Most listed skills of each kind, read from the counts in index order
+
+    Args:
+        db: Database session
+        job_id: Job whose counts are read (built)
+        limit: Skills per kind
+        bucket: Only resumes in this bucket (default: all of the job's resumes)
+
+    Returns:
+        Analyzed resumes in scope, and for each kind its (name, resumes) pairs, most resumes first
+    """
+    scope = bucket.value if bucket else ALL
+    analyzed = await db.scalar(
+        select(JobAnalysisCount.resumes).where(JobAnalysisCount.job_id == job_id, JobAnalysisCount.scope == scope)
+    ) or 0
+    top = {}
+    for kind in KINDS:
+        top[kind] = [tuple(row) for row in await db.execute(
+            select(JobSkillCount.name, JobSkillCount.resumes)
+            .where(JobSkillCount.job_id == job_id, JobSkillCount.scope == scope, JobSkillCount.kind == kind)
+            .order_by(JobSkillCount.resumes.desc(), JobSkillCount.skill)
+            .limit(limit)
+        )]
+    return analyzed, top
@@ -0,0 +1,49 @@
+from typing import Optional
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.job import Job
+from app.models.resume import Resume
+from app.models.cache_version import CacheVersion
+
+# CacheVersion scope for the job listing (GET /api/jobs/)
+JOB_LIST_SCOPE = "jobs"
+
+async def bump_job_version(
+    db: AsyncSession,
+    job_id: Optional[int] = None,
+    resume_id: Optional[int] = None
+):
+    """
+    Increment a job's version in the caller's transaction
+
+    Pass job_id directly, or resume_id to bump the job owning that resume.
+    updated_at is left untouched: the job itself did not change.
+    """
+    target = Job.id == job_id if job_id is not None else Job.id == (
+        select(Resume.job_id).where(Resume.id == resume_id).scalar_subquery()
+    )
+    await db.execute(
+        update(Job)
+        .where(target)
+        .values(version=Job.version + 1, updated_at=Job.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+async def bump_job_list_version(db: AsyncSession):
+    """Increment the job listing version in the caller's transaction"""
+    result = await db.execute(
+        update(CacheVersion)
+        .where(CacheVersion.scope == JOB_LIST_SCOPE)
+        .values(version=CacheVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        await db.execute(insert(CacheVersion).values(scope=JOB_LIST_SCOPE, version=2))
+
+async def get_job_version(db: AsyncSession, job_id: int) -> Optional[int]:
+    """Current version of a job, or None if the job does not exist"""
+    return await db.scalar(select(Job.version).where(Job.id == job_id))
+
+async def get_job_list_version(db: AsyncSession) -> int:
+    """Current version of the job listing"""
+    version = await db.scalar(select(CacheVersion.version).where(CacheVersion.scope == JOB_LIST_SCOPE))
+    return version or 1
@@ -0,0 +1,112 @@
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import AsyncSessionLocal
+
+# Maximum number of queued writes committed together in one transaction
+WRITE_BATCH_MAX = int(os.getenv("WRITE_BATCH_MAX", "64"))
+
+WriteOp = Callable[[AsyncSession], Awaitable[Any]]
+
+class WriteQueue:
+    """
+    Single writer that groups concurrent small writes into one transaction
+
+    SQLite allows one writer at a time, so concurrent commits otherwise queue on
+    the file lock and each pays its own fsync. Requests submit an async function
+    that applies its changes to the writer's session; everything queued at that
+    moment is committed together, and each caller gets its own function's result.
+    A failing write is isolated by replaying the batch one write per transaction,
+    so an operation may run more than once: it must create or load every ORM
+    object it writes inside the function, from plain values, never capture one
+    built by the caller (a rolled-back flush leaves it looking persistent).
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal, max_batch: int = WRITE_BATCH_MAX):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self):
+        """Start the writer task on the running event loop (idempotent)"""
+        loop = asyncio.get_running_loop()
+        if self._worker is not None and not self._worker.done() and self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._worker = loop.create_task(self._run())
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def stop(self):
+        """Commit everything already queued, then stop the writer task"""
+        if self._worker is None or self._worker.done():
+            self._worker = None
+            return
+        await self._queue.put(None)
+        await self._worker
+        self._worker = None
+
+    async def submit(self, op: WriteOp) -> Any:
+        """
+        Queue a write and wait until it is committed
+
+        Args:
+            op: Async function receiving the writer's session; it must not commit
+
+        Returns:
+            Whatever op returned, once its transaction has been committed
+        """
+        self.start()
+        future = self._loop.create_future()
+        await self._queue.put((op, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stopping = False
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._run_batch(batch)
+            if stopping:
+                return
+
+    async def _run_batch(self, batch: List[Tuple[WriteOp, asyncio.Future]]):
+        batch = [(op, future) for op, future in batch if not future.cancelled()]
+        if not batch:
+            return
+        try:
+            async with self.session_factory() as session:
+                results = [await op(session) for op, _ in batch]
+                await session.commit()
+        except Exception as e:
+            if len(batch) == 1:
+                if not batch[0][1].done():
+                    batch[0][1].set_exception(e)
+                return
+            # Replay individually so one bad write does not fail its neighbours
+            for item in batch:
+                await self._run_batch([item])
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+write_queue = WriteQueue()
@@ -0,0 +1,22 @@
+"""
+Worker processes sharing one host
+
+`python run.py --prod` serves the app from WEB_CONCURRENCY worker processes
+(gunicorn's and uvicorn's own setting, exported by run.py). Every module-level
+service, cache and pool exists once per worker. Budgets that really belong to
+the host, such as the Gemini quota or the response cache memory, are configured
+as host totals and split with per_worker(), so they do not grow with the worker
+count.
+"""
+import os
+
+# Worker processes serving the app on this host (1 in development)
+WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+# Threads per worker for blocking work (PDF extraction, Gemini calls, compression)
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "40"))
+
+def per_worker(total: int, minimum: int = 1) -> int:
+    """One worker's share of a host-wide integer budget"""
+    return max(minimum, total // WORKERS)
+# Seconds a stopping worker waits for in-flight requests (and their AI analyses)
+GRACEFUL_TIMEOUT = int(os.getenv("GRACEFUL_TIMEOUT", "120"))
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Score a directory of resume PDFs against a job without the HTTP upload
+
+Extracts text in a process pool, analyzes each resume with the AI service under
+bounded concurrency and writes the results to the database in batches, like an
+upload would. One JSON line per file goes to --output (default: stdout) and
+throughput is reported on stderr. Stored files are recorded in the checkpoint
+file, so re-running the same command resumes where it stopped and retries the
+files that failed (extraction or AI errors).
+
+Usage:
+    python batch_score.py --job-id N PATH [PATH ...]
+    python batch_score.py --jd job.txt [--title "Backend Engineer"] 'resumes/**/*.pdf'
+"""
+import argparse
+import asyncio
+import os
+import sys
+from app.logging_config import setup_logging
+from app.database import AsyncSessionLocal, async_engine, init_async_db
+from app.models.job import Job
+from app.services.ai_service import AIService
+from app.services.batch_scoring import (
+    BATCH_SCORE_AI_CONCURRENCY, BATCH_SCORE_BATCH_SIZE, Checkpoint, expand_inputs, score_files
+)
+from app.services.job_index import job_terms, serialize_terms
+from app.services.versioning import bump_job_list_version
+
+async def load_job(args, checkpoint: Checkpoint) -> Job:
+    """The job named on the command line or in the checkpoint, creating it from --jd if needed"""
+    job_id = args.job_id
+    if checkpoint.job_id is not None:
+        if job_id is not None and job_id != checkpoint.job_id:
+            sys.exit(f"Checkpoint {checkpoint.path} belongs to job {checkpoint.job_id}, not {job_id}")
+        job_id = checkpoint.job_id
+
+    async with AsyncSessionLocal() as db:
+        if job_id is not None:
+            job = await db.get(Job, job_id)
+            if job is None:
+                sys.exit(f"Job {job_id} not found")
+            return job
+
+        with open(args.jd) as jd:
+            description = jd.read().strip()
+        job = Job(
+            title=args.title or os.path.splitext(os.path.basename(args.jd))[0],
+            description=description,
+            term_index=serialize_terms(job_terms(description))
+        )
+        db.add(job)
+        await bump_job_list_version(db)
+        await db.commit()
+        await db.refresh(job)
+        print(f"Created job {job.id}: {job.title}", file=sys.stderr)
+        return job
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--job-id", type=int, help="score against this existing job")
+    source.add_argument("--jd", help="job description file; a new job is created from it")
+    parser.add_argument("--title", help="title of the job created from --jd (default: file name)")
+    parser.add_argument("paths", nargs="+", help="PDF files, directories (searched recursively) or glob patterns")
+    parser.add_argument("--output", help="JSONL results file, appended to (default: stdout)")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: <output>.checkpoint or batch_score.checkpoint)")
+    parser.add_argument("--workers", type=int, help="extraction processes (default: one per CPU)")
+    parser.add_argument("--concurrency", type=int, default=BATCH_SCORE_AI_CONCURRENCY, help="concurrent AI analyses")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SCORE_BATCH_SIZE, help="resumes per database transaction")
+    parser.add_argument("--no-ai", action="store_true", help="store resumes without an AI analysis")
+    args = parser.parse_args()
+
+    # Plain handler (no writer thread) so the forked extraction workers can log too
+    setup_logging(fmt="text", queued=False, stream=sys.stderr)
+    paths = expand_inputs(args.paths)
+    if not paths:
+        sys.exit("No PDF files found")
+    checkpoint = Checkpoint(args.checkpoint or (f"{args.output}.checkpoint" if args.output else "batch_score.checkpoint"))
+
+    ai_service = None
+    if not args.no_ai:
+        if not os.getenv("GEMINI_API_KEY"):
+            sys.exit("GEMINI_API_KEY is not set (use --no-ai to store resumes without an analysis)")
+        ai_service = AIService()
+
+    await init_async_db()
+    output = open(args.output, "a") if args.output else sys.stdout
+    try:
+        job = await load_job(args, checkpoint)
+        summary = await score_files(
+            job,
+            paths,
+            output,
+            checkpoint,
+            ai_service=ai_service,
+            workers=args.workers,
+            ai_concurrency=args.concurrency,
+            batch_size=args.batch_size
+        )
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        await async_engine.dispose()
+
+    rate = (summary.stored + summary.failed) / summary.elapsed if summary.elapsed else 0.0
+    print(
+        f"Job {job.id}: {summary.stored} stored ({summary.analyzed} analyzed), {summary.failed} failed, "
+        f"{summary.skipped} already done, {rate:.1f} files/s",
+        file=sys.stderr
+    )
+    for path, error in summary.failures:
+        print(f"  {path}: {error}", file=sys.stderr)
+
+if __name__ == "__main__":
+    asyncio.run(main())
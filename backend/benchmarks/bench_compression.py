@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark response compression on resume listing payloads
+
+Builds listing responses of several sizes exactly as GET /api/resumes/job/{id}
+does (resume_row_payload + FastJSONResponse), pushes them through
+CompressionMiddleware for each encoding, and reports the bytes on the wire,
+the CPU time spent compressing, and the estimated time to deliver the response
+(compression + transfer) at a few link speeds. A streamed export of the
+largest listing is measured as well, one chunk per 100 rows.
+
+Usage:
+    python benchmarks/bench_compression.py [--rows 100 1000 5000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import orjson
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+from app.database import Base
+from app.middleware.compression import CompressionMiddleware, brotli
+from app.models import Resume, ResumeAnalysis, EmailStatus
+from app.responses import FastJSONResponse, RESUME_LISTING_COLUMNS, resume_row_payload
+from bench_serialization import seed
+
+# Link speeds in Mbit/s used to estimate delivery time
+LINKS = {"10 Mbit/s": 10, "100 Mbit/s": 100}
+STREAM_CHUNK_ROWS = 100
+
+def fetch_rows(rows: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            job_id = seed(session, rows)
+            result = session.execute(
+                select(*RESUME_LISTING_COLUMNS)
+                .outerjoin(ResumeAnalysis, ResumeAnalysis.resume_id == Resume.id)
+                .outerjoin(EmailStatus, EmailStatus.resume_id == Resume.id)
+                .where(Resume.job_id == job_id)
+            ).all()
+        engine.dispose()
+    return result
+
+def body_app(chunks):
+    """ASGI app sending the given chunks as one (or a streamed) JSON response"""
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json")],
+        })
+        for i, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < len(chunks) - 1})
+    return app
+
+async def run_once(chunks, encoding: str) -> int:
+    """Send the chunks through the middleware; return the bytes that reached the client"""
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", encoding.encode())],
+    }
+    sent = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal sent
+        if message["type"] == "http.response.body":
+            sent += len(message.get("body", b""))
+
+    await CompressionMiddleware(body_app(chunks))(scope, receive, send)
+    return sent
+
+def measure(chunks, encoding: str, repeat: int):
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = asyncio.run(run_once(chunks, encoding))
+        timings.append(time.perf_counter() - started)
+    return size, min(timings)
+
+def report(label: str, chunks, encodings, repeat: int):
+    raw = sum(len(chunk) for chunk in chunks)
+    print(f"\n{label}: {raw / 1024:.0f} KiB of JSON")
+    header = f"{'encoding':<10} {'KiB':>8} {'ratio':>6} {'cpu ms':>8}"
+    for link in LINKS:
+        header += f" {link:>12}"
+    print(header + "  (delivery ms)")
+    for encoding in encodings:
+        size, cpu = measure(chunks, encoding, repeat)
+        line = f"{encoding:<10} {size / 1024:>8.1f} {raw / size:>6.1f} {cpu * 1000:>8.2f}"
+        for mbits in LINKS.values():
+            transfer = size * 8 / (mbits * 1_000_000)
+            line += f" {(cpu + transfer) * 1000:>12.1f}"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    encodings = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+    rows = fetch_rows(max(args.rows))
+    for count in args.rows:
+        body = FastJSONResponse(content=[resume_row_payload(row) for row in rows[:count]]).body
+        report(f"{count} rows, buffered", [body], encodings, args.repeat)
+
+    chunks = [
+        b"\n".join(orjson.dumps(resume_row_payload(row)) for row in rows[i:i + STREAM_CHUNK_ROWS]) + b"\n"
+        for i in range(0, len(rows), STREAM_CHUNK_ROWS)
+    ]
+    report(f"{len(rows)} rows, streamed as NDJSON in {len(chunks)} chunks", chunks, encodings, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark contact extraction
+
+Times PDFService.extract_contact_info_batch against the previous
+implementation (kept below as legacy_extract_contact_info: whole-text
+normalization and split, pattern strings through the re cache, one regex per
+phone format and per skip rule) on synthetic resume texts, and reports how
+often the two disagree.
+
+Usage:
+    python benchmarks/bench_contact_extraction.py [--docs 2000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.pdf_service import PDFService
+
+FIRST = ["Jane", "Arjun", "Maria", "Wei", "Olivia", "Kwame", "Priya", "Lucas"]
+LAST = ["Doe", "Sharma", "Garcia", "Chen", "Smith", "Mensah", "Iyer", "Silva"]
+WORDS = ["Python", "FastAPI", "designed", "built", "services", "latency", "team", "SQL", "migrated",
+         "pipeline", "customers", "reduced", "cost", "Kubernetes", "on-call", "React", "owned", "launch"]
+PHONES = ["555-123-{:04d}", "(555) 123-{:04d}", "+1 555 123 {:04d}", "555.123.{:04d}", "555123{:04d}"]
+
+def legacy_extract_contact_info(text):
+    name = None
+    email = None
+    phone = None
+    text = text.replace('\r', '\n').replace('\t', ' ')
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+    email_match = re.search(email_pattern, text, re.IGNORECASE)
+    if email_match:
+        email = email_match.group().lower()
+    phone_patterns = [
+        r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b',
+        r'\b\(\d{3}\)\s*\d{3}[-.\s]?\d{4}\b',
+        r'\b\d{10}\b',
+        r'\+\d{1,3}[-.\s]?\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b'
+    ]
+    for pattern in phone_patterns:
+        phone_match = re.search(pattern, text)
+        if phone_match:
+            phone = phone_match.group()
+            phone = re.sub(r'[^\d+\-\(\)\.\s]', '', phone)
+            break
+    skip_patterns = [
+        r'^https?://',
+        r'^www\.',
+        r'^\d+$',
+        r'^[^\w\s]*$',
+        r'^\s*(email|phone|mobile|tel|cell|contact|address|linkedin|github|portfolio)\s*:?\s*$',
+        r'^\s*(objective|summary|experience|education|skills|projects|certifications)\s*:?\s*$',
+    ]
+    for line in lines[:10]:
+        line_lower = line.lower()
+        should_skip = False
+        for pattern in skip_patterns:
+            if re.search(pattern, line_lower, re.IGNORECASE):
+                should_skip = True
+                break
+        if should_skip:
+            continue
+        words = line.split()
+        if 1 <= len(words) <= 4:
+            has_title_case = any(word[0].isupper() and len(word) > 1 for word in words if word[0].isalpha())
+            not_all_caps = not all(word.isupper() for word in words if len(word) > 1)
+            not_too_short = len(line) > 3
+            if has_title_case and not_all_caps and not_too_short:
+                name = line
+                break
+    return name, email, phone
+
+def resume_text(rng: random.Random, index: int) -> str:
+    """A resume of about 8 KB with the contact block in the header"""
+    name = f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+    header = [
+        "RESUME" if index % 3 == 0 else "",
+        name,
+        f"{name.split()[0].lower()}.{index}@example.com",
+        rng.choice(PHONES).format(index % 10000),
+        "https://github.com/" + name.split()[0].lower(),
+        "Summary",
+    ]
+    body = [" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(90)]
+    return "\n".join(header + body)
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    texts = [resume_text(rng, i) for i in range(args.docs)]
+
+    legacy = best_of(lambda: [legacy_extract_contact_info(text) for text in texts], args.repeat)
+    batch = best_of(lambda: PDFService.extract_contact_info_batch(texts), args.repeat)
+
+    legacy_results = [legacy_extract_contact_info(text) for text in texts]
+    new_results = PDFService.extract_contact_info_batch(texts)
+    differing = {field: 0 for field in ("name", "email", "phone")}
+    for old, new in zip(legacy_results, new_results):
+        for field, old_value, new_value in zip(differing, old, new):
+            differing[field] += old_value != new_value
+
+    print(f"{len(texts)} resumes, {sum(map(len, texts)) / len(texts) / 1024:.1f} KiB each")
+    print(f"{'implementation':<16} {'us/resume':>10}")
+    print(f"{'legacy':<16} {legacy * 1e6 / len(texts):>10.1f}")
+    print(f"{'batch':<16} {batch * 1e6 / len(texts):>10.1f}")
+    print(f"speedup: {legacy / batch:.1f}x")
+    print("fields that differ from legacy: " + ", ".join(f"{field} {count}" for field, count in differing.items()))
+    for old, new in [(o, n) for o, n in zip(legacy_results, new_results) if o != n][:3]:
+        print(f"  legacy {old} -> {new}")
+
+if __name__ == "__main__":
+    main()
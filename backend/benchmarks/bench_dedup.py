@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark near-duplicate lookups against a large resume table
+
+Seeds a scratch SQLite database with N resumes for a single job (the worst
+case: every lookup is scoped to one job), each with a MinHash signature and its
+fingerprints, then times app.services.dedup.find_duplicate through the async
+engine for three cases: a lightly edited copy of a stored resume, a resume
+sharing only the email, and a resume matching nothing.
+
+Usage:
+    python benchmarks/bench_dedup.py [--resumes 100000] [--lookups 500]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.database import Base
+from app.models import Job, Resume, ResumeFingerprint
+from app.services.dedup import (
+    band_fingerprints, contact_fingerprints, find_duplicate, minhash_signature, resume_fingerprints
+)
+from bench_contact_extraction import resume_text
+
+SEED_CHUNK = 5000
+
+def seed(path: str, resumes: int, rng: random.Random):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Job).values(id=1, title="bench", description="bench"))
+        for start in range(1, resumes + 1, SEED_CHUNK):
+            ids = range(start, min(start + SEED_CHUNK, resumes + 1))
+            resume_rows, fingerprint_rows = [], []
+            for resume_id in ids:
+                signature = rng.randbytes(512)
+                email = f"candidate{resume_id}@example.com"
+                phone = f"555{resume_id:07d}"
+                resume_rows.append({"id": resume_id, "job_id": 1, "filename": f"{resume_id}.pdf",
+                                    "extracted_text": "x", "email": email, "mobile": phone, "minhash": signature})
+                fingerprint_rows.extend(
+                    {"resume_id": resume_id, "job_id": 1, "fingerprint": fingerprint}
+                    for fingerprint in set(resume_fingerprints(signature, email, phone))
+                )
+            conn.execute(insert(Resume), resume_rows)
+            conn.execute(insert(ResumeFingerprint), fingerprint_rows)
+    engine.dispose()
+
+def add_resume(path: str, resume_id: int, text: str, email: str):
+    engine = create_engine(f"sqlite:///{path}")
+    signature = minhash_signature(text)
+    with engine.begin() as conn:
+        conn.execute(insert(Resume).values(id=resume_id, job_id=1, filename="real.pdf", extracted_text=text,
+                                           email=email, minhash=signature))
+        conn.execute(insert(ResumeFingerprint), [
+            {"resume_id": resume_id, "job_id": 1, "fingerprint": fingerprint}
+            for fingerprint in set(resume_fingerprints(signature, email, None))
+        ])
+    engine.dispose()
+
+async def time_lookups(path: str, cases, lookups: int):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    results = {}
+    async with sessions() as db:
+        for label, (signature, email, expected) in cases.items():
+            match = await find_duplicate(db, 1, signature, email, None)
+            found = match.resume_id if match else None
+            if found != expected:
+                raise SystemExit(f"{label}: expected {expected}, got {found}")
+            timings = []
+            for _ in range(lookups):
+                started = time.perf_counter()
+                await find_duplicate(db, 1, signature, email, None)
+                timings.append(time.perf_counter() - started)
+            results[label] = sorted(timings)
+    await engine.dispose()
+    return results
+
+def time_raw_lookups(path: str, cases, lookups: int):
+    """The same lookup as plain sqlite3 SQL: the index search alone, without driver overhead"""
+    conn = sqlite3.connect(path)
+    results = {}
+    for label, (signature, email, _) in cases.items():
+        fingerprints = band_fingerprints(signature) + contact_fingerprints(email, None)
+        sql = (
+            "SELECT f.resume_id, f.fingerprint, r.minhash FROM resume_fingerprints f "
+            "JOIN resumes r ON r.id = f.resume_id "
+            f"WHERE f.job_id = 1 AND f.fingerprint IN ({', '.join('?' * len(fingerprints))})"
+        )
+        timings = []
+        for _ in range(lookups):
+            started = time.perf_counter()
+            conn.execute(sql, fingerprints).fetchall()
+            timings.append(time.perf_counter() - started)
+        results[label] = sorted(timings)
+    conn.close()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    text = resume_text(rng, 1)
+    edited = text.replace("Python", "Golang", 2) + "\nCertified Kubernetes administrator"
+    novel = resume_text(random.Random(99), 2)
+    real_id = args.resumes + 1
+
+    started = time.perf_counter()
+    signature_runs = 50
+    for _ in range(signature_runs):
+        edited_signature = minhash_signature(edited)
+    signature_ms = (time.perf_counter() - started) * 1000 / signature_runs
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "dedup.db")
+        started = time.perf_counter()
+        seed(path, args.resumes, rng)
+        add_resume(path, real_id, text, "jane@example.com")
+        print(f"seeded {args.resumes + 1} resumes in {time.perf_counter() - started:.1f}s")
+
+        cases = {
+            "edited copy": (edited_signature, None, real_id),
+            "same email": (minhash_signature(novel), "jane@example.com", real_id),
+            "no match": (minhash_signature(novel), "nobody@example.com", None),
+        }
+        results = asyncio.run(time_lookups(path, cases, args.lookups))
+        raw_results = time_raw_lookups(path, cases, args.lookups)
+
+    print(f"signature of a {len(edited) / 1024:.1f} KiB text: {signature_ms:.2f} ms")
+    print(f"{'lookup':<14} {'p50 ms':>8} {'p99 ms':>8} {'SQL p50 ms':>11}")
+    for label, timings in results.items():
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        raw = statistics.median(raw_results[label])
+        print(f"{label:<14} {statistics.median(timings) * 1000:>8.3f} {p99 * 1000:>8.3f} {raw * 1000:>11.3f}")
+
+if __name__ == "__main__":
+    main()
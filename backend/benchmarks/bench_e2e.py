@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+End-to-end API benchmark with a local stand-in for Gemini
+
+Drives the FastAPI app in-process (every middleware included) against a scratch
+SQLite database at a fixed concurrency, and reports throughput and p50/p95/p99
+latency per scenario:
+
+    upload          POST /api/resumes/upload with synthetic resume PDFs
+    list_<N>        GET /api/resumes/job/{id} for a job with N resumes
+    dashboard_<N>   GET /api/jobs/{id}/dashboard for the same jobs
+    reevaluate      PUT /api/jobs/{id} with a new description (re-analyzes every resume)
+    mixed_fifo      one-file uploads while reevaluations keep every AI slot busy, served
+    mixed_priority  first come first served (fifo) or by the AI scheduler's priorities
+
+The AI service is replaced by FakeAIService, which sleeps for --ai-latency-ms
+(jittered) and fails --ai-error-rate of its calls. Listing jobs are seeded
+directly in the database. The response cache is disabled so every read runs its
+query and serialization; the 304 path is not measured here.
+
+--save-baseline writes the results to a JSON file. --compare exits with code 1
+when a scenario's p95 or throughput is worse than that baseline by more than
+--tolerance. Only compare runs from the same machine and settings.
+
+Usage:
+    python benchmarks/bench_e2e.py [--sizes 1000 10000 100000] [--concurrency 8] [--requests 100]
+        [--ai-latency-ms 50] [--ai-error-rate 0.02] [--scenarios upload list dashboard reevaluate mixed]
+        [--save-baseline benchmarks/baselines/e2e.json | --compare benchmarks/baselines/e2e.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict, List
+
+SCRATCH_DIR = tempfile.mkdtemp(prefix="xhiresense-e2e-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(SCRATCH_DIR, 'e2e.db')}"
+os.environ["BLOB_STORE_DIR"] = os.path.join(SCRATCH_DIR, "blobs")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.pop("GEMINI_API_KEY", None)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx
+from sqlalchemy import insert
+from app.main import app
+from app.database import engine
+from app.models import Job, Resume, ResumeAnalysis, EmailStatus
+from app.models.resume import BucketType
+from app.routers import resumes as resumes_router
+from app.services import resume_parser
+from app.services.admission import admission
+from app.services.ai_scheduler import ai_scheduler
+from app.services.ai_service import MatchResult
+from app.services.response_cache import response_cache
+from bench_pdf_extraction import WORDS, resume_pdf
+
+SKILLS = ["Python", "FastAPI", "SQL", "Kubernetes", "React", "Go", "AWS", "Docker", "Kafka", "Terraform"]
+SEED_CHUNK = 5000
+# Gemini slots during the mixed scenarios
+MIXED_AI_SLOTS = 4
+# Result fields compared against a baseline, and whether higher is better
+COMPARED = {"p95_ms": False, "throughput": True}
+
+class FakeAIService:
+    """Stand-in for AIService: fixed latency (±50% jitter), random failures, no network; uses the AI scheduler"""
+
+    def __init__(self, latency_ms: float, error_rate: float, seed: int = 7):
+        self.latency = latency_ms / 1000
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.errors = 0
+
+    def analyze_resume_match(self, resume_text: str, job_description: str):
+        self.calls += 1
+        # Scheduled like a real Gemini call
+        with ai_scheduler.slot():
+            time.sleep(self.latency * self.rng.uniform(0.5, 1.5))
+        if self.rng.random() < self.error_rate:
+            self.errors += 1
+            raise RuntimeError("Synthetic AI failure")
+        return MatchResult(
+            match_percentage=round(self.rng.uniform(10, 95), 1),
+            matched_skills=self.rng.sample(SKILLS, 4),
+            missing_skills=self.rng.sample(SKILLS, 2),
+            bonus_skills=self.rng.sample(SKILLS, 1),
+            reasoning="Synthetic analysis of the candidate against the job description."
+        )
+
+def job_description(rng: random.Random) -> str:
+    return "\n".join(" ".join(rng.choice(WORDS + SKILLS) for _ in range(14)) for _ in range(20))
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+async def drive(
+    requests: int,
+    concurrency: int,
+    send: Callable[[int], Awaitable[httpx.Response]],
+    items_per_request: int = 1,
+    warmup: int = 0
+) -> Dict[str, float]:
+    """Send `requests` requests from `concurrency` concurrent clients and summarize their latency"""
+    for index in range(warmup):
+        await send(index)
+    latencies: List[float] = []
+    failures = 0
+    next_index = iter(range(requests))
+
+    async def client():
+        nonlocal failures
+        for index in next_index:
+            started = time.perf_counter()
+            response = await send(index)
+            latencies.append(time.perf_counter() - started)
+            failures += response.status_code >= 400
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": failures,
+        "throughput": round(requests * items_per_request / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+def seed_job(resumes: int, rng: random.Random) -> int:
+    """Insert a job with `resumes` analyzed resumes directly, bypassing the API"""
+    with engine.begin() as conn:
+        job_id = conn.execute(
+            insert(Job).values(title=f"Seeded {resumes}", description=job_description(rng))
+        ).inserted_primary_key[0]
+        first_id = (conn.exec_driver_sql("SELECT COALESCE(MAX(id), 0) FROM resumes").scalar()) + 1
+        for start in range(first_id, first_id + resumes, SEED_CHUNK):
+            ids = range(start, min(start + SEED_CHUNK, first_id + resumes))
+            conn.execute(insert(Resume), [{
+                "id": resume_id, "job_id": job_id, "filename": f"{resume_id}.pdf", "extracted_text": "seeded",
+                "name": f"Candidate {resume_id}", "email": f"candidate{resume_id}@example.com",
+                "mobile": f"555{resume_id:07d}", "bucket": rng.choice(list(BucketType)),
+            } for resume_id in ids])
+            conn.execute(insert(ResumeAnalysis), [{
+                "resume_id": resume_id, "match_percentage": round(rng.uniform(10, 95), 1),
+                "matched_skills": json.dumps(rng.sample(SKILLS, 4)),
+                "missing_skills": json.dumps(rng.sample(SKILLS, 2)),
+                "bonus_skills": json.dumps(rng.sample(SKILLS, 1)),
+                "reasoning": "Synthetic analysis of the candidate against the job description.",
+            } for resume_id in ids])
+            conn.execute(insert(EmailStatus), [{"resume_id": resume_id} for resume_id in ids])
+    return job_id
+
+async def run_scenarios(args, client: httpx.AsyncClient, fake: FakeAIService) -> Dict[str, dict]:
+    rng = random.Random(11)
+    results = {}
+
+    def report(name: str, result: dict):
+        results[name] = result
+        print(f"{name:<18} {result['requests']:>8} {result['throughput']:>10.1f} {result['p50_ms']:>9.1f} "
+              f"{result['p95_ms']:>9.1f} {result['p99_ms']:>9.1f} {result['errors']:>7}", flush=True)
+
+    # Every request comes from one client for one job: measure the pipeline, not the admission caps
+    admission.max_per_client = admission.max_per_job = args.concurrency
+    admission.queue_max = args.concurrency * args.files_per_upload
+
+    print(f"{'scenario':<18} {'requests':>8} {'items/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+
+    if "upload" in args.scenarios:
+        job = (await client.post("/api/jobs/", json={"title": "Upload", "description": job_description(rng)})).json()
+        pdfs = [resume_pdf(rng, i, pages=1 + i % 2, with_image=False) for i in range(args.requests * args.files_per_upload)]
+
+        async def upload(index: int):
+            batch = pdfs[index * args.files_per_upload:(index + 1) * args.files_per_upload]
+            files = [("files", (f"cv{index}-{n}.pdf", pdf, "application/pdf")) for n, pdf in enumerate(batch)]
+            return await client.post("/api/resumes/upload", data={"job_id": str(job["id"])}, files=files)
+
+        report("upload", await drive(args.requests, args.concurrency, upload, args.files_per_upload))
+
+    # Reads must run their query and serialization on every request
+    response_cache.max_entries = 0
+    seeded = {size: seed_job(size, rng) for size in args.sizes} if {"list", "dashboard"} & set(args.scenarios) else {}
+    for size, job_id in seeded.items():
+        # Fewer requests for the large jobs; at least 10 so p95 means something
+        requests = max(10, args.requests * 1000 // size)
+        if "list" in args.scenarios:
+            report(f"list_{size}", await drive(
+                requests, args.concurrency, lambda _: client.get(f"/api/resumes/job/{job_id}"), warmup=1
+            ))
+        if "dashboard" in args.scenarios:
+            report(f"dashboard_{size}", await drive(
+                args.requests, args.concurrency, lambda _: client.get(f"/api/jobs/{job_id}/dashboard"), warmup=1
+            ))
+
+    if "reevaluate" in args.scenarios:
+        job = (await client.post("/api/jobs/", json={"title": "Reevaluate", "description": job_description(rng)})).json()
+        pdfs = [resume_pdf(rng, 100_000 + i, pages=1, with_image=False) for i in range(args.reevaluate_resumes)]
+        files = [("files", (f"re{i}.pdf", pdf, "application/pdf")) for i, pdf in enumerate(pdfs)]
+        await client.post("/api/resumes/upload", data={"job_id": str(job["id"])}, files=files)
+
+        async def reevaluate(index: int):
+            return await client.put(f"/api/jobs/{job['id']}", json={"description": job_description(rng)})
+
+        # Each request re-analyzes every resume of the job (REEVALUATE_CONCURRENCY at a time)
+        report("reevaluate", await drive(args.reevaluations, 1, reevaluate, args.reevaluate_resumes))
+
+    if "mixed" in args.scenarios:
+        job = (await client.post("/api/jobs/", json={"title": "Backlog", "description": job_description(rng)})).json()
+        for start in range(0, args.reevaluate_resumes, admission.max_files):
+            files = [
+                ("files", (f"bg{i}.pdf", resume_pdf(rng, 200_000 + i, pages=1, with_image=False), "application/pdf"))
+                for i in range(start, min(start + admission.max_files, args.reevaluate_resumes))
+            ]
+            await client.post("/api/resumes/upload", data={"job_id": str(job["id"])}, files=files)
+        interactive_job = (await client.post("/api/jobs/", json={"title": "Interactive", "description": job_description(rng)})).json()
+        # Few AI slots and twice as many background analyses, so the slots stay busy with more
+        # waiting (with 16 slots the sequential reevaluation writes, not the slots, would be the limit)
+        slots = (ai_scheduler.max_concurrency, ai_scheduler.reserved_interactive)
+        ai_scheduler.max_concurrency, ai_scheduler.reserved_interactive = MIXED_AI_SLOTS, 1
+        resume_parser.REEVALUATE_CONCURRENCY = MIXED_AI_SLOTS * 2
+        starvation_seconds = ai_scheduler.starvation_seconds
+        # A failed analysis ends a reevaluation early, which would leave the slots idle
+        error_rate, fake.error_rate = fake.error_rate, 0.0
+
+        # Every waiter counts as starved with a zero threshold, i.e. first come first served
+        for name, starvation in (("mixed_fifo", 0.0), ("mixed_priority", starvation_seconds)):
+            ai_scheduler.starvation_seconds = starvation
+            pdfs = [resume_pdf(rng, 300_000 + i, pages=1, with_image=False) for i in range(args.requests)]
+            measuring = True
+
+            async def backlog():
+                while measuring:
+                    await client.put(f"/api/jobs/{job['id']}", json={"description": job_description(rng)})
+
+            async def upload_one(index: int):
+                files = [("files", (f"i{index}.pdf", pdfs[index], "application/pdf"))]
+                return await client.post("/api/resumes/upload", data={"job_id": str(interactive_job["id"])}, files=files)
+
+            background = asyncio.create_task(backlog())
+            await asyncio.sleep(args.ai_latency_ms / 1000)  # let the backlog fill the slots
+            report(name, await drive(args.requests, 2, upload_one))
+            measuring = False
+            await background
+        ai_scheduler.starvation_seconds = starvation_seconds
+        ai_scheduler.max_concurrency, ai_scheduler.reserved_interactive = slots
+        fake.error_rate = error_rate
+
+    print(f"fake AI: {fake.calls} calls, {fake.errors} failed")
+    return results
+
+def compare(results: Dict[str, dict], baseline: dict, tolerance: float) -> List[str]:
+    """Scenarios that got worse than the baseline by more than `tolerance`"""
+    regressions = []
+    for name, result in results.items():
+        expected = baseline["results"].get(name)
+        if expected is None:
+            continue
+        for field, higher_is_better in COMPARED.items():
+            before, after = expected[field], result[field]
+            worse = after < before * (1 - tolerance) if higher_is_better else after > before * (1 + tolerance)
+            if worse:
+                regressions.append(f"{name}: {field} {before} -> {after}")
+    return regressions
+
+async def main_async(args) -> Dict[str, dict]:
+    fake = FakeAIService(args.ai_latency_ms, args.ai_error_rate)
+    resumes_router.ai_service = fake
+    resume_parser.ai_service = fake
+
+    await app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            # Measure a warm process: the startup warm-up would otherwise compete with the first requests
+            while (await client.get("/ready")).status_code != 200:
+                await asyncio.sleep(0.05)
+            return await run_scenarios(args, client, fake)
+    finally:
+        await app.router.shutdown()
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", default=["upload", "list", "dashboard", "reevaluate", "mixed"],
+                        choices=["upload", "list", "dashboard", "reevaluate", "mixed"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="resumes per listing job")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent clients")
+    parser.add_argument("--requests", type=int, default=100, help="requests per scenario (fewer for large listings)")
+    parser.add_argument("--files-per-upload", type=int, default=1)
+    parser.add_argument("--reevaluate-resumes", type=int, default=50, help="resumes re-analyzed per reevaluation")
+    parser.add_argument("--reevaluations", type=int, default=3)
+    parser.add_argument("--ai-latency-ms", type=float, default=50.0, help="mean fake AI call latency")
+    parser.add_argument("--ai-error-rate", type=float, default=0.02, help="fraction of fake AI calls that fail")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--save-baseline", metavar="PATH", help="write the results as the new baseline")
+    output.add_argument("--compare", metavar="PATH", help="fail on regressions against this baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    args = parser.parse_args()
+
+    try:
+        results = asyncio.run(main_async(args))
+    finally:
+        shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
+
+    settings = {key: value for key, value in vars(args).items() if key not in ("save_baseline", "compare", "tolerance")}
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w") as baseline_file:
+            json.dump({
+                "machine": f"{platform.system()} {platform.machine()}, Python {platform.python_version()}",
+                "settings": settings,
+                "results": results,
+            }, baseline_file, indent=2)
+            baseline_file.write("\n")
+        print(f"Baseline written to {args.save_baseline}")
+    elif args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        # Scenarios and sizes only select which results exist; the rest changes their values
+        selection = ("scenarios", "sizes")
+        if {k: v for k, v in baseline.get("settings", {}).items() if k not in selection} != \
+                {k: v for k, v in settings.items() if k not in selection}:
+            print("warning: settings differ from the baseline's; the comparison may not be meaningful")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regressions beyond {args.tolerance:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.compare}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark reverse matching: one resume against every job
+
+Generates N synthetic job descriptions drawn from a shared skill vocabulary,
+then compares scoring a resume by re-tokenizing every description on each
+request with app.services.job_index.JobIndex, which precomputes the job terms
+(as create_job/update_job store them) and an inverted index over them.
+
+Usage:
+    python benchmarks/bench_job_matching.py [--jobs 300 3000] [--resumes 200]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.job_index import JobIndex, extract_terms, job_terms
+from bench_contact_extraction import resume_text
+
+SKILLS = [
+    "Python", "FastAPI", "Django", "PostgreSQL", "SQL", "Kubernetes", "Docker", "Terraform", "AWS",
+    "GCP", "Azure", "React", "TypeScript", "Next.js", "Node.js", "Go", "Rust", "Java", "Spring",
+    "Kafka", "Spark", "Airflow", "machine learning", "PyTorch", "data pipelines", "observability",
+    "CI/CD", "GraphQL", "Redis", "system design", "on-call", "C++", "embedded Linux", "iOS", "Swift",
+]
+FILLER = ["We are hiring a", "You will own", "Experience with", "Familiarity with", "Nice to have:",
+          "You have shipped", "Our stack includes", "Deep knowledge of"]
+
+def job_description(rng: random.Random) -> str:
+    lines = [f"{rng.choice(FILLER)} {', '.join(rng.sample(SKILLS, 4))}." for _ in range(rng.randint(6, 14))]
+    return "\n".join(lines)
+
+def naive_rank(jobs, resume: str, limit: int):
+    """Re-tokenize every description per request and score by weighted coverage"""
+    resume_terms = set(extract_terms(resume))
+    scores = []
+    for job_id, _, description in jobs:
+        terms = job_terms(description)
+        total = sum(terms.values())
+        scores.append((sum(w for t, w in terms.items() if t in resume_terms) / total if total else 0.0, job_id))
+    return sorted(scores, reverse=True)[:limit]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, nargs="+", default=[300, 3000])
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(39)
+    resumes = [resume_text(rng, i) + "\n" + ", ".join(rng.sample(SKILLS, 8)) for i in range(args.resumes)]
+
+    print("| Jobs | Path | Build ms | p50 ms/resume | p99 ms/resume |")
+    print("|---|---|---|---|---|")
+    for count in args.jobs:
+        jobs = [(job_id, f"Job {job_id}", job_description(rng)) for job_id in range(1, count + 1)]
+
+        timings = []
+        for resume in resumes:
+            started = time.perf_counter()
+            naive_rank(jobs, resume, args.limit)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        print(f"| {count:,} | re-tokenize every job | - | {statistics.median(timings) * 1000:.2f} "
+              f"| {timings[int(len(timings) * 0.99) - 1] * 1000:.2f} |")
+
+        stored = [(job_id, title, job_terms(description)) for job_id, title, description in jobs]
+        index = JobIndex()
+        started = time.perf_counter()
+        index.build(stored)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        timings = []
+        for resume in resumes:
+            started = time.perf_counter()
+            index.rank(resume, args.limit)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        print(f"| {count:,} | `JobIndex.rank` | {build_ms:.1f} | {statistics.median(timings) * 1000:.2f} "
+              f"| {timings[int(len(timings) * 0.99) - 1] * 1000:.2f} |")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cost of a log call on the request path
+
+Compares the former debug_print (print + double flush to stdout) with the
+queue-based logging from app.logging_config, for a disabled DEBUG call and an
+enabled INFO call. Output goes to a file, or to a slow sink that sleeps on every
+write to imitate a congested terminal or log pipe.
+
+Usage:
+    python benchmarks/bench_logging.py [--calls 20000] [--sink-delay-us 50]
+"""
+import argparse
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.logging_config import log_context, setup_logging, stop_logging
+
+class SlowSink(io.TextIOBase):
+    """Text stream whose every write blocks for a fixed time"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def write(self, text: str) -> int:
+        time.sleep(self.delay)
+        return len(text)
+
+def per_call_us(fn, calls: int) -> float:
+    started = time.perf_counter()
+    for index in range(calls):
+        fn(index)
+    return (time.perf_counter() - started) / calls * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--sink-delay-us", type=float, default=50.0)
+    args = parser.parse_args()
+
+    logger = logging.getLogger("bench")
+    fields = {"upload_file": "resume.pdf"}
+    print("| Sink | Call | us/call |")
+    print("|---|---|---|")
+    with tempfile.TemporaryDirectory() as scratch:
+        sinks = [
+            ("file", lambda: open(os.path.join(scratch, "log.txt"), "w")),
+            (f"slow ({args.sink_delay_us:.0f} us/write)", lambda: SlowSink(args.sink_delay_us / 1e6)),
+        ]
+        for sink_name, open_sink in sinks:
+            sink = open_sink()
+
+            def debug_print(index):
+                print(f"DEBUG: Extracted text length: {index}", file=sink, flush=True)
+                sink.flush()
+
+            print(f"| {sink_name} | `debug_print` (before) | {per_call_us(debug_print, args.calls):.2f} |")
+
+            setup_logging(level="INFO", stream=sink)
+            with log_context(request_id="0123456789abcdef", job_id=1):
+                disabled = per_call_us(lambda index: logger.debug("Extracted %d characters", index, extra=fields), args.calls)
+                enabled = per_call_us(lambda index: logger.info("Extracted %d characters", index, extra=fields), args.calls)
+            stop_logging()
+            print(f"| {sink_name} | `logger.debug`, level INFO | {disabled:.2f} |")
+            print(f"| {sink_name} | `logger.info`, queued JSON | {enabled:.2f} |")
+            sink.close()
+
+if __name__ == "__main__":
+    main()
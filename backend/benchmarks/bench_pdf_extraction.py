@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark PDF text extraction backends
+
+Generates a corpus of synthetic resumes (1 to 40 pages of text, half of them
+with an embedded image per page) and times every installed backend from
+app.services.pdf_extractors on it, reading all pages and with the page cap
+used by PDFService.
+
+Usage:
+    python benchmarks/bench_pdf_extraction.py [--docs 40] [--max-pages 10] [--repeat 1]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.pdf_extractors import PDF_EXTRACTORS
+from app.services.pdf_service import PDF_MAX_PAGES
+
+WORDS = ["Python", "FastAPI", "designed", "built", "services", "latency", "team", "SQL", "migrated",
+         "pipeline", "customers", "reduced", "cost", "Kubernetes", "on-call", "React", "owned", "launch"]
+PAGE_COUNTS = [1, 2, 3, 5, 10, 20, 40]
+
+def escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def resume_pdf(rng: random.Random, index: int, pages: int, with_image: bool) -> bytes:
+    """Build a multi-page PDF with 45 lines of text (and optionally a 256x256 RGB image) per page"""
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    resources = b"/Font << /F1 3 0 R >>"
+    if with_image:
+        pixels = rng.randbytes(256 * 256 * 3)
+        objects[4] = (
+            b"<< /Type /XObject /Subtype /Image /Width 256 /Height 256 /ColorSpace /DeviceRGB "
+            b"/BitsPerComponent 8 /Length " + str(len(pixels)).encode() + b" >>\nstream\n" + pixels + b"\nendstream"
+        )
+        resources += b" /XObject << /Im1 4 0 R >>"
+
+    kids = []
+    for page in range(pages):
+        lines = [f"Candidate {index}", f"candidate{index}@example.com", "555-123-4567"] if page == 0 else []
+        lines += [" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(45 - len(lines))]
+        content = "BT /F1 10 Tf 50 760 Td 14 TL " + " ".join(f"({escape(line)}) '" for line in lines) + " ET"
+        if with_image:
+            content += " q 200 0 0 200 350 560 cm /Im1 Do Q"
+        content = content.encode()
+        page_number, content_number = 10 + 2 * page, 11 + 2 * page
+        kids.append(page_number)
+        objects[page_number] = (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << " + resources
+            + b" >> /Contents " + str(content_number).encode() + b" 0 R >>"
+        )
+        objects[content_number] = b"<< /Length " + str(len(content)).encode() + b" >>\nstream\n" + content + b"\nendstream"
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kids)}] /Count {pages} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = len(out)
+        out += f"{number} 0 obj\n".encode() + objects[number] + b"\nendobj\n"
+    size = max(objects) + 1
+    xref = len(out)
+    out += f"xref\n0 {size}\n0000000000 65535 f \n".encode()
+    for number in range(1, size):
+        if number in offsets:
+            out += f"{offsets[number]:010d} 00000 n \n".encode()
+        else:
+            out += b"0000000000 65535 f \n"
+    out += f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+def build_corpus(docs: int):
+    rng = random.Random(11)
+    return [
+        resume_pdf(rng, i, PAGE_COUNTS[i % len(PAGE_COUNTS)], with_image=i % 2 == 1)
+        for i in range(docs)
+    ]
+
+def time_backend(extractor, corpus, max_pages: int, repeat: int):
+    best = float("inf")
+    per_doc = []
+    for _ in range(repeat):
+        per_doc = []
+        started = time.perf_counter()
+        for pdf in corpus:
+            doc_started = time.perf_counter()
+            extractor.extract_pages(pdf, max_pages)
+            per_doc.append(time.perf_counter() - doc_started)
+        best = min(best, time.perf_counter() - started)
+    return best, per_doc
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=40, help="documents in the corpus")
+    parser.add_argument("--max-pages", type=int, default=PDF_MAX_PAGES, help="page cap to compare against")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.docs)
+    total_pages = sum(PAGE_COUNTS[i % len(PAGE_COUNTS)] for i in range(args.docs))
+    print(f"{len(corpus)} documents, {total_pages} pages, {sum(map(len, corpus)) / 1e6:.1f} MB")
+    print(f"{'backend':<12} {'pages':>9} {'total s':>9} {'p50 ms':>9} {'max ms':>9}")
+    for name, extractor_class in PDF_EXTRACTORS.items():
+        if not extractor_class.available():
+            print(f"{name:<12} not installed")
+            continue
+        extractor = extractor_class()
+        for label, max_pages in (("all", 10_000), (f"first {args.max_pages}", args.max_pages)):
+            total, per_doc = time_backend(extractor, corpus, max_pages, args.repeat)
+            print(f"{name:<12} {label:>9} {total:>9.2f} {statistics.median(per_doc) * 1000:>9.1f} "
+                  f"{max(per_doc) * 1000:>9.1f}")
+
+if __name__ == "__main__":
+    main()
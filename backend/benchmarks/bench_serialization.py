@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark serialization of a resume listing
+
+Fetches N resume rows (with analysis and email status) from a scratch SQLite
+database once, then times only the CPU spent turning them into JSON bytes:
+
+- pydantic: the original path. Build ResumeWithAnalysis models by hand with
+  json.loads on the skill columns, then let FastAPI validate them against the
+  response_model and encode with json.dumps (what JSONResponse does).
+- fast: app.responses.resume_row_payload + FastJSONResponse (orjson with the
+  stored skill JSON spliced in as fragments).
+
+Usage:
+    python benchmarks/bench_serialization.py [--rows 5000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+from app.database import Base
+from app.models import Job, Resume, ResumeAnalysis, EmailStatus
+from app.models.resume import BucketType
+from app.responses import FastJSONResponse, RESUME_LISTING_COLUMNS, resume_row_payload
+from app.schemas.resume import (
+    ResumeWithAnalysis, ResumeResponse, ResumeAnalysisResponse, EmailStatusResponse
+)
+
+SKILLS = ["Python", "FastAPI", "SQL", "Docker", "Kubernetes", "React", "TypeScript", "AWS", "Go", "Terraform"]
+
+def seed(session: Session, rows: int) -> int:
+    rng = random.Random(7)
+    job = Job(title="bench", description="bench")
+    session.add(job)
+    session.flush()
+    resumes = [
+        Resume(job_id=job.id, filename=f"candidate_{i}.pdf", extracted_text="x" * 4000,
+               name=f"Candidate {i}", email=f"c{i}@example.com", mobile="555-123-4567",
+               bucket=rng.choice(list(BucketType)))
+        for i in range(rows)
+    ]
+    session.add_all(resumes)
+    session.flush()
+    for resume in resumes:
+        session.add(ResumeAnalysis(
+            resume_id=resume.id,
+            match_percentage=round(rng.uniform(0, 100), 1),
+            matched_skills=json.dumps(rng.sample(SKILLS, 4)),
+            missing_skills=json.dumps(rng.sample(SKILLS, 3)),
+            bonus_skills=json.dumps(rng.sample(SKILLS, 2)),
+            reasoning="Strong backend experience with Python and SQL; limited exposure to cloud infrastructure. " * 2
+        ))
+        session.add(EmailStatus(resume_id=resume.id))
+    session.commit()
+    return job.id
+
+def pydantic_path(rows) -> bytes:
+    result = []
+    for r in rows:
+        result.append(ResumeWithAnalysis(
+            resume=ResumeResponse(
+                id=r.id, job_id=r.job_id, filename=r.filename, name=r.name, email=r.email,
+                mobile=r.mobile, bucket=r.bucket, bucket_overridden=r.bucket_overridden,
+                uploaded_at=r.uploaded_at
+            ),
+            analysis=ResumeAnalysisResponse(
+                id=r.analysis_id, match_percentage=r.match_percentage,
+                matched_skills=json.loads(r.matched_skills),
+                missing_skills=json.loads(r.missing_skills),
+                bonus_skills=json.loads(r.bonus_skills),
+                reasoning=r.reasoning, created_at=r.analysis_created_at
+            ),
+            email_status=EmailStatusResponse(
+                id=r.email_status_id, status=r.email_status, form_link=r.form_link,
+                sent_at=r.sent_at, response_received_at=r.response_received_at
+            )
+        ))
+    # FastAPI: validate against response_model, dump to JSON-able python, then json.dumps
+    adapter = TypeAdapter(List[ResumeWithAnalysis])
+    validated = adapter.validate_python(result, from_attributes=True)
+    content = jsonable_encoder(adapter.dump_python(validated, mode="json"))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def fast_path(rows) -> bytes:
+    return FastJSONResponse(content=[resume_row_payload(row) for row in rows]).body
+
+def best_of(fn, rows, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(rows)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            job_id = seed(session, args.rows)
+            rows = session.execute(
+                select(*RESUME_LISTING_COLUMNS)
+                .outerjoin(ResumeAnalysis, ResumeAnalysis.resume_id == Resume.id)
+                .outerjoin(EmailStatus, EmailStatus.resume_id == Resume.id)
+                .where(Resume.job_id == job_id)
+            ).all()
+        engine.dispose()
+
+    if json.loads(pydantic_path(rows)) != json.loads(fast_path(rows)):
+        raise SystemExit("payload mismatch between pydantic and fast paths")
+
+    slow = best_of(pydantic_path, rows, args.repeat)
+    fast = best_of(fast_path, rows, args.repeat)
+    size = len(fast_path(rows))
+    print(f"{len(rows)} rows, {size / 1024:.0f} KiB of JSON")
+    print(f"{'path':<10} {'ms':>9} {'us/row':>8}")
+    print(f"{'pydantic':<10} {slow * 1000:>9.1f} {slow * 1e6 / len(rows):>8.1f}")
+    print(f"{'fast':<10} {fast * 1000:>9.1f} {fast * 1e6 / len(rows):>8.1f}")
+    print(f"speedup: {slow / fast:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark SQLite storage profiles under concurrent small writes
+
+Compares the original engine setup (no pragmas, one connection per session,
+one commit per write) with the tuned profile from app.database, with and
+without the single-writer queue. Each write updates one email status row,
+the same shape as the status/bucket PATCH endpoints.
+
+Usage:
+    python benchmarks/bench_sqlite_storage.py [--writers 50] [--writes 40] [--dir .]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import event, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool
+from app.database import Base, SQLITE_PRAGMAS, DB_POOL_SIZE, DB_MAX_OVERFLOW, apply_sqlite_pragmas
+from app.models import Job, Resume, EmailStatus
+from app.models.resume import EmailStatusEnum
+from app.services.write_queue import WriteQueue
+
+BASELINE_PRAGMAS = {"foreign_keys": "ON"}
+
+def make_engine(path: str, tuned: bool):
+    url = f"sqlite+aiosqlite:///{path}"
+    if tuned:
+        engine = create_async_engine(
+            url, poolclass=AsyncAdaptedQueuePool,
+            pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW
+        )
+        pragmas = SQLITE_PRAGMAS
+    else:
+        engine = create_async_engine(url, poolclass=NullPool)
+        pragmas = BASELINE_PRAGMAS
+    event.listen(engine.sync_engine, "connect", lambda conn, rec: apply_sqlite_pragmas(conn, pragmas))
+    return engine
+
+async def seed(engine, rows: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with sessions() as db:
+        job = Job(title="bench", description="bench")
+        db.add(job)
+        await db.flush()
+        resumes = [Resume(job_id=job.id, filename=f"{i}.pdf", extracted_text="x") for i in range(rows)]
+        db.add_all(resumes)
+        await db.flush()
+        db.add_all([EmailStatus(resume_id=r.id) for r in resumes])
+        await db.commit()
+
+def status_update(resume_id: int):
+    return (
+        update(EmailStatus)
+        .where(EmailStatus.resume_id == resume_id)
+        .values(status=EmailStatusEnum.SENT)
+    )
+
+async def run_profile(name: str, path: str, tuned: bool, use_queue: bool, writers: int, writes: int):
+    engine = make_engine(path, tuned)
+    await seed(engine, writers * writes)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    queue = WriteQueue(session_factory=sessions) if use_queue else None
+    latencies = []
+    errors = 0
+
+    async def writer(worker: int):
+        nonlocal errors
+        for i in range(writes):
+            resume_id = worker * writes + i + 1
+            started = time.perf_counter()
+            try:
+                if queue:
+                    async def op(session, resume_id=resume_id):
+                        await session.execute(status_update(resume_id))
+                    await queue.submit(op)
+                else:
+                    async with sessions() as db:
+                        await db.execute(status_update(resume_id))
+                        await db.commit()
+            except OperationalError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(writer(w) for w in range(writers)))
+    elapsed = time.perf_counter() - started
+    if queue:
+        await queue.stop()
+    await engine.dispose()
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000 if latencies else float("nan")
+    p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else float("nan")
+    print(f"{name:<24} {len(latencies) / elapsed:>10.0f} {p50:>9.2f} {p95:>9.2f} {errors:>7}")
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", type=int, default=50, help="concurrent writers")
+    parser.add_argument("--writes", type=int, default=40, help="writes per writer")
+    parser.add_argument("--dir", default=".", help="directory for the temporary database files")
+    args = parser.parse_args()
+
+    profiles = [
+        ("baseline", False, False),
+        ("tuned", True, False),
+        ("tuned + write queue", True, True),
+    ]
+    print(f"{args.writers} writers x {args.writes} writes")
+    print(f"{'profile':<24} {'writes/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'errors':>7}")
+    for name, tuned, use_queue in profiles:
+        with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+            await run_profile(name, os.path.join(tmp, "bench.db"), tuned, use_queue, args.writers, args.writes)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression check for the API endpoints
+
+Drives every jobs/resumes endpoint in-process against a scratch SQLite
+database, records each SQL statement they issue, and runs EXPLAIN QUERY PLAN
+on it. The check fails (exit code 1) when a plan contains a full table scan,
+or any scan of the per-job tables (resumes, resume_analyses, email_statuses,
+the skill counts), which must always be reached through an index search, or
+when a top-K endpoint sorts the rows it reads instead of reading them in index
+order.
+
+Usage:
+    python benchmarks/check_query_plans.py [--verbose]
+"""
+import argparse
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+
+SCRATCH_DIR = tempfile.mkdtemp(prefix="xhiresense-plans-")
+DB_PATH = os.path.join(SCRATCH_DIR, "plans.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ["BLOB_STORE_DIR"] = os.path.join(SCRATCH_DIR, "blobs")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import async_engine
+from app.routers import resumes as resumes_router
+from app.services.ai_service import MatchResult
+
+# Tables that grow with the number of candidates; scanning them is never acceptable
+JOB_SCOPED_TABLES = {"resumes", "resume_analyses", "email_statuses", "job_skill_counts", "job_analysis_counts"}
+# Endpoints that read the first K rows of an index; a sort would read every row in scope
+SORT_FREE = {"get_job_skills"}
+# Deliberate whole-table reads: the reverse-matching job index is rebuilt from every
+# job, once per job-list version
+FULL_LOADS = {("match_resume_to_jobs", "jobs")}
+SCAN_RE = re.compile(r"^SCAN (\w+)(?: AS \w+)?(.*)$")
+
+captured = []  # (endpoint, sql, params)
+current_endpoint = None
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _capture(conn, cursor, statement, parameters, context, executemany):
+    if current_endpoint and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+        captured.append((current_endpoint, statement, parameters[0] if executemany else parameters))
+
+class FakeAIService:
+    """Deterministic stand-in so uploads produce analyses without network calls"""
+    def analyze_resume_match(self, resume_text, job_description):
+        return MatchResult(
+            match_percentage=72.0,
+            matched_skills=["Python"],
+            missing_skills=["Go"],
+            bonus_skills=[],
+            reasoning="Synthetic analysis"
+        )
+
+def minimal_pdf(text: str) -> bytes:
+    """Build a one-page PDF containing the given line of text"""
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+def call(client: TestClient, endpoint: str, method: str, url: str, **kwargs):
+    global current_endpoint
+    current_endpoint = endpoint
+    try:
+        response = client.request(method, url, **kwargs)
+    finally:
+        current_endpoint = None
+    if response.status_code >= 400:
+        raise RuntimeError(f"{endpoint}: {method} {url} returned {response.status_code}: {response.text}")
+    return response
+
+def exercise_endpoints(client: TestClient):
+    resumes_router.ai_service = FakeAIService()
+
+    job = call(client, "create_job", "POST", "/api/jobs/", json={"title": "Engineer", "description": "Python"}).json()
+    other = call(client, "create_job", "POST", "/api/jobs/", json={"title": "Other", "description": "Go"}).json()
+    job_id = job["id"]
+
+    files = [("files", (f"cv{i}.pdf", minimal_pdf(f"Candidate {i} candidate{i}@example.com"), "application/pdf")) for i in range(6)]
+    call(client, "upload_resume", "POST", "/api/resumes/upload", data={"job_id": str(job_id)}, files=files)
+    call(client, "upload_resume", "POST", "/api/resumes/upload", data={"job_id": str(other["id"])}, files=files[:2])
+
+    resume_ids = [r["resume"]["id"] for r in client.get(f"/api/resumes/job/{job_id}").json()]
+
+    call(client, "list_jobs", "GET", "/api/jobs/")
+    call(client, "get_job", "GET", f"/api/jobs/{job_id}")
+    call(client, "get_job_dashboard", "GET", f"/api/jobs/{job_id}/dashboard")
+    call(client, "get_job_skills", "GET", f"/api/jobs/{job_id}/skills")
+    call(client, "get_job_skills", "GET", f"/api/jobs/{job_id}/skills", params={"bucket": "POTENTIAL", "top": 3})
+    call(client, "list_resumes", "GET", f"/api/resumes/job/{job_id}")
+    call(client, "list_resumes", "GET", f"/api/resumes/job/{job_id}", params={"bucket": "POTENTIAL"})
+    call(client, "list_resumes", "GET", f"/api/resumes/job/{job_id}", params={"min_match": 50})
+    call(client, "list_resumes", "GET", f"/api/resumes/job/{job_id}", params={"bucket": "POTENTIAL", "min_match": 50})
+    call(client, "download_resume_pdf", "GET", f"/api/resumes/{resume_ids[0]}/pdf")
+    call(client, "match_resume_to_jobs", "GET", f"/api/resumes/{resume_ids[0]}/job-matches", params={"explain": 1})
+    call(client, "update_job", "PUT", f"/api/jobs/{job_id}", json={"strong_fit_threshold": 70})
+    call(client, "update_bucket", "PATCH", f"/api/resumes/{resume_ids[0]}/bucket", params={"bucket": "REJECT"})
+    call(client, "update_email_status", "PATCH", f"/api/resumes/{resume_ids[0]}/email-status", json={"status": "SENT"})
+    call(client, "bulk_update_bucket", "PATCH", "/api/resumes/bulk/bucket",
+         json={"job_id": job_id, "resume_ids": resume_ids[:2], "new_bucket": "POTENTIAL"})
+    call(client, "bulk_update_bucket", "PATCH", "/api/resumes/bulk/bucket",
+         json={"job_id": job_id, "bucket": "STRONG_FIT", "min_match": 70, "new_bucket": "POTENTIAL"})
+    call(client, "bulk_delete_resumes", "POST", "/api/resumes/bulk/delete",
+         json={"job_id": job_id, "resume_ids": resume_ids[1:2]})
+    call(client, "bulk_delete_resumes", "POST", "/api/resumes/bulk/delete",
+         json={"job_id": job_id, "bucket": "REJECT", "min_match": 90})
+    call(client, "delete_resume", "DELETE", f"/api/resumes/{resume_ids[2]}")
+    call(client, "delete_job", "DELETE", f"/api/jobs/{other['id']}")
+
+def plan_violations(plan_rows, endpoint: str) -> list:
+    violations = []
+    for row in plan_rows:
+        detail = row[-1]
+        if endpoint in SORT_FREE and detail.startswith("USE TEMP B-TREE"):
+            violations.append(detail)
+            continue
+        match = SCAN_RE.match(detail)
+        if not match or detail == "SCAN CONSTANT ROW":  # e.g. SELECT 1, reads no table
+            continue
+        table, rest = match.group(1), match.group(2)
+        if (endpoint, table) in FULL_LOADS:
+            continue
+        if "USING" not in rest or table in JOB_SCOPED_TABLES:
+            violations.append(detail)
+    return violations
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--verbose", action="store_true", help="print every plan, not only failures")
+    args = parser.parse_args()
+
+    with TestClient(app) as client:
+        exercise_endpoints(client)
+
+    conn = sqlite3.connect(DB_PATH)
+    failures = 0
+    seen = set()
+    for endpoint, sql, params in captured:
+        key = (endpoint, sql)
+        if key in seen:
+            continue
+        seen.add(key)
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        violations = plan_violations(plan, endpoint)
+        if violations or args.verbose:
+            status = "FAIL" if violations else "ok"
+            print(f"[{status}] {endpoint}: {' '.join(sql.split())}")
+            for row in plan:
+                print(f"         {row[-1]}")
+        failures += bool(violations)
+    conn.close()
+    shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
+
+    checked = len(seen)
+    if failures:
+        print(f"{failures} of {checked} statements use a full scan")
+        return 1
+    print(f"All {checked} statements use index searches")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Failure-isolation check for the write queue
+
+Submits one batch that mixes resume uploads (with and without an analysis), an
+email-status update and an operation that raises, against a scratch SQLite
+database. The raising write must fail alone: the check fails (exit code 1)
+unless every other write is committed exactly once, with its analysis, email
+status, fingerprints and skill counts, after the batch has been replayed.
+
+Usage:
+    python benchmarks/check_write_queue.py
+"""
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+
+SCRATCH_DIR = tempfile.mkdtemp(prefix="xhiresense-writes-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(SCRATCH_DIR, 'writes.db')}"
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import func, select
+from app.database import AsyncSessionLocal, async_engine, init_async_db
+from app.models.job import Job
+from app.models.resume import Resume, ResumeAnalysis, ResumeFingerprint, EmailStatus, EmailStatusEnum, BucketType
+from app.routers.resumes import _store_resume_op
+from app.services.ai_service import MatchResult
+from app.services.skill_stats import top_skills
+from app.services.write_queue import WriteQueue
+
+class WriteFailed(Exception):
+    pass
+
+def failing_op(job_id: int):
+    """A write that flushes a row, then fails"""
+    async def op(session):
+        session.add(Resume(job_id=job_id, filename="never.pdf", extracted_text="x"))
+        await session.flush()
+        raise WriteFailed("rejected on purpose")
+    return op
+
+def resume_fields(job_id: int, filename: str, bucket: BucketType) -> dict:
+    return dict(job_id=job_id, filename=filename, extracted_text=f"text of {filename}", bucket=bucket)
+
+async def run_check() -> list:
+    await init_async_db()
+    async with AsyncSessionLocal() as db:
+        job = Job(title="Backend Engineer", description="Python and SQL")
+        db.add(job)
+        await db.flush()
+        existing = Resume(job_id=job.id, filename="existing.pdf", extracted_text="x")
+        db.add(existing)
+        await db.flush()
+        db.add(EmailStatus(resume_id=existing.id))
+        await db.commit()
+        job_id, existing_id = job.id, existing.id
+
+    sessions = 0
+
+    def counting_factory():
+        nonlocal sessions
+        sessions += 1
+        return AsyncSessionLocal()
+
+    async def mark_sent(session):
+        email_status = await session.scalar(select(EmailStatus).where(EmailStatus.resume_id == existing_id))
+        email_status.status = EmailStatusEnum.SENT
+        return email_status.id
+
+    analysis = MatchResult(
+        match_percentage=85.0, matched_skills=["Python"], missing_skills=["Go"], bonus_skills=[], reasoning="fit"
+    )
+    queue = WriteQueue(session_factory=counting_factory)
+    results = await asyncio.gather(
+        queue.submit(_store_resume_op(resume_fields(job_id, "a.pdf", BucketType.STRONG_FIT), analysis, [11, 12])),
+        queue.submit(failing_op(job_id)),
+        queue.submit(mark_sent),
+        queue.submit(_store_resume_op(resume_fields(job_id, "b.pdf", BucketType.REJECT), None, [13])),
+        return_exceptions=True
+    )
+    await queue.stop()
+
+    problems = []
+    if sessions < 2:
+        problems.append(f"the batch was not replayed ({sessions} transaction), the check did not exercise isolation")
+    if not isinstance(results[1], WriteFailed):
+        problems.append(f"failing write returned {results[1]!r} instead of its exception")
+    for index, name in ((0, "upload with analysis"), (2, "email status update"), (3, "upload without analysis")):
+        if isinstance(results[index], Exception):
+            problems.append(f"{name} failed next to the bad write: {results[index]!r}")
+
+    async with AsyncSessionLocal() as db:
+        stored = dict((await db.execute(
+            select(Resume.filename, func.count()).where(Resume.job_id == job_id).group_by(Resume.filename)
+        )).all())
+        if stored != {"existing.pdf": 1, "a.pdf": 1, "b.pdf": 1}:
+            problems.append(f"stored resumes {stored}, expected existing.pdf, a.pdf and b.pdf once each")
+        for table, expected in ((ResumeAnalysis, 1), (EmailStatus, 3), (ResumeFingerprint, 3)):
+            count = await db.scalar(select(func.count()).select_from(table))
+            if count != expected:
+                problems.append(f"{table.__tablename__}: {count} rows, expected {expected}")
+        status = await db.scalar(select(EmailStatus.status).where(EmailStatus.resume_id == existing_id))
+        if status != EmailStatusEnum.SENT:
+            problems.append(f"email status update not committed ({status})")
+        analyzed, skills = await top_skills(db, job_id, 10)
+        if analyzed != 1 or skills["matched"] != [("Python", 1)]:
+            problems.append(f"skill counts {analyzed} analyzed, {skills['matched']} matched, expected one analysis")
+    return problems
+
+def main() -> int:
+    try:
+        problems = asyncio.run(run_check())
+    finally:
+        asyncio.run(async_engine.dispose())
+        shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    if problems:
+        return 1
+    print("A failing write is isolated; the rest of its batch is committed once")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Startup import-time profile and regression check
+
+Imports app.main in a fresh interpreter with `python -X importtime`, then prints
+the total import time, the slowest top-level imports (cumulative) and the
+modules with the most self time. The check fails (exit code 1) when a module
+that must be loaded lazily (the Gemini SDK, the PDF backends) is imported at
+startup, or when the best of --repeat runs exceeds --budget-ms.
+
+Usage:
+    python benchmarks/profile_startup.py [--repeat 3] [--budget-ms 1500] [--top 15]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import List, Tuple
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Imported on first use or by the background warm-up, never by `import app.main`
+DEFERRED_MODULES = ("google.generativeai", "IPython", "PyPDF2", "pypdfium2", "pdfminer", "pyinstrument")
+
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+# (module, self µs, cumulative µs, depth)
+ImportRow = Tuple[str, int, int, int]
+
+def profile_imports(module: str = "app.main") -> List[ImportRow]:
+    """Import `module` in a new interpreter and parse its -X importtime report"""
+    env = dict(os.environ, LOG_LEVEL="WARNING")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr}")
+    rows = []
+    for line in completed.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+def cumulative_us(rows: List[ImportRow], module: str) -> int:
+    return next(row[2] for row in rows if row[0] == module and row[3] == 0)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="app.main", help="module to import")
+    parser.add_argument("--repeat", type=int, default=3, help="runs; the fastest one is reported")
+    parser.add_argument("--budget-ms", type=float, help="fail when the import takes longer than this")
+    parser.add_argument("--top", type=int, default=15, help="rows per table")
+    args = parser.parse_args()
+
+    runs = [profile_imports(args.module) for _ in range(max(args.repeat, 1))]
+    totals = [cumulative_us(rows, args.module) for rows in runs]
+    rows = runs[totals.index(min(totals))]
+    total_ms = min(totals) / 1000
+
+    print(f"import {args.module}: {total_ms:.0f} ms (best of {len(runs)}, {len(rows)} modules)")
+    print("\nSlowest direct imports (cumulative):")
+    direct = [row for row in rows if row[3] == 1]
+    for name, _, cumulative, _ in sorted(direct, key=lambda row: -row[2])[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    print("\nMost self time:")
+    for name, self_us, _, _ in sorted(rows, key=lambda row: -row[1])[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+    imported = {row[0] for row in rows}
+    eager = [name for name in DEFERRED_MODULES if name in imported]
+    failed = False
+    if eager:
+        print(f"\nFAIL: imported at startup instead of lazily: {', '.join(eager)}")
+        failed = True
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"\nFAIL: {total_ms:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    if not failed:
+        print("\nStartup imports OK")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Remove original PDFs that no resume references any more
+
+Walks the blob store (BLOB_STORE_DIR) and deletes every blob that no row of the
+resumes table references, except those stored within BLOB_GC_GRACE_SECONDS
+(their resume may still be on its way to the database). Deleting resumes or jobs
+already collects their blobs; run this periodically (e.g. daily) to catch the
+ones kept by the grace period or left behind by a crash.
+
+Usage:
+    python collect_blobs.py [--grace-seconds N] [--dry-run]
+"""
+import argparse
+import asyncio
+import sys
+from app.logging_config import setup_logging
+from app.database import AsyncSessionLocal, async_engine, init_async_db
+from app.services.blob_gc import BLOB_GC_GRACE_SECONDS, sweep_blobs
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--grace-seconds", type=float, default=BLOB_GC_GRACE_SECONDS,
+                        help="keep blobs stored within this many seconds")
+    parser.add_argument("--dry-run", action="store_true", help="report what would be removed without deleting")
+    args = parser.parse_args()
+
+    setup_logging(fmt="text", queued=False, stream=sys.stderr)
+    await init_async_db()
+    try:
+        async with AsyncSessionLocal() as db:
+            summary = await sweep_blobs(db, grace_seconds=args.grace_seconds, dry_run=args.dry_run)
+    finally:
+        await async_engine.dispose()
+
+    action = "would be removed" if args.dry_run else "removed"
+    print(
+        f"{summary.examined} blobs examined: {summary.removed} {action}, {summary.referenced} still referenced, "
+        f"{summary.recent} stored within the grace period"
+    )
+
+if __name__ == "__main__":
+    asyncio.run(main())
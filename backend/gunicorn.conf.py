@@ -0,0 +1,76 @@
+"""
+Gunicorn settings for production (`python run.py --prod`, or `gunicorn app.main:app` from this directory)
+
+The app is imported once in the master and forked into WEB_CONCURRENCY uvicorn
+workers (preload_app), so the import cost is paid once and the workers share
+the imported code's memory. Nothing opens a connection or starts a client at
+import time. Each worker creates its own database pool, AI client and
+background tasks at startup (app.logging_config restarts its writer thread
+after the fork).
+
+On SIGTERM each worker stops accepting connections, lets in-flight requests
+(uploads waiting on Gemini included) finish for up to GRACEFUL_TIMEOUT seconds,
+then flushes its write queue.
+"""
+import os
+import random
+import shutil
+import tempfile
+
+# Read by app.workers in every process (budget splits); set before the app is imported
+os.environ.setdefault("WEB_CONCURRENCY", str(os.cpu_count() or 1))
+# Where the workers publish their samples, so /metrics from any worker reports all of them
+_OWN_METRICS_DIR = "METRICS_DIR" not in os.environ
+os.environ.setdefault("METRICS_DIR", tempfile.mkdtemp(prefix="xhiresense-metrics-"))
+
+from app.metrics import clear_published
+from app.workers import GRACEFUL_TIMEOUT, WORKERS
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8000')}"
+workers = WORKERS
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+graceful_timeout = GRACEFUL_TIMEOUT
+# A worker whose event loop is blocked this long is restarted
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))
+keepalive = 5
+# Recycle a worker after this many requests (0 = never), staggered so they do not restart together
+max_requests = int(os.getenv("WORKER_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+# Address-space limit per worker in MiB (0 = none); includes the SQLite mmap and thread stacks
+WORKER_MEMORY_LIMIT_MB = int(os.getenv("WORKER_MEMORY_LIMIT_MB", "0"))
+
+# gunicorn's own records go through the app's root handler (JSON lines, see app.logging_config),
+# which importing app.main installs; gunicorn's default formatter needs process ids, which it turns off
+logconfig_dict = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "root": {"handlers": []},
+    "loggers": {
+        "gunicorn.error": {"level": "INFO", "handlers": [], "propagate": True},
+        "gunicorn.access": {"level": "INFO", "handlers": [], "propagate": True},
+    },
+}
+
+def on_starting(server):
+    """Create the tables once, so workers starting together do not race on CREATE TABLE"""
+    from app.database import engine, init_db
+    init_db()
+    engine.dispose()
+    # Counters restart with the server; drop a previous run's samples
+    clear_published(os.environ["METRICS_DIR"])
+
+def on_exit(server):
+    """Remove the metrics directory this config created"""
+    if _OWN_METRICS_DIR:
+        shutil.rmtree(os.environ["METRICS_DIR"], ignore_errors=True)
+
+def post_fork(server, worker):
+    random.seed()  # profile sampling would otherwise pick the same requests in every worker
+    if WORKER_MEMORY_LIMIT_MB:
+        import resource
+        limit = WORKER_MEMORY_LIMIT_MB * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+def worker_abort(worker):
+    worker.log.warning("Worker %s timed out (event loop blocked for %ss)", worker.pid, timeout)
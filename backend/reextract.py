@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Re-run PDF text extraction for stored resumes
+
+Reads the original PDFs from the blob store (BLOB_STORE_DIR) and refreshes each
+resume's extracted text and contact details, using a process pool. Nothing is
+sent over the network; AI analyses are left as they are.
+
+Usage:
+    python reextract.py [--job-id N] [--resume-id N ...] [--workers N] [--dry-run]
+"""
+import argparse
+import asyncio
+import sys
+from app.logging_config import setup_logging
+from app.database import async_engine, init_async_db
+from app.services.reextraction import REEXTRACT_BATCH_SIZE, reextract_resumes
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--job-id", type=int, help="only this job's resumes")
+    parser.add_argument("--resume-id", type=int, action="append", help="only these resumes (repeatable)")
+    parser.add_argument("--workers", type=int, help="extraction processes (default: one per CPU)")
+    parser.add_argument("--batch-size", type=int, default=REEXTRACT_BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="report what would change without writing")
+    args = parser.parse_args()
+
+    # Plain handler (no writer thread) so the forked extraction workers can log too
+    setup_logging(fmt="text", queued=False, stream=sys.stderr)
+    await init_async_db()
+    try:
+        summary = await reextract_resumes(
+            job_id=args.job_id,
+            resume_ids=args.resume_id,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            dry_run=args.dry_run
+        )
+    finally:
+        await async_engine.dispose()
+
+    action = "would update" if args.dry_run else "updated"
+    print(
+        f"{summary.examined} resumes examined: {summary.updated} {action}, {summary.unchanged} unchanged, "
+        f"{summary.failed} failed, {summary.missing_blob} without a stored PDF"
+    )
+
+if __name__ == "__main__":
+    asyncio.run(main())
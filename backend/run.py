@@ -1,8 +1,71 @@
 #!/usr/bin/env python3
 """
 Run script for XHireSense backend
+
+    python run.py                          development: one process with auto-reload
+    python run.py --prod [--workers N]     production: N worker processes (default: one per CPU)
+
+Production mode runs gunicorn with uvicorn workers (settings in gunicorn.conf.py).
+Where gunicorn is unavailable (Windows), it falls back to uvicorn's own worker
+processes, which import the app separately in each worker instead of preloading it.
 """
+import argparse
+import os
+import shutil
+import sys
+import tempfile
 import uvicorn
 
+def main():
+    parser = argparse.ArgumentParser(description="Run the XHireSense API")
+    parser.add_argument("--prod", action="store_true", help="production mode: several workers, no reload")
+    parser.add_argument("--workers", type=int, help="worker processes (default: WEB_CONCURRENCY or one per CPU)")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    args = parser.parse_args()
+
+    if not args.prod:
+        uvicorn.run("app.main:app", host=args.host, port=args.port, reload=True)
+        return
+
+    workers = args.workers or int(os.getenv("WEB_CONCURRENCY", "0")) or os.cpu_count() or 1
+    # Every process reads these: app.workers splits host-wide budgets by the worker count
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    os.environ["HOST"] = args.host
+    os.environ["PORT"] = str(args.port)
+
+    try:
+        from gunicorn.app.wsgiapp import run as run_gunicorn
+    except ImportError:
+        run_gunicorn = None
+    if run_gunicorn is not None:
+        config = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gunicorn.conf.py")
+        sys.argv = ["gunicorn", "--config", config, "app.main:app"]
+        run_gunicorn()
+        return
+
+    # Where the workers publish their samples, so /metrics from any worker reports all of them
+    own_metrics_dir = "METRICS_DIR" not in os.environ
+    os.environ.setdefault("METRICS_DIR", tempfile.mkdtemp(prefix="xhiresense-metrics-"))
+
+    from app.database import engine, init_db
+    from app.metrics import clear_published
+    from app.workers import GRACEFUL_TIMEOUT
+    init_db()  # once, before the workers start
+    engine.dispose()
+    clear_published(os.environ["METRICS_DIR"])
+    try:
+        uvicorn.run(
+            "app.main:app",
+            host=args.host,
+            port=args.port,
+            workers=workers,
+            timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+            limit_max_requests=int(os.getenv("WORKER_MAX_REQUESTS", "0")) or None
+        )
+    finally:
+        if own_metrics_dir:
+            shutil.rmtree(os.environ["METRICS_DIR"], ignore_errors=True)
+
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    main()
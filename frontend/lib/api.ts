@@ -4,6 +4,8 @@ export interface Job {
   id: number;
   title: string;
   description: string;
+  strong_fit_threshold: number;
+  potential_threshold: number;
   created_at: string;
   updated_at: string;
 }
@@ -36,6 +38,9 @@ export interface Resume {
   email: string | null;
   mobile: string | null;
   bucket: BucketType;
+  bucket_overridden: boolean;
+  pdf_sha256: string | null;
+  duplicate_of_id: number | null;
   uploaded_at: string;
 }
 
@@ -50,6 +55,17 @@ export interface ResumeBatchUploadResponse {
   failed: Array<{ filename: string; error: string }>;
 }
 
+export interface ResumeSelection {
+  job_id: number;
+  resume_ids?: number[];
+  bucket?: BucketType;
+  min_match?: number;
+}
+
+export interface BulkOperationResponse {
+  affected: number;
+}
+
 export interface JobDashboard {
   job_id: number;
   total_resumes: number;
@@ -60,6 +76,21 @@ export interface JobDashboard {
   pending_screening_responses: number;
 }
 
+export interface JobMatch {
+  job_id: number;
+  title: string;
+  score: number;
+  matched_terms: string[];
+  missing_terms: string[];
+  analysis: Omit<ResumeAnalysis, 'id' | 'created_at'> | null;
+}
+
+export interface JobMatchResponse {
+  resume_id: number;
+  jobs_considered: number;
+  matches: JobMatch[];
+}
+
 // Jobs API
 export async function createJob(title: string, description: string): Promise<Job> {
   const response = await fetch(`${API_URL}/api/jobs/`, {
@@ -98,7 +129,10 @@ export async function getJob(id: number): Promise<Job> {
   return response.json();
 }
 
-export async function updateJob(id: number, updates: Partial<{ title: string; description: string }>): Promise<Job> {
+export async function updateJob(
+  id: number,
+  updates: Partial<{ title: string; description: string; strong_fit_threshold: number; potential_threshold: number }>
+): Promise<Job> {
   const response = await fetch(`${API_URL}/api/jobs/${id}`, {
     method: 'PUT',
     headers: {
@@ -223,6 +257,41 @@ export async function updateBucket(
   return response.json();
 }
 
+export async function bulkUpdateBucket(
+  selection: ResumeSelection,
+  newBucket: BucketType
+): Promise<BulkOperationResponse> {
+  const response = await fetch(`${API_URL}/api/resumes/bulk/bucket`, {
+    method: 'PATCH',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify({ ...selection, new_bucket: newBucket }),
+  });
+
+  if (!response.ok) {
+    throw new Error('Failed to update buckets');
+  }
+
+  return response.json();
+}
+
+export async function bulkDeleteResumes(selection: ResumeSelection): Promise<BulkOperationResponse> {
+  const response = await fetch(`${API_URL}/api/resumes/bulk/delete`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify(selection),
+  });
+
+  if (!response.ok) {
+    throw new Error('Failed to delete resumes');
+  }
+
+  return response.json();
+}
+
 export async function sendScreeningForm(
   resumeId: number,
   candidateEmail: string
@@ -271,3 +340,22 @@ export async function deleteResume(resumeId: number): Promise<void> {
     throw new Error('Failed to delete resume');
   }
 }
+
+export function getResumePdfUrl(resumeId: number): string {
+  return `${API_URL}/api/resumes/${resumeId}/pdf`;
+}
+
+export async function getJobMatches(
+  resumeId: number,
+  limit = 10,
+  explain = 0
+): Promise<JobMatchResponse> {
+  const params = new URLSearchParams({ limit: limit.toString(), explain: explain.toString() });
+  const response = await fetch(`${API_URL}/api/resumes/${resumeId}/job-matches?${params}`);
+
+  if (!response.ok) {
+    throw new Error('Failed to fetch job matches');
+  }
+
+  return response.json();
+}